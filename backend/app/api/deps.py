@@ -1,17 +1,35 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Any, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal, get_db
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
 from app.core.config import settings
 from app.core import auth
+from app.core.principal import Principal, cache_principal, get_cached_principal
 from app.models.user import User
+from app.models.profile import BandProfile, VenueProfile
 from app.schemas.user import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)) -> User:
+async def load_principal(db: AsyncSession, user_id: Any) -> Optional[Principal]:
+    """One round trip: the user row plus profile-presence flags."""
+    row = (await db.execute(
+        select(
+            User.id,
+            User.email,
+            User.role,
+            User.created_at,
+            exists().where(BandProfile.user_id == User.id).label("has_band_profile"),
+            exists().where(VenueProfile.user_id == User.id).label("has_venue_profile"),
+        ).where(User.id == user_id)
+    )).first()
+    return Principal(**row._mapping) if row else None
+
+async def _principal_from_token(db: AsyncSession, token: str) -> Principal:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         token_data = TokenPayload(**payload)
@@ -25,13 +43,32 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusabl
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    principal = await get_cached_principal(token_data.sub)
+    if principal is None:
+        principal = await load_principal(db, token_data.sub)
+        if not principal:
+            raise HTTPException(status_code=404, detail="User not found")
+        await cache_principal(principal)
+    return principal
+
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)) -> Principal:
+    return await _principal_from_token(db, token)
+
+async def get_stream_user(
+    db: AsyncSession = Depends(get_db),
+    header_token: Optional[str] = Depends(optional_oauth2),
+    token: Optional[str] = Query(None, description="Access token, for clients like EventSource that cannot set headers"),
+) -> Principal:
+    if not (header_token or token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _principal_from_token(db, header_token or token)
 
-def require_venue_role(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != "venue" and not current_user.venue_profile:
+async def require_venue_role(current_user: Principal = Depends(get_current_user)) -> Principal:
+    if current_user.role != "venue" and not current_user.has_venue_profile:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User does not have venue permissions",
@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, Select, literal, tuple_
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Query parameters shared by every list route: an opaque `cursor` taken from
+    the previous page's X-Next-Cursor header, and a bounded `limit`.
+    """
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_key.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        else:
+            sort_value = float(sort_value)
+        return sort_value, UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    db,
+    stmt: Select,
+    page: PageParams,
+    response: Response,
+    sort_key,
+    id_col,
+    descending: bool = True,
+) -> List[Any]:
+    """
+    Keyset pagination over (sort_key, id_col).
+
+    Instead of OFFSET, the next page starts strictly after the last row seen,
+    so every page costs the same however deep the client scrolls. One extra
+    row is fetched to know whether another page exists; its cursor goes out in
+    the X-Next-Cursor header and the header is omitted on the last page.
+    """
+    stmt = stmt.add_columns(sort_key.label("_cursor_key"), id_col.label("_cursor_id"))
+
+    if page.cursor:
+        sort_value, row_id = decode_cursor(page.cursor, sort_key)
+        boundary = tuple_(literal(sort_value, sort_key.type), literal(row_id, id_col.type))
+        if descending:
+            stmt = stmt.where(tuple_(sort_key, id_col) < boundary)
+        else:
+            stmt = stmt.where(tuple_(sort_key, id_col) > boundary)
+
+    if descending:
+        stmt = stmt.order_by(sort_key.desc(), id_col.desc())
+    else:
+        stmt = stmt.order_by(sort_key.asc(), id_col.asc())
+
+    rows = (await db.execute(stmt.limit(page.limit + 1))).all()
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1][-2], rows[-1][-1])
+
+    # Single-entity queries get their entities back; multi-column rows are
+    # returned as-is (still addressable by label) with the cursor columns last.
+    if rows and len(rows[0]) == 3:
+        return [row[0] for row in rows]
+    return rows
@@ -1,37 +1,45 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import fast_page, fast_serialization_enabled
 from app.models.gig import GigPosting, GigApplication
 from app.models.profile import BandProfile
 from app.models.notification import Notification
 from app.schemas.application import ApplicationCreate, ApplicationResponse
+from app.core.principal import Principal
 from app.api.deps import get_current_user
+from app.services.notifications import notification_hub
 from uuid import UUID
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.post("/", response_model=ApplicationResponse)
-def create_application(
+async def create_application(
     app_in: ApplicationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     # 1. Verify user is an artist/band
-    if current_user.role != "band" or not current_user.band_profile:
+    band_profile = None
+    if current_user.role == "band" and current_user.has_band_profile:
+        band_profile = await db.scalar(select(BandProfile).where(BandProfile.user_id == current_user.id))
+    if not band_profile:
         raise HTTPException(status_code=403, detail="Only artists with a profile can apply to gigs")
 
     # 2. Verify gig exists
-    gig = db.query(GigPosting).filter(GigPosting.id == app_in.gig_id).first()
+    gig = await db.get(GigPosting, app_in.gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
 
     # 3. Check if already applied
-    existing = db.query(GigApplication).filter(
+    existing = await db.scalar(select(GigApplication.id).where(
         GigApplication.gig_id == app_in.gig_id,
         GigApplication.applicant_id == current_user.id
-    ).first()
+    ))
     if existing:
         raise HTTPException(status_code=400, detail="Already applied to this gig")
 
@@ -40,63 +48,67 @@ def create_application(
         gig_id=app_in.gig_id,
         venue_id=gig.venue_id,
         applicant_id=current_user.id,
-        applicant_name=current_user.band_profile.band_name,
-        applicant_avatar=current_user.band_profile.photo_url,
+        applicant_name=band_profile.band_name,
+        applicant_avatar=(band_profile.photo_variants or {}).get("avatar") or band_profile.photo_url,
         message=app_in.message,
     )
     db.add(new_app)
-    db.commit()
-    db.refresh(new_app)
+    await db.commit()
+    await db.refresh(new_app)
     return new_app
 
+def _application_rows():
+    """
+    Projection of exactly the ApplicationResponse fields, with the gig details
+    joined in, so a listing is one query however many rows it returns.
+    """
+    return select(
+        GigApplication.id,
+        GigApplication.gig_id,
+        GigApplication.applicant_id,
+        GigApplication.venue_id,
+        GigApplication.applicant_name,
+        GigApplication.applicant_avatar,
+        GigApplication.message,
+        GigApplication.status,
+        GigApplication.created_at,
+        GigPosting.title.label("gig_title"),
+        func.to_char(GigPosting.date, "YYYY-MM-DD").label("gig_date"),
+        GigPosting.venue_name.label("venue_name"),
+    ).outerjoin(GigPosting, GigPosting.id == GigApplication.gig_id)
+
 @router.get("/my-applications", response_model=List[ApplicationResponse])
-def list_my_applications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_my_applications(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
-    apps = db.query(GigApplication).filter(GigApplication.applicant_id == current_user.id).all()
-    
-    # Enrich with gig details
-    for app in apps:
-        gig = db.query(GigPosting).filter(GigPosting.id == app.gig_id).first()
-        if gig:
-            app.gig_title = gig.title
-            app.gig_date = str(gig.date)
-            app.venue_name = gig.venue_name
-            
-    return apps
+    query = _application_rows().where(GigApplication.applicant_id == current_user.id)
+    if fast_serialization_enabled():
+        return await fast_page(db, query, page, response, GigApplication.created_at, GigApplication.id, ApplicationResponse)
+    return await paginate(db, query, page, response, GigApplication.created_at, GigApplication.id)
 
 @router.get("/venue", response_model=List[ApplicationResponse])
-def list_venue_applications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_venue_applications(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
-    apps = db.query(GigApplication).filter(GigApplication.venue_id == current_user.id).all()
-    
-    # Enrich with contact info and gig details
-    for app in apps:
-        band_profile = db.query(BandProfile).filter(BandProfile.user_id == app.applicant_id).first()
-        if band_profile:
-            app.applicant_email = band_profile.contact_email
-            app.applicant_whatsapp = band_profile.whatsapp_number
-            app.applicant_instagram = band_profile.instagram
-            
-        gig = db.query(GigPosting).filter(GigPosting.id == app.gig_id).first()
-        if gig:
-            app.gig_title = gig.title
-            app.gig_date = str(gig.date)
-            app.venue_name = gig.venue_name
-            
-    return apps
+    query = _application_rows().where(GigApplication.venue_id == current_user.id)
+    if fast_serialization_enabled():
+        return await fast_page(db, query, page, response, GigApplication.created_at, GigApplication.id, ApplicationResponse)
+    return await paginate(db, query, page, response, GigApplication.created_at, GigApplication.id)
 
 @router.patch("/{id}/status", response_model=ApplicationResponse)
-def update_application_status(
+async def update_application_status(
     id: UUID,
     status_update: str, # pending, accepted, declined
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
-    app_record = db.query(GigApplication).filter(GigApplication.id == id).first()
+    app_record = await db.get(GigApplication, id)
     if not app_record:
         raise HTTPException(status_code=404, detail="Application not found")
     
@@ -105,26 +117,22 @@ def update_application_status(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     app_record.status = status_update
-    db.commit()
-    db.refresh(app_record)
+    await db.flush()
+
+    # Re-read through the projection so the gig details come along in the same query
+    app_row = (await db.execute(_application_rows().where(GigApplication.id == id))).one()
 
     # Trigger notification for the band if accepted
     if status_update == "accepted":
         notif = Notification(
-            user_id=app_record.applicant_id,
+            user_id=app_row.applicant_id,
             title="Application Accepted! 🎸",
-            content=f"Your application for '{app_record.gig_title}' has been accepted. View contact details to connect.",
+            content=f"Your application for '{app_row.gig_title}' has been accepted. View contact details to connect.",
             type="application_accepted",
-            link=f"/dashboard/my-gigs"
+            link="/dashboard/my-gigs"
         )
         db.add(notif)
-        db.commit()
-    
-    # Enrich response with contact info if accepted
-    band_profile = db.query(BandProfile).filter(BandProfile.user_id == app_record.applicant_id).first()
-    if band_profile:
-        app_record.applicant_email = band_profile.contact_email
-        app_record.applicant_whatsapp = band_profile.whatsapp_number
-        app_record.applicant_instagram = band_profile.instagram
-        
-    return app_record
+        await notification_hub.publish_on_commit(db, [notif])
+
+    await db.commit()
+    return app_row
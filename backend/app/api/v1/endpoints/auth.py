@@ -1,7 +1,8 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt
 from app.core import auth
 from app.core.config import settings
@@ -9,14 +10,17 @@ from app.db.session import get_db
 from app.models.user import User
 from app.models.profile import BandProfile, VenueProfile
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
+import logging
 import uuid
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+logger = logging.getLogger(__name__)
 
 @router.post("/register", response_model=UserResponse)
-def register(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
-    print(f"DEBUG: Registering new user: {user_in.email} as {user_in.role}")
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)) -> Any:
+    logger.info("Registering new user %s as %s", user_in.email, user_in.role)
+    user = await db.scalar(select(User).where(User.email == user_in.email))
     if user:
         raise HTTPException(
             status_code=400,
@@ -26,32 +30,38 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
     db_user = User(
         email=user_in.email,
         role=user_in.role,
-        password_hash=auth.get_password_hash(user_in.password),
+        password_hash=await auth.hash_password_async(user_in.password),
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)) -> Any:
-    print(f"DEBUG: Login attempt for email: {user_in.email}")
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def login(user_in: UserLogin, db: AsyncSession = Depends(get_db)) -> Any:
+    logger.debug("Login attempt for %s", user_in.email)
+    user = await db.scalar(select(User).where(User.email == user_in.email))
     if not user:
-        print(f"DEBUG: User not found for email: {user_in.email}")
+        logger.info("Login failed for %s: no such user", user_in.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account with this email does not exist",
         )
     
-    if not auth.verify_password(user_in.password, user.password_hash):
-        print(f"DEBUG: Password verification failed for email: {user_in.email}")
+    valid, new_hash = await auth.verify_and_update_password(user_in.password, user.password_hash)
+    if not valid:
+        logger.info("Login failed for %s: wrong password", user_in.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid password provided",
         )
+
+    # Hashing scheme or cost changed since this hash was made
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
     
-    print(f"DEBUG: Login successful for email: {user_in.email}")
+    logger.debug("Login succeeded for %s", user_in.email)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": auth.create_access_token(user.id, expires_delta=access_token_expires),
@@ -60,7 +70,7 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)) -> Any:
     }
 
 @router.post("/refresh-token", response_model=Token)
-def refresh_token(refresh_token: str, db: Session = Depends(get_db)) -> Any:
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)) -> Any:
     """
     Refresh access token using a refresh token.
     """
@@ -72,7 +82,7 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)) -> Any:
     except:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
@@ -1,48 +1,206 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import NEXT_CURSOR_HEADER, PageParams, paginate
 from app.models.gig import GigPosting
+from app.models.profile import BandProfile, VenueProfile
 from app.schemas.gig import GigPostingResponse
-import math
+from app.schemas.discovery import SuggestionKind, SuggestionResponse
+from app.schemas.profile import BandDiscoveryResponse, VenueProfileResponse
+from app.core.config import settings
+from app.core.response_cache import discover_gigs_cache, discover_venues_cache, list_etag
+from app.services import geo
+from app.services.search import band_facets_query, band_search, collect_band_facets, gig_search, genre_overlap, venue_search
+from app.services.suggest import KINDS, suggest_index
+from app.api.deps import require_venue_role
+from app.core.principal import Principal
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.get("/gigs", response_model=List[GigPostingResponse])
-def discover_gigs(
-    db: Session = Depends(get_db),
-    lat: Optional[float] = None,
-    lng: Optional[float] = None,
+async def discover_gigs(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    page: PageParams = Depends(),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0, le=settings.DISCOVERY_MAX_RADIUS_KM),
     genre: Optional[str] = None,
     search: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0
 ) -> Any:
     """
-    Explore gigs with simple filtering and search.
+    Explore gigs with filtering and ranked full-text search.
+    When lat/lng are given, only gigs within radius_km are returned, nearest first.
     """
-    query = db.query(GigPosting).filter(GigPosting.status == "open")
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be provided together")
+
+    cached = await discover_gigs_cache.lookup(request)
+    if cached is not None:
+        return cached
+
+    query = select(GigPosting).where(GigPosting.status == "open")
     
-    # Simple search
-    if search:
-        query = query.filter(
-            (GigPosting.title.ilike(f"%{search}%")) | 
-            (GigPosting.description.ilike(f"%{search}%"))
-        )
+    # Full-text search, ranked
+    rank = None
+    if search and search.strip():
+        condition, rank = gig_search(search)
+        query = query.where(condition)
         
     # Genre filter
     if genre:
-        query = query.filter(GigPosting.genre == genre)
+        query = query.where(GigPosting.genre == genre)
+
+    if lat is None:
+        if rank is not None:
+            gigs = await paginate(db, query, page, response, rank, GigPosting.id)
+        else:
+            gigs = await paginate(db, query, page, response, GigPosting.created_at, GigPosting.id)
+    else:
+        # Radius mode: the GiST box prefilter narrows the candidates, haversine
+        # does the exact cut and ordering on what is left.
+        radius = radius_km or settings.DISCOVERY_DEFAULT_RADIUS_KM
+        distance = geo.haversine_km(GigPosting.location_lat, GigPosting.location_lng, lat, lng)
+        query = (
+            query.add_columns(distance.label("distance_km"))
+            .where(geo.within_box(GigPosting.location_lat, GigPosting.location_lng, lat, lng, radius))
+            .where(distance <= radius)
+        )
+        gigs = []
+        for row in await paginate(db, query, page, response, distance, GigPosting.id, descending=False):
+            gig = row[0]
+            gig.distance_km = round(row.distance_km, 3)
+            gigs.append(gig)
+
+    next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return await discover_gigs_cache.store(
+        request,
+        List[GigPostingResponse],
+        gigs,
+        list_etag(gigs, next_cursor),
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
+
+@router.get("/venues", response_model=List[VenueProfileResponse])
+async def discover_venues(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    page: PageParams = Depends(),
+    search: Optional[str] = None,
+    genre: Optional[List[str]] = Query(None, description="Repeat for several; venues listing any of them match"),
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    min_capacity: Optional[int] = Query(None, ge=0),
+    max_capacity: Optional[int] = Query(None, ge=0),
+) -> Any:
+    """
+    Search venues by typical genres, location, capacity and name/bio text.
+    With search or genre, results are ordered by relevance (text rank plus the
+    share of the requested genres a venue lists), otherwise newest first.
+    """
+    if min_capacity is not None and max_capacity is not None and min_capacity > max_capacity:
+        raise HTTPException(status_code=400, detail="min_capacity must not exceed max_capacity")
+
+    cached = await discover_venues_cache.lookup(request)
+    if cached is not None:
+        return cached
+
+    query = select(VenueProfile)
+    relevance = None
+    if search and search.strip():
+        condition, relevance = venue_search(search)
+        query = query.where(condition)
 
-    # Note: Geo-spatial query is simplified/removed in the 'dumbed down' version
-    # because it usually requires PostGIS or complex math in SQL.
-    # We just return the latest matching gigs.
+    genres = [g.strip() for g in genre or [] if g.strip()]
+    if genres:
+        condition, overlap = genre_overlap(VenueProfile.typical_genres, genres)
+        query = query.where(condition)
+        relevance = overlap if relevance is None else relevance + overlap
 
-    return query.order_by(GigPosting.created_at.desc()).offset(offset).limit(limit).all()
+    # Case-insensitive, matching the lower(state), lower(city) index
+    if state and state.strip():
+        query = query.where(func.lower(VenueProfile.location_state) == state.strip().lower())
+    if city and city.strip():
+        query = query.where(func.lower(VenueProfile.location_city) == city.strip().lower())
+    if min_capacity is not None:
+        query = query.where(VenueProfile.capacity >= min_capacity)
+    if max_capacity is not None:
+        query = query.where(VenueProfile.capacity <= max_capacity)
 
-@router.get("/venues", response_model=List[Any])
-def discover_venues(
+    sort_key = relevance if relevance is not None else VenueProfile.created_at
+    venues = await paginate(db, query, page, response, sort_key, VenueProfile.id)
+
+    next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return await discover_venues_cache.store(
+        request,
+        List[VenueProfileResponse],
+        venues,
+        list_etag(venues, next_cursor),
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
+
+@router.get("/bands", response_model=BandDiscoveryResponse)
+async def discover_bands(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(require_venue_role),
     search: Optional[str] = None,
-    genre: Optional[str] = None
+    genre: Optional[List[str]] = Query(None, description="Repeat for several; bands in any of them match"),
+    city: Optional[str] = None,
+    state: Optional[str] = None,
 ) -> Any:
-    return []
+    """
+    Search band profiles by genre, location and name/genre/city/bio text, for
+    venues. The first page also carries facet counts (bands per genre and per
+    city) for the current search, each counted without its own filter.
+    """
+    conditions = []
+    relevance = None
+    if search and search.strip():
+        condition, relevance = band_search(search)
+        conditions.append(condition)
+
+    genres = [g.strip() for g in genre or [] if g.strip()]
+    genre_condition = BandProfile.genre.in_(genres) if genres else None
+
+    # Case-insensitive, matching the lower(state), lower(city) index
+    location = []
+    if state and state.strip():
+        location.append(func.lower(BandProfile.location_state) == state.strip().lower())
+    if city and city.strip():
+        location.append(func.lower(BandProfile.location_city) == city.strip().lower())
+    location_condition = and_(*location) if location else None
+
+    query = select(BandProfile).where(*conditions)
+    if genre_condition is not None:
+        query = query.where(genre_condition)
+    if location_condition is not None:
+        query = query.where(location_condition)
+
+    sort_key = relevance if relevance is not None else BandProfile.created_at
+    bands = await paginate(db, query, page, response, sort_key, BandProfile.id)
+
+    facets = None
+    if not page.cursor:
+        rows = (await db.execute(band_facets_query(conditions, genre_condition, location_condition))).all()
+        facets = collect_band_facets(rows, settings.DISCOVERY_FACET_LIMIT)
+    return {"items": bands, "facets": facets}
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    kind: Optional[List[SuggestionKind]] = Query(None, description="Repeat for several; all kinds when omitted"),
+    limit: int = Query(8, ge=1, le=20),
+) -> Any:
+    """
+    Type-ahead completions for search boxes: venue and band names, cities,
+    genres and gig tags starting with q (at any word). Answered from an
+    in-process index, without a database query.
+    """
+    return suggest_index.suggest(q, kind or KINDS, limit)
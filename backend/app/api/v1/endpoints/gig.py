@@ -1,25 +1,44 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import String, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import fast_page, fast_serialization_enabled, schema_columns
 from app.models.gig import GigPosting
+from app.models.profile import VenueProfile
 from app.schemas.gig import GigPostingCreate, GigPostingResponse
+from app.core.principal import Principal
+from app.core.response_cache import discover_gigs_cache, gig_cache, make_etag
 from app.api.deps import get_current_user, require_venue_role
+from app.services.matching import refresh_gig_matches
+from app.services.search import gig_search
+from app.services.suggest import suggest_index
 from uuid import UUID
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+# GigPostingResponse as a flat projection, for SERIALIZATION_MODE=validated/trusted
+GIG_RESPONSE_COLUMNS = schema_columns(
+    GigPostingResponse,
+    GigPosting,
+    tags=func.coalesce(GigPosting.tags, cast(literal("{}"), ARRAY(String))),
+)
 
 @router.post("/", response_model=GigPostingResponse)
-def create_gig_posting(
+async def create_gig_posting(
     gig_in: GigPostingCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_venue_role),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_venue_role),
 ) -> Any:
     # Get venue name from profile if possible
     venue_name = current_user.email.split('@')[0].capitalize()
-    if current_user.venue_profile:
-        venue_name = current_user.venue_profile.venue_name
+    if current_user.has_venue_profile:
+        venue_name = await db.scalar(
+            select(VenueProfile.venue_name).where(VenueProfile.user_id == current_user.id)
+        ) or venue_name
     
     gig_data = gig_in.dict(exclude={"location"})
     
@@ -34,41 +53,60 @@ def create_gig_posting(
         **gig_data
     )
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.flush()
+    await refresh_gig_matches(db, db_obj.id)
+    await db.commit()
+    await db.refresh(db_obj)
+    # A new open gig can show up on any discovery page
+    await discover_gigs_cache.invalidate()
+    suggest_index.update_gig(db_obj)
     return db_obj
 
 @router.get("/", response_model=List[GigPostingResponse])
-def list_gig_postings(
-    db: Session = Depends(get_db),
+async def list_gig_postings(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
     genre: Optional[str] = None,
     search: Optional[str] = None
 ) -> Any:
-    query = db.query(GigPosting).filter(GigPosting.status == "open")
+    query = select(GigPosting).where(GigPosting.status == "open")
     if genre:
-        query = query.filter(GigPosting.genre == genre)
-    
-    if search:
-        query = query.filter(
-            (GigPosting.title.ilike(f"%{search}%")) | 
-            (GigPosting.description.ilike(f"%{search}%"))
-        )
+        query = query.where(GigPosting.genre == genre)
     
-    return query.order_by(GigPosting.created_at.desc()).all()
+    sort_key = GigPosting.created_at
+    if search and search.strip():
+        condition, sort_key = gig_search(search)
+        query = query.where(condition)
+
+    if fast_serialization_enabled():
+        query = query.with_only_columns(*GIG_RESPONSE_COLUMNS)
+        return await fast_page(db, query, page, response, sort_key, GigPosting.id, GigPostingResponse)
+    return await paginate(db, query, page, response, sort_key, GigPosting.id)
 
 @router.get("/{id}", response_model=GigPostingResponse)
-def get_gig_posting(
+async def get_gig_posting(
     id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    post = db.query(GigPosting).filter(GigPosting.id == id).first()
+    cached = await gig_cache.lookup(request, id)
+    if cached is not None:
+        return cached
+    post = await db.get(GigPosting, id)
     if not post:
         raise HTTPException(status_code=404, detail="Gig not found")
-    return post
+    return await gig_cache.store(request, GigPostingResponse, post, make_etag(post.id, post.updated_at), ident=id)
 
 @router.get("/me/managed", response_model=List[GigPostingResponse])
-def list_my_managed_gigs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_venue_role),
+async def list_my_managed_gigs(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(require_venue_role),
 ) -> Any:
-    return db.query(GigPosting).filter(GigPosting.venue_id == current_user.id).order_by(GigPosting.created_at.desc()).all()
+    query = select(GigPosting).where(GigPosting.venue_id == current_user.id)
+    if fast_serialization_enabled():
+        query = query.with_only_columns(*GIG_RESPONSE_COLUMNS)
+        return await fast_page(db, query, page, response, GigPosting.created_at, GigPosting.id, GigPostingResponse)
+    return await paginate(db, query, page, response, GigPosting.created_at, GigPosting.id)
@@ -0,0 +1,74 @@
+from typing import Any, List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_read_db
+from app.api.pagination import PageParams, paginate
+from app.models.gig import GigMatch, GigPosting, GigRequest
+from app.models.profile import BandProfile
+from app.schemas.gig import BandMatchResponse, GigMatchResponse
+from app.core.principal import Principal
+from app.api.deps import get_current_user, require_venue_role
+from app.core.instrumentation import InstrumentedRoute
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+@router.get("/gigs", response_model=List[GigMatchResponse])
+async def list_matched_gigs(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """Open upcoming gigs matching the current band's availability, best match first."""
+    query = (
+        select(GigPosting, GigMatch.score, GigMatch.distance_km)
+        .join(GigMatch, GigMatch.gig_id == GigPosting.id)
+        .where(GigMatch.band_id == current_user.id, GigMatch.gig_date >= func.current_date())
+    )
+    rows = await paginate(db, query, page, response, GigMatch.score, GigMatch.gig_id)
+    gigs = []
+    for row in rows:
+        gig = row[0]
+        gig.match_score = row.score
+        gig.distance_km = row.distance_km
+        gigs.append(gig)
+    return gigs
+
+@router.get("/gigs/{gig_id}/bands", response_model=List[BandMatchResponse])
+async def list_matched_bands(
+    gig_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(require_venue_role),
+) -> Any:
+    """Bands available for one of the current venue's gigs, best match first."""
+    venue_id = await db.scalar(select(GigPosting.venue_id).where(GigPosting.id == gig_id))
+    if venue_id is None:
+        raise HTTPException(status_code=404, detail="Gig not found")
+    if venue_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = (
+        select(
+            GigMatch.band_id,
+            GigMatch.request_id,
+            BandProfile.band_name,
+            BandProfile.genre,
+            BandProfile.photo_url,
+            BandProfile.photo_variants,
+            BandProfile.location_city,
+            BandProfile.location_state,
+            GigRequest.available_from,
+            GigRequest.available_to,
+            GigRequest.genres,
+            GigMatch.score.label("match_score"),
+            GigMatch.distance_km,
+        )
+        .join(GigRequest, GigRequest.id == GigMatch.request_id)
+        .outerjoin(BandProfile, BandProfile.user_id == GigMatch.band_id)
+        .where(GigMatch.gig_id == gig_id)
+    )
+    return await paginate(db, query, page, response, GigMatch.score, GigMatch.band_id)
@@ -1,36 +1,156 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import PageParams, paginate
 from app.models.notification import Notification
-from app.schemas.notification import NotificationResponse
-from app.api.deps import get_current_user
+from app.schemas.notification import NotificationMarkRead, NotificationResponse, UnreadCount
+from app.core.principal import Principal
+from app.api.deps import get_current_user, get_stream_user
+from app.core.config import settings
+from app.services.notifications import notification_hub, notification_payload
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.get("/", response_model=List[NotificationResponse])
-def get_notifications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_notifications(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(),
+    is_read: Optional[bool] = None,
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
-    return db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).order_by(Notification.created_at.desc()).limit(50).all()
+    query = select(Notification).where(Notification.user_id == current_user.id)
+    if is_read is not None:
+        query = query.where(Notification.is_read == is_read)
+    return await paginate(db, query, page, response, Notification.created_at, Notification.id)
+
+@router.get("/unread-count", response_model=UnreadCount)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    # Matches the ix_notifications_unread partial index, so only unread rows are touched
+    count = await db.scalar(
+        select(func.count()).select_from(Notification).where(
+            Notification.user_id == current_user.id,
+            Notification.is_read == False,
+        )
+    )
+    return {"count": count}
+
+@router.post("/read")
+async def mark_many_as_read(
+    body: NotificationMarkRead,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """Mark every unread notification, or just the given ids, read in one UPDATE."""
+    if not body.all and not body.ids:
+        raise HTTPException(status_code=400, detail="Pass ids or all=true")
+
+    stmt = update(Notification).where(
+        Notification.user_id == current_user.id,
+        Notification.is_read == False,
+    )
+    if not body.all:
+        stmt = stmt.where(Notification.id.in_(body.ids))
+    result = await db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+    await db.commit()
+    return {"status": "ok", "updated": result.rowcount}
 
 @router.post("/{notification_id}/read")
-def mark_as_read(
-    notification_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def mark_as_read(
+    notification_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
-    notif = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
-    if not notif:
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == current_user.id)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Notification not found")
-    
-    notif.is_read = True
-    db.commit()
+    await db.commit()
     return {"status": "ok"}
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+async def _missed_since(db: AsyncSession, user_id, last_event_id: str) -> List[Notification]:
+    """Notifications created after the one the client saw last, oldest first."""
+    try:
+        last_id = UUID(last_event_id)
+    except ValueError:
+        return []
+    anchor = aliased(Notification)
+    query = (
+        select(Notification)
+        .join(anchor, tuple_(Notification.created_at, Notification.id) > tuple_(anchor.created_at, anchor.id))
+        .where(anchor.id == last_id, anchor.user_id == user_id, Notification.user_id == user_id)
+        .order_by(Notification.created_at, Notification.id)
+        .limit(settings.NOTIFICATIONS_RESUME_LIMIT)
+    )
+    return list((await db.scalars(query)).all())
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_stream_user),
+    last_event_id: Optional[str] = Header(None),
+    resume_from: Optional[str] = Query(None, description="Last notification id seen, if Last-Event-ID cannot be sent"),
+) -> Any:
+    """
+    Server-sent events: one `notification` event per new notification for the
+    current user, with comment lines as keep-alives. Reconnecting with
+    Last-Event-ID (EventSource does this itself) replays what was missed.
+    """
+    subscription = notification_hub.subscribe(current_user.id)
+    try:
+        since = last_event_id or resume_from
+        missed = [notification_payload(n) for n in await _missed_since(db, current_user.id, since)] if since else []
+    except BaseException:
+        notification_hub.unsubscribe(subscription)
+        raise
+    # Hand the connection back to the pool; the stream itself never queries
+    await db.close()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {settings.NOTIFICATIONS_RETRY_MS}\n\n"
+            sent = set()
+            for payload in missed:
+                sent.add(payload["id"])
+                yield _sse_event(payload)
+            while not subscription.closed:
+                try:
+                    payload = await asyncio.wait_for(subscription.queue.get(), settings.NOTIFICATIONS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if payload is None:
+                    break
+                if payload["id"] in sent:
+                    continue
+                payload = {k: v for k, v in payload.items() if k != "user_id"}
+                yield _sse_event(payload)
+        finally:
+            notification_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,40 +1,46 @@
 from typing import Any, Union, List
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import NEXT_CURSOR_HEADER, PageParams, paginate
 from app.models.user import User
 from app.models.profile import BandProfile, VenueProfile
 from app.schemas.profile import (
     BandProfileCreate, BandProfileUpdate, BandProfileResponse,
     VenueProfileCreate, VenueProfileUpdate, VenueProfileResponse
 )
+from app.core.principal import Principal, invalidate_principal
+from app.core.response_cache import discover_venues_cache, list_etag, make_etag, profile_cache, venue_list_cache
 from app.api.deps import get_current_user
+from app.services.suggest import suggest_index
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.get("/me", response_model=Union[BandProfileResponse, VenueProfileResponse])
-def get_my_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_my_profile(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     if current_user.role == "band":
-        profile = db.query(BandProfile).filter(BandProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(BandProfile).where(BandProfile.user_id == current_user.id))
     else:
-        profile = db.query(VenueProfile).filter(VenueProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(VenueProfile).where(VenueProfile.user_id == current_user.id))
     
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
 
 @router.put("/me", response_model=Union[BandProfileResponse, VenueProfileResponse])
-def update_my_profile(
+async def update_my_profile(
     profile_in: Union[BandProfileUpdate, VenueProfileUpdate],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     if current_user.role == "band":
-        profile = db.query(BandProfile).filter(BandProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(BandProfile).where(BandProfile.user_id == current_user.id))
         if not profile:
             profile = BandProfile(user_id=current_user.id, **profile_in.dict())
             db.add(profile)
@@ -42,7 +48,7 @@ def update_my_profile(
             for field, value in profile_in.dict(exclude_unset=True).items():
                 setattr(profile, field, value)
     else:
-        profile = db.query(VenueProfile).filter(VenueProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(VenueProfile).where(VenueProfile.user_id == current_user.id))
         if not profile:
             profile = VenueProfile(user_id=current_user.id, **profile_in.dict())
             db.add(profile)
@@ -50,29 +56,57 @@ def update_my_profile(
             for field, value in profile_in.dict(exclude_unset=True).items():
                 setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    # has_*_profile flags may have flipped
+    await invalidate_principal(current_user.id)
+    await profile_cache.invalidate(current_user.id)
+    if isinstance(profile, VenueProfile):
+        await venue_list_cache.invalidate()
+        await discover_venues_cache.invalidate()
+        suggest_index.update_venue(profile)
+    else:
+        suggest_index.update_band(profile)
     return profile
 
 @router.get("/{user_id}", response_model=Union[BandProfileResponse, VenueProfileResponse])
-def get_profile_by_id(
+async def get_profile_by_id(
     user_id: uuid.UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    user = db.query(User).filter(User.id == user_id).first()
+    cached = await profile_cache.lookup(request, user_id)
+    if cached is not None:
+        return cached
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     if user.role == "band":
-        profile = db.query(BandProfile).filter(BandProfile.user_id == user.id).first()
+        profile = await db.scalar(select(BandProfile).where(BandProfile.user_id == user.id))
     else:
-        profile = db.query(VenueProfile).filter(VenueProfile.user_id == user.id).first()
+        profile = await db.scalar(select(VenueProfile).where(VenueProfile.user_id == user.id))
     
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+    schema = BandProfileResponse if user.role == "band" else VenueProfileResponse
+    return await profile_cache.store(request, schema, profile, make_etag(profile.id, profile.updated_at), ident=user_id)
 @router.get("/venues/all", response_model=List[VenueProfileResponse])
-def list_venue_profiles(
-    db: Session = Depends(get_db)
+async def list_venue_profiles(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
-    return db.query(VenueProfile).all()
+    cached = await venue_list_cache.lookup(request)
+    if cached is not None:
+        return cached
+    venues = await paginate(db, select(VenueProfile), page, response, VenueProfile.created_at, VenueProfile.id)
+    next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return await venue_list_cache.store(
+        request,
+        List[VenueProfileResponse],
+        venues,
+        list_etag(venues, next_cursor),
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
@@ -1,19 +1,25 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+from datetime import date
+from typing import Any, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import cast, func, literal, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_read_db
+from app.api.pagination import PageParams, paginate
 from app.models.gig import GigRequest
 from app.schemas.gig import GigRequestCreate, GigRequestUpdate, GigRequestResponse
+from app.core.principal import Principal
 from app.api.deps import get_current_user
+from app.services.matching import refresh_band_matches
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.post("/", response_model=GigRequestResponse)
-def create_gig_request(
+async def create_gig_request(
     request_in: GigRequestCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     if current_user.role != "band":
         raise HTTPException(
@@ -23,26 +29,47 @@ def create_gig_request(
     
     db_request = GigRequest(band_id=current_user.id, **request_in.dict())
     db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    await refresh_band_matches(db, current_user.id)
+    await db.commit()
+    await db.refresh(db_request)
     return db_request
 
+def _parse_between(value: str) -> Tuple[date, date]:
+    try:
+        start, end = (date.fromisoformat(part.strip()) for part in value.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="available_between must be 'YYYY-MM-DD,YYYY-MM-DD'")
+    if end < start:
+        raise HTTPException(status_code=400, detail="available_between ends before it starts")
+    return start, end
+
 @router.get("/", response_model=List[GigRequestResponse])
-def list_gig_requests(
+async def list_gig_requests(
+    response: Response,
     genre: Optional[str] = None,
-    db: Session = Depends(get_db)
+    available_on: Optional[date] = Query(None, description="Bands available on this date"),
+    available_between: Optional[str] = Query(None, description="'start,end': bands available on any day in this range"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
-    query = db.query(GigRequest)
+    query = select(GigRequest)
     if genre:
-        query = query.filter(GigRequest.genres.any(genre))
-    return query.all()
+        # @> rather than = ANY so the GIN index on genres is used
+        query = query.where(GigRequest.genres.op("@>")(cast(array([genre]), GigRequest.genres.type)))
+    # Both date filters go through the GiST index on the availability range
+    if available_on:
+        query = query.where(GigRequest.availability.op("@>")(literal(available_on)))
+    if available_between:
+        start, end = _parse_between(available_between)
+        query = query.where(GigRequest.availability.op("&&")(func.daterange(start, end, "[]")))
+    return await paginate(db, query, page, response, GigRequest.created_at, GigRequest.id)
 
 @router.get("/{id}", response_model=GigRequestResponse)
-def get_gig_request(
+async def get_gig_request(
     id: Any,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
-    request = db.query(GigRequest).filter(GigRequest.id == id).first()
+    request = await db.scalar(select(GigRequest).where(GigRequest.id == id))
     if not request:
         raise HTTPException(status_code=404, detail="Gig request not found")
     return request
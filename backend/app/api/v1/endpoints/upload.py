@@ -0,0 +1,155 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
+from app.models.gig import GigPosting
+from app.models.upload import MediaUpload
+from app.schemas.upload import UploadComplete, UploadCreate, UploadPart, UploadResponse, UploadTicket
+from app.core.principal import Principal
+from app.core.storage import LocalStorage, StorageError, storage
+from app.api.deps import get_current_user
+from app.services.images import image_pipeline
+from app.services.uploads import TARGETS, UPLOAD_BYTES, UPLOADS_COMPLETED, UPLOADS_REJECTED
+from app.core.instrumentation import InstrumentedRoute
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+def _upload_response(upload: MediaUpload) -> UploadResponse:
+    return UploadResponse(
+        id=upload.id,
+        target=upload.target,
+        gig_id=upload.gig_id,
+        content_type=upload.content_type,
+        size=upload.size,
+        status=upload.status,
+        url=storage.public_url(upload.key),
+    )
+
+@router.post("/", response_model=UploadTicket)
+async def create_upload(
+    upload_in: UploadCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """Issue a presigned URL for a demo or photo; the file itself never passes through the API."""
+    target = TARGETS[upload_in.target]
+    is_venue = current_user.role == "venue" or current_user.has_venue_profile
+    if (target.role == "band" and current_user.role != "band") or (target.role == "venue" and not is_venue):
+        raise HTTPException(status_code=403, detail=f"Only {target.role}s can upload a {upload_in.target}")
+    if upload_in.content_type not in target.content_types:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type for {upload_in.target}; use one of {', '.join(target.content_types)}",
+        )
+    if upload_in.size > target.max_bytes:
+        raise HTTPException(status_code=413, detail=f"A {upload_in.target} can be at most {target.max_bytes} bytes")
+    if target.model is GigPosting and upload_in.gig_id is None:
+        raise HTTPException(status_code=400, detail="gig_id is required for a gig_photo")
+    if await target.load(db, current_user.id, upload_in.gig_id) is None:
+        raise HTTPException(status_code=404, detail="Gig not found" if upload_in.gig_id else "Profile not found")
+
+    upload_id = uuid.uuid4()
+    key = target.object_key(current_user.id, upload_id, upload_in.content_type)
+    presigned = await storage.presign_upload(key, upload_in.content_type, upload_in.size)
+    db.add(MediaUpload(
+        id=upload_id,
+        user_id=current_user.id,
+        target=target.name,
+        gig_id=upload_in.gig_id if target.model is GigPosting else None,
+        key=key,
+        content_type=upload_in.content_type,
+        size=upload_in.size,
+        multipart_id=presigned.multipart_id,
+    ))
+    await db.commit()
+    return UploadTicket(
+        id=upload_id,
+        key=key,
+        url=presigned.url,
+        headers=presigned.headers,
+        parts=[UploadPart(part_number=part.part_number, url=part.url) for part in presigned.parts],
+        part_size=presigned.part_size,
+        expires_at=datetime.fromtimestamp(presigned.expires_at, tz=timezone.utc),
+    )
+
+@router.post("/{upload_id}/complete", response_model=UploadResponse)
+async def complete_upload(
+    upload_id: uuid.UUID,
+    complete_in: Optional[UploadComplete] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """Check the stored object against the declared upload and attach its URL."""
+    upload = await db.scalar(
+        select(MediaUpload).where(MediaUpload.id == upload_id, MediaUpload.user_id == current_user.id)
+    )
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.status == "complete":
+        return _upload_response(upload)
+    if upload.status != "pending":
+        raise HTTPException(status_code=400, detail="Upload was rejected; request a new one")
+    target = TARGETS[upload.target]
+
+    if upload.multipart_id:
+        parts = sorted((part.part_number, part.etag) for part in (complete_in.parts if complete_in else []))
+        if not parts:
+            raise HTTPException(status_code=400, detail="parts are required to complete a multipart upload")
+        try:
+            await storage.complete_upload(upload.key, upload.multipart_id, parts)
+        except StorageError as exc:
+            raise HTTPException(status_code=400, detail=f"Could not assemble the upload: {exc}")
+
+    stored = await storage.stat(upload.key)
+    if stored is None:
+        raise HTTPException(status_code=409, detail="The file has not been uploaded yet")
+    if stored.size != upload.size or (stored.content_type and stored.content_type != upload.content_type):
+        await storage.delete(upload.key)
+        upload.status = "rejected"
+        await db.commit()
+        UPLOADS_REJECTED.inc(target=target.name)
+        raise HTTPException(status_code=400, detail="The stored file does not match the declared size and type")
+
+    row = await target.load(db, current_user.id, upload.gig_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Gig not found" if upload.gig_id else "Profile not found")
+    setattr(row, target.column, storage.public_url(upload.key))
+    if target.kind == "photos":
+        # The old photo's derivatives; the image pipeline fills in the new ones
+        row.photo_variants = None
+    upload.status = "complete"
+    upload.completed_at = func.now()
+    await db.commit()
+    await db.refresh(upload)
+
+    await target.invalidate(current_user.id, upload.gig_id)
+    if target.kind == "photos":
+        image_pipeline.submit(upload.id)
+    UPLOADS_COMPLETED.inc(target=target.name)
+    UPLOAD_BYTES.inc(stored.size, target=target.name)
+    return _upload_response(upload)
+
+@router.put("/local/{key:path}", include_in_schema=False)
+async def put_local_object(
+    key: str,
+    request: Request,
+    content_type: str = Query(...),
+    size: int = Query(...),
+    expires: int = Query(...),
+    signature: str = Query(...),
+) -> Any:
+    """Receiving end of LocalStorage's signed URLs, standing in for a bucket in development."""
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not storage.verify(key, content_type, size, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired upload URL")
+    if request.headers.get("content-type") != content_type:
+        raise HTTPException(status_code=400, detail="Content-Type does not match the signed upload")
+    try:
+        await storage.write(key, request.stream(), size)
+    except StorageError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return Response(status_code=200)
@@ -1,20 +1,21 @@
 from typing import Any
 from fastapi import APIRouter, Depends
 from app.schemas.user import UserResponse
-from app.models.user import User
+from app.core.principal import Principal
 from app.api.deps import get_current_user
+from app.core.instrumentation import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 @router.get("/me", response_model=UserResponse)
-def read_user_me(
-    current_user: User = Depends(get_current_user),
+async def read_user_me(
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     return {
         "id": current_user.id,
         "email": current_user.email,
         "role": current_user.role,
         "created_at": current_user.created_at,
-        "has_band_profile": current_user.band_profile is not None,
-        "has_venue_profile": current_user.venue_profile is not None
+        "has_band_profile": current_user.has_band_profile,
+        "has_venue_profile": current_user.has_venue_profile
     }
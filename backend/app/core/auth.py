@@ -1,10 +1,61 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 from jose import jwt
 from passlib.context import CryptContext
 from .config import settings
+from .metrics import REGISTRY
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The configured scheme hashes new passwords; the other one is kept only so
+# existing hashes still verify, and is marked deprecated so they get rehashed.
+_schemes = ["argon2", "bcrypt"] if settings.PASSWORD_HASH_SCHEME == "argon2" else ["bcrypt", "argon2"]
+
+# min/max rounds pinned to the configured cost: a hash made with any other
+# cost reports needs_update and is upgraded on the next successful login.
+pwd_context = CryptContext(
+    schemes=_schemes,
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    argon2__type="ID",
+    argon2__default_rounds=settings.ARGON2_TIME_COST,
+    argon2__min_rounds=settings.ARGON2_TIME_COST,
+    argon2__max_rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# bcrypt and argon2 release the GIL, so a dedicated thread pool scales with
+# cores and keeps hashing off both the event loop and the shared threadpool.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+_pending_hashes = 0
+
+HASH_REJECTED = REGISTRY.counter("password_hash_rejected_total", "Hash jobs refused because the queue was full")
+HASH_PENDING = REGISTRY.gauge("password_hash_pending", "Hash jobs queued or running")
+HASH_PENDING.add_callback(lambda: {(): _pending_hashes})
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING jobs are already queued."""
+
+
+async def _run_hash_job(fn, *args):
+    # Only touched from the event loop thread, so a plain counter is safe
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        HASH_REJECTED.inc()
+        raise PasswordHasherBusy()
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _pending_hashes -= 1
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +63,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (valid, new_hash). new_hash is set when the stored hash uses an
+    old scheme or cost and should be replaced.
+    """
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
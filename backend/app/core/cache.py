@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheBackend:
+    """
+    Minimal async key/value interface shared by the in-process and shared
+    caches. Values must be JSON-serializable so any backend can hold them.
+    """
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    Per-process LRU with per-entry TTL. Entries are evicted least recently
+    used first once max_entries is reached. Invalidation only reaches the
+    current worker; other workers converge when the TTL runs out.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache(CacheBackend):
+    """Shared backend so every worker sees the same entries and invalidations."""
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_URL points at Redis but the 'redis' package is not installed")
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(self._prefix + key, json.dumps(value), px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self._prefix + key for key in keys))
+
+
+def build_cache(url: Optional[str], namespace: str, max_entries: int) -> CacheBackend:
+    """MemoryCache unless a shared backend URL (redis://...) is configured."""
+    if url:
+        return RedisCache(url, prefix=f"booklyn:{namespace}:")
+    return MemoryCache(max_entries=max_entries)
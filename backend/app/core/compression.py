@@ -0,0 +1,152 @@
+import gzip
+from typing import Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .metrics import REGISTRY
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+BYTES_IN = REGISTRY.counter("compression_bytes_in_total", "Response bytes before compression")
+BYTES_OUT = REGISTRY.counter("compression_bytes_out_total", "Response bytes after compression")
+RESPONSES = REGISTRY.counter("compression_responses_total", "Responses compressed")
+SKIPPED = REGISTRY.counter("compression_skipped_total", "Responses sent uncompressed to clients that accept compression")
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{'br': 1.0, 'gzip': 0.8, ...}; codings with q=0 are left out."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header: Optional[str]) -> Optional[str]:
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    br = accepted.get("br", wildcard) if brotli is not None else 0.0
+    gz = accepted.get("gzip", wildcard)
+    if br > 0 and br >= gz:
+        return "br"
+    if gz > 0:
+        return "gzip"
+    return None
+
+
+def weaken_etag(headers: MutableHeaders) -> None:
+    """
+    A strong ETag names one exact byte sequence, and the identity, gzip and
+    brotli bodies differ; the weak form still lets If-None-Match revalidate.
+    """
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete response bodies with brotli or gzip, whichever the
+    client prefers (brotli on ties, when installed). A compressed response's
+    ETag is made weak, and so is a 304's when the client accepts compression.
+
+    Bodies under minimum_size, non-text content, responses that already carry
+    a Content-Encoding, and streamed responses (SSE, anything sent in more
+    than one chunk) pass through untouched, so streams are never buffered.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(self, encoding, send).send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        self.passthrough = True
+        headers = MutableHeaders(scope=self.start)
+        body = message.get("body", b"")
+        if self.start["status"] == 304:
+            # Must carry the ETag the full (compressed) response would have
+            weaken_etag(headers)
+        reason = self._skip_reason(headers, body, message.get("more_body", False))
+        if reason is not None:
+            SKIPPED.inc(reason=reason)
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        compressed = self.middleware.compress(self.encoding, body)
+        BYTES_IN.inc(len(body), encoding=self.encoding)
+        BYTES_OUT.inc(len(compressed), encoding=self.encoding)
+        RESPONSES.inc(encoding=self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        weaken_etag(headers)
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _skip_reason(self, headers: MutableHeaders, body: bytes, more_body: bool) -> Optional[str]:
+        if more_body:
+            return "streamed"
+        if "content-encoding" in headers:
+            return "encoded"
+        if len(body) < self.middleware.minimum_size:
+            return "small"
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return "content_type"
+        return None
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -8,6 +8,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # Password hashing
+    PASSWORD_HASH_SCHEME: str = "bcrypt" # or "argon2" (argon2id, needs argon2-cffi)
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536 # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: Optional[int] = None # defaults to the CPU count
+    PASSWORD_HASH_MAX_PENDING: int = 64 # beyond this, login/register answer 503
     
     # Database
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
@@ -15,11 +24,104 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "booklyn")
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
+    # Serve requests through asyncpg; set to false to fall back to psycopg2 in a threadpool
+    DB_ASYNC: bool = True
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800 # seconds; recycle before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True # detect connections killed by a failover before use
+    # Set when connecting through pgbouncer in transaction mode
+    DB_PGBOUNCER: bool = False
+    # Direct Postgres URL for `python -m app.db.migrate` when the app goes through pgbouncer
+    MIGRATION_DATABASE_URL: Optional[str] = None
+    # Read replicas: comma-separated postgresql:// URLs; empty sends every query to the primary
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin" # or "least_connections"
+    DB_REPLICA_RETRY_SECONDS: float = 30.0 # how long a failed replica stays out of rotation
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0 # reads stay on the primary this long after a client writes
     
+    # Caching: in-process by default; set to redis://... to share across workers
+    CACHE_URL: Optional[str] = None
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # Anonymous read routes (gig detail, public profiles, venue list, gig discovery)
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_MAX_AGE: int = 30 # Cache-Control max-age for browsers and CDNs; ETags revalidate after
+
+    # Notification push stream
+    NOTIFICATIONS_PG_BRIDGE: bool = False # fan out through Postgres LISTEN/NOTIFY across workers
+    NOTIFICATIONS_KEEPALIVE_SECONDS: float = 15.0
+    NOTIFICATIONS_RETRY_MS: int = 3000 # client reconnect delay sent to EventSource
+    NOTIFICATIONS_RESUME_LIMIT: int = 100
+    NOTIFICATIONS_STREAM_QUEUE_SIZE: int = 100
+
+    # List serialization: "orm" (ORM objects through response_model), "validated"
+    # (column tuples through a prebuilt TypeAdapter) or "trusted" (column tuples
+    # straight to orjson)
+    SERIALIZATION_MODE: str = "orm"
+
+    # Response compression (brotli needs the brotli package, otherwise gzip only)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024 # bytes; smaller bodies are not worth the CPU
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4 # 0-11; higher is smaller but much slower
+
+    # Instrumentation
+    LOG_LEVEL: str = "INFO"
+    SLOW_QUERY_MS: float = 200.0 # statements at least this slow are logged with their route
+    SERVER_TIMING_ENABLED: bool = True # per-request db/pool/serialization timings in a Server-Timing header
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = 20
+    PAGE_SIZE_MAX: int = 100
+
+    # Discovery
+    DISCOVERY_DEFAULT_RADIUS_KM: float = 50.0
+    DISCOVERY_MAX_RADIUS_KM: float = 500.0
+    DISCOVERY_FACET_LIMIT: int = 20 # values returned per facet
+    # Type-ahead index: reloaded this often to pick up other workers' writes (0: only at startup)
+    SUGGEST_REFRESH_SECONDS: float = 300.0
+
+    # Media uploads go straight from the client to object storage: "s3" (S3, R2,
+    # MinIO...; needs boto3) or "local" (files under STORAGE_LOCAL_DIR, for development)
+    STORAGE_BACKEND: str = "local"
+    STORAGE_BUCKET: Optional[str] = None
+    STORAGE_ENDPOINT_URL: Optional[str] = None # e.g. https://<account>.r2.cloudflarestorage.com
+    STORAGE_REGION: Optional[str] = None
+    STORAGE_ACCESS_KEY_ID: Optional[str] = None # boto3's default credential chain when unset
+    STORAGE_SECRET_ACCESS_KEY: Optional[str] = None
+    STORAGE_PUBLIC_URL: Optional[str] = None # public base URL of stored objects (bucket website or CDN)
+    STORAGE_LOCAL_DIR: str = "media"
+    STORAGE_LOCAL_BASE_URL: str = "http://localhost:8000" # where this API is reachable, for local upload/read URLs
+    UPLOAD_URL_EXPIRE_SECONDS: int = 900
+    UPLOAD_MAX_DEMO_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_MAX_PHOTO_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024 # larger S3 uploads are split into presigned parts
+    UPLOAD_PART_SIZE: int = 5 * 1024 * 1024 # S3's minimum for every part but the last
+
+    # Photo derivatives: resized WebP copies made in the background (needs Pillow)
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_WORKERS: int = 2 # threads resizing images; Pillow releases the GIL while it works
+    IMAGE_QUEUE_SIZE: int = 500 # beyond this, new photos wait for the next sweep
+    IMAGE_SWEEP_SECONDS: float = 300.0 # how often photos whose job was lost are queued again
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 40_000_000 # larger images are not processed (decompression bombs)
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    @property
+    def REPLICA_URLS(self) -> List[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         case_sensitive = True
 
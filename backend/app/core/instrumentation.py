@@ -0,0 +1,184 @@
+import functools
+import inspect
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .config import settings
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_query")
+
+REQUEST_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "Time to the first response byte, per route")
+REQUEST_DB_SECONDS = REGISTRY.histogram("http_request_db_seconds", "Time spent executing SQL, per route")
+REQUEST_POOL_WAIT_SECONDS = REGISTRY.histogram("http_request_pool_wait_seconds", "Time spent waiting for a pooled connection, per route")
+REQUEST_SERIALIZATION_SECONDS = REGISTRY.histogram("http_request_serialization_seconds", "Time from the endpoint returning to the response being ready, per route")
+REQUEST_QUERIES = REGISTRY.histogram(
+    "http_request_queries", "SQL statements executed, per route",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+SLOW_QUERIES = REGISTRY.counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS, per route")
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestStats:
+    route: str = UNMATCHED_ROUTE
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+    endpoint_done: Optional[float] = None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def instrument_queries(engine: Engine) -> None:
+    """
+    Count and time every statement against the current request, and log
+    statements slower than SLOW_QUERY_MS together with the route that ran
+    them. Works for the async engine too (pass engine.sync_engine).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            route = stats.route if stats is not None else "-"
+            SLOW_QUERIES.inc(route=route)
+            slow_query_logger.warning(
+                "slow query %.1fms route=%s: %s",
+                elapsed * 1000, route, " ".join(statement.split())[:1000],
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        # The statement failed, so after_cursor_execute will not pop its start
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Tags the request with its route template (low-cardinality metrics label)
+    and timestamps the moment the endpoint returns. What follows (response
+    model validation, encoding, building the response) counts as
+    serialization time.
+    """
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router() rebuilds routes from the already-wrapped endpoint
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "_instrumented", False):
+            original = endpoint
+
+            @functools.wraps(original)
+            async def endpoint(*args, **kw):
+                try:
+                    return await original(*args, **kw)
+                finally:
+                    stats = _current.get()
+                    if stats is not None:
+                        stats.endpoint_done = time.perf_counter()
+
+            endpoint._instrumented = True
+
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        # Newer FastAPI matches included routes against the router's own route
+        # objects, so self.path lacks the include_router() prefix (and any
+        # mount path). Recover it from the concrete path: the shortest head
+        # after which this route's pattern matches the rest.
+        suffix = re.compile("(.*?)" + self.path_regex.pattern.lstrip("^"))
+
+        async def instrumented_handler(request):
+            stats = _current.get()
+            if stats is None:
+                return await handler(request)
+            match = suffix.fullmatch(request.scope["path"])
+            stats.route = (match.group(1) if match else "") + self.path
+            response = await handler(request)
+            if stats.endpoint_done is not None:
+                stats.serialization_seconds += time.perf_counter() - stats.endpoint_done
+            return response
+
+        return instrumented_handler
+
+
+class InstrumentationMiddleware:
+    """
+    Collects RequestStats for each HTTP request, sends them as a
+    Server-Timing header (visible in browser dev tools) and feeds the
+    per-route histograms served at /metrics.
+    """
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        elapsed = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal elapsed
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing_header(stats, elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            labels = {"route": stats.route, "method": scope["method"]}
+            REQUEST_SECONDS.observe(elapsed, **labels)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, **labels)
+            REQUEST_POOL_WAIT_SECONDS.observe(stats.pool_wait_seconds, **labels)
+            REQUEST_SERIALIZATION_SECONDS.observe(stats.serialization_seconds, **labels)
+            REQUEST_QUERIES.observe(stats.queries, **labels)
+
+
+def server_timing_header(stats: RequestStats, total_seconds: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries"',
+        f"pool;dur={stats.pool_wait_seconds * 1000:.2f}",
+        f"ser;dur={stats.serialization_seconds * 1000:.2f}",
+        f"total;dur={total_seconds * 1000:.2f}",
+    ])
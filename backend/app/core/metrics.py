@@ -0,0 +1,130 @@
+import bisect
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = ",".join(f'{k}="{v}"' for k, v in key)
+    return "{" + pairs + "}"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge:
+    """
+    Gauge read at scrape time from a callback returning {labels: value}, so
+    it always reflects live state (e.g. pool checkouts) without bookkeeping.
+    """
+    type = "gauge"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._callbacks: List[Callable[[], Dict[LabelKey, float]]] = []
+
+    def add_callback(self, fn: Callable[[], Dict[LabelKey, float]]) -> None:
+        self._callbacks.append(fn)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        out = []
+        for fn in self._callbacks:
+            for key, value in fn().items():
+                out.append((self.name, key, value))
+        return out
+
+
+class Histogram:
+    """Cumulative-bucket histogram, rendered as _bucket/_sum/_count series."""
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (last is +Inf)], sum, count
+        self._values: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        out = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    out.append((f"{self.name}_bucket", key + (("le", le),), cumulative))
+                out.append((f"{self.name}_sum", key, total))
+                out.append((f"{self.name}_count", key, count))
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self.register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self.register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,59 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from .cache import build_cache
+from .config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    What an authenticated request needs to know about its user. Cached by
+    user id, so most requests reach business logic without touching the
+    users or profile tables.
+    """
+    id: UUID
+    email: str
+    role: str
+    created_at: datetime
+    has_band_profile: bool = False
+    has_venue_profile: bool = False
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        data["created_at"] = self.created_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Principal":
+        return cls(
+            id=UUID(data["id"]),
+            email=data["email"],
+            role=data["role"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            has_band_profile=data["has_band_profile"],
+            has_venue_profile=data["has_venue_profile"],
+        )
+
+
+principal_cache = build_cache(
+    settings.CACHE_URL,
+    namespace="principal",
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+async def get_cached_principal(user_id: str) -> Optional[Principal]:
+    data = await principal_cache.get(str(user_id))
+    return Principal.from_dict(data) if data is not None else None
+
+
+async def cache_principal(principal: Principal) -> None:
+    await principal_cache.set(str(principal.id), principal.to_dict(), settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+async def invalidate_principal(user_id) -> None:
+    """Call after any write that changes the user row or creates a profile."""
+    await principal_cache.delete(str(user_id))
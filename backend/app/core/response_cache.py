@@ -0,0 +1,127 @@
+import hashlib
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from .cache import build_cache
+from .config import settings
+from .metrics import REGISTRY
+
+CACHE_HITS = REGISTRY.counter("response_cache_hits_total", "Public GETs answered from the response cache")
+CACHE_MISSES = REGISTRY.counter("response_cache_misses_total", "Public GETs that had to query the database")
+NOT_MODIFIED = REGISTRY.counter("response_cache_not_modified_total", "Conditional GETs answered with 304")
+
+response_cache = build_cache(
+    settings.CACHE_URL,
+    namespace="response",
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
+
+# Version tokens outlive any entry keyed by them by a wide margin
+_VERSION_TTL = 86400.0
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from whatever identifies a representation, e.g. (id, updated_at)."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def list_etag(items, *extra: Any) -> str:
+    """ETag for a page of rows: their ids and updated_at plus anything else on the page."""
+    return make_etag(*(f"{item.id}@{item.updated_at}" for item in items), *extra)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Weak comparison: compressed responses carry the W/ form of the ETag
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _query_key(request: Request) -> str:
+    return urlencode(sorted(request.query_params.multi_items()))
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}",
+    }
+
+
+class CachedRoute:
+    """
+    Server-side cache plus HTTP validators for one anonymous read route.
+
+    Single resources are keyed by id and deleted on write. Collections are
+    keyed by their query string under a version token; a write replaces the
+    token, so every cached page of that collection is skipped at once and
+    ages out of the LRU.
+    """
+    def __init__(self, name: str, collection: bool = False):
+        self.name = name
+        self.collection = collection
+
+    async def _key(self, request: Request, ident: Any = None) -> str:
+        if not self.collection:
+            return f"{self.name}:{ident}"
+        version = await response_cache.get(f"version:{self.name}") or "0"
+        return f"{self.name}:{version}:{_query_key(request)}"
+
+    def _respond(self, request: Request, entry: Dict[str, Any]) -> Response:
+        headers = dict(entry["headers"], **_cache_headers(entry["etag"]))
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            NOT_MODIFIED.inc(route=self.name)
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+    async def lookup(self, request: Request, ident: Any = None) -> Optional[Response]:
+        """The cached (or 304) response, or None if the route has to run."""
+        entry = await response_cache.get(await self._key(request, ident))
+        if entry is None:
+            CACHE_MISSES.inc(route=self.name)
+            return None
+        CACHE_HITS.inc(route=self.name)
+        return self._respond(request, entry)
+
+    async def store(
+        self,
+        request: Request,
+        schema,
+        data: Any,
+        etag: str,
+        ident: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Serialize data through schema, cache it, and answer this request with it."""
+        adapter = _adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True)).decode()
+        entry = {"body": body, "etag": etag, "headers": headers or {}}
+        await response_cache.set(await self._key(request, ident), entry, settings.RESPONSE_CACHE_TTL_SECONDS)
+        return self._respond(request, entry)
+
+    async def invalidate(self, ident: Any = None) -> None:
+        """Drop one resource, or every cached page of a collection."""
+        if self.collection:
+            await response_cache.set(f"version:{self.name}", uuid.uuid4().hex, _VERSION_TTL)
+        else:
+            await response_cache.delete(f"{self.name}:{ident}")
+
+
+gig_cache = CachedRoute("gig")
+profile_cache = CachedRoute("profile")
+venue_list_cache = CachedRoute("venues", collection=True)
+discover_gigs_cache = CachedRoute("discover_gigs", collection=True)
+discover_venues_cache = CachedRoute("discover_venues", collection=True)
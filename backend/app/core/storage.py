@@ -0,0 +1,292 @@
+"""
+Object storage for user media.
+
+The API never handles the bytes of an upload: it signs a URL, the client
+PUTs the file straight to the store, and the API then checks what arrived
+with a HEAD request. S3Storage covers S3 and compatible stores (R2, MinIO);
+LocalStorage keeps files on disk for development and tests.
+"""
+import hashlib
+import hmac
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, urlencode
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+
+class StorageError(RuntimeError):
+    """The store refused an operation, e.g. a multipart upload with missing parts."""
+
+
+@dataclass
+class PresignedPart:
+    part_number: int
+    url: str
+
+
+@dataclass
+class PresignedUpload:
+    """How the client sends the file: one PUT to url, or one PUT per part."""
+    url: Optional[str]
+    headers: Dict[str, str]
+    expires_at: float
+    multipart_id: Optional[str] = None
+    parts: List[PresignedPart] = field(default_factory=list)
+    part_size: Optional[int] = None
+
+
+@dataclass
+class StoredObject:
+    size: int
+    content_type: Optional[str]
+
+
+class StorageBackend(ABC):
+    """Where media lives. A backend missing any operation fails when it is instantiated."""
+
+    @abstractmethod
+    async def presign_upload(self, key: str, content_type: str, size: int) -> PresignedUpload:
+        """URL(s) the client uploads the file to directly."""
+
+    @abstractmethod
+    async def complete_upload(self, key: str, multipart_id: str, parts: Sequence[Tuple[int, str]]) -> None:
+        """Assemble a multipart upload from (part number, ETag) pairs."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Size and type of a stored object, or None if nothing was uploaded."""
+
+    @abstractmethod
+    async def read(self, key: str) -> Optional[bytes]:
+        """The object's bytes, or None if there is no such object."""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> None:
+        """Store an object the API produced itself (small, so not worth a presigned round trip)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove an object; deleting a missing one is not an error."""
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        """Where clients fetch the object from."""
+
+
+class S3Storage(StorageBackend):
+    """
+    Presigned PUTs against an S3-compatible bucket. Files above
+    UPLOAD_MULTIPART_THRESHOLD get a presigned URL per UPLOAD_PART_SIZE
+    part, so a dropped connection only costs one part. Signing is local;
+    the store is only called to create, complete and inspect uploads and
+    by the image pipeline.
+    """
+    def __init__(
+        self,
+        bucket: Optional[str],
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+    ):
+        try:
+            import boto3
+            from botocore.config import Config
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND is s3 but the 'boto3' package is not installed")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND is s3 but STORAGE_BUCKET is not set")
+        self.bucket = bucket
+        self._client_error = ClientError
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(signature_version="s3v4"),
+        )
+        self._public_url = (public_url or f"{self._client.meta.endpoint_url}/{bucket}").rstrip("/")
+
+    def _presign(self, operation: str, **params) -> str:
+        return self._client.generate_presigned_url(
+            operation,
+            Params={"Bucket": self.bucket, **params},
+            ExpiresIn=settings.UPLOAD_URL_EXPIRE_SECONDS,
+        )
+
+    async def presign_upload(self, key: str, content_type: str, size: int) -> PresignedUpload:
+        expires_at = time.time() + settings.UPLOAD_URL_EXPIRE_SECONDS
+        if size <= settings.UPLOAD_MULTIPART_THRESHOLD:
+            # Content type and length are signed: the store rejects a different file
+            url = self._presign("put_object", Key=key, ContentType=content_type, ContentLength=size)
+            return PresignedUpload(url=url, headers={"Content-Type": content_type}, expires_at=expires_at)
+
+        created = await run_in_threadpool(
+            self._client.create_multipart_upload, Bucket=self.bucket, Key=key, ContentType=content_type
+        )
+        multipart_id = created["UploadId"]
+        part_size = settings.UPLOAD_PART_SIZE
+        parts = [
+            PresignedPart(number, self._presign("upload_part", Key=key, UploadId=multipart_id, PartNumber=number))
+            for number in range(1, -(-size // part_size) + 1)
+        ]
+        return PresignedUpload(
+            url=None, headers={}, expires_at=expires_at, multipart_id=multipart_id, parts=parts, part_size=part_size
+        )
+
+    async def complete_upload(self, key: str, multipart_id: str, parts: Sequence[Tuple[int, str]]) -> None:
+        try:
+            await run_in_threadpool(
+                self._client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=multipart_id,
+                MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in parts]},
+            )
+        except self._client_error as exc:
+            raise StorageError(exc.response.get("Error", {}).get("Message") or str(exc))
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            head = await run_in_threadpool(self._client.head_object, Bucket=self.bucket, Key=key)
+        except self._client_error as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(size=head["ContentLength"], content_type=head.get("ContentType"))
+
+    async def read(self, key: str) -> Optional[bytes]:
+        try:
+            response = await run_in_threadpool(self._client.get_object, Bucket=self.bucket, Key=key)
+        except self._client_error as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return await run_in_threadpool(response["Body"].read)
+
+    async def put(self, key: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> None:
+        params = {"CacheControl": cache_control} if cache_control else {}
+        await run_in_threadpool(
+            self._client.put_object, Bucket=self.bucket, Key=key, Body=data, ContentType=content_type, **params
+        )
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    def public_url(self, key: str) -> str:
+        return f"{self._public_url}/{quote(key)}"
+
+
+class LocalStorage(StorageBackend):
+    """
+    Files under a directory, served at /media. Upload URLs point at an API
+    route that checks an HMAC signature, so this backend does stream bytes
+    through the API process: it stands in for a bucket in development and
+    tests, not in production.
+    """
+    def __init__(self, root: str, base_url: str, secret: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        self._secret = secret.encode()
+
+    def path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f"Invalid key {key!r}")
+        return path
+
+    def signature(self, key: str, content_type: str, size: int, expires: int) -> str:
+        message = f"{key}\n{content_type}\n{size}\n{expires}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def verify(self, key: str, content_type: str, size: int, expires: int, signature: str) -> bool:
+        return expires >= time.time() and hmac.compare_digest(
+            signature, self.signature(key, content_type, size, expires)
+        )
+
+    async def presign_upload(self, key: str, content_type: str, size: int) -> PresignedUpload:
+        expires = int(time.time()) + settings.UPLOAD_URL_EXPIRE_SECONDS
+        query = urlencode({
+            "content_type": content_type,
+            "size": size,
+            "expires": expires,
+            "signature": self.signature(key, content_type, size, expires),
+        })
+        url = f"{self.base_url}/api/v1/uploads/local/{quote(key)}?{query}"
+        return PresignedUpload(url=url, headers={"Content-Type": content_type}, expires_at=expires)
+
+    async def write(self, key: str, chunks: AsyncIterator[bytes], size: int) -> None:
+        """Store the body of a signed PUT; anything other than exactly size bytes is discarded."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        received = 0
+        try:
+            with open(partial, "wb") as f:
+                async for chunk in chunks:
+                    received += len(chunk)
+                    if received > size:
+                        raise StorageError(f"Body exceeds the signed size of {size} bytes")
+                    await run_in_threadpool(f.write, chunk)
+            if received != size:
+                raise StorageError(f"Received {received} bytes, expected {size}")
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    async def complete_upload(self, key: str, multipart_id: str, parts: Sequence[Tuple[int, str]]) -> None:
+        raise StorageError("Local storage does not issue multipart uploads")
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            return StoredObject(size=os.stat(self.path(key)).st_size, content_type=None)
+        except FileNotFoundError:
+            return None
+
+    async def read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key), "rb") as f:
+                return await run_in_threadpool(f.read)
+        except FileNotFoundError:
+            return None
+
+    async def put(self, key: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> None:
+        async def chunks():
+            yield data
+        await self.write(key, chunks(), len(data))
+
+    async def delete(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def public_url(self, key: str) -> str:
+        return f"{self.base_url}/media/{quote(key)}"
+
+
+def build_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            settings.STORAGE_BUCKET,
+            endpoint_url=settings.STORAGE_ENDPOINT_URL,
+            region=settings.STORAGE_REGION,
+            access_key_id=settings.STORAGE_ACCESS_KEY_ID,
+            secret_access_key=settings.STORAGE_SECRET_ACCESS_KEY,
+            public_url=settings.STORAGE_PUBLIC_URL,
+        )
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.STORAGE_LOCAL_DIR, settings.STORAGE_LOCAL_BASE_URL, settings.SECRET_KEY)
+    raise ValueError(f"Unknown STORAGE_BACKEND {settings.STORAGE_BACKEND!r}")
+
+
+storage = build_storage()
@@ -0,0 +1,227 @@
+"""
+Versioned schema migrations.
+
+Each module in app/db/migrations named vNNNN_<name>.py is one migration,
+applied in version order and recorded in schema_migrations. A module
+defines `steps`: SQL strings, callables taking the connection, or
+ConcurrentIndex. A migration runs in a single transaction unless it sets
+`transactional = False`, which CREATE INDEX CONCURRENTLY requires.
+
+A Postgres advisory lock serializes runners, so several deploy hooks or
+workers can call upgrade() at once and only one applies anything.
+
+    python -m app.db.migrate            # apply pending migrations
+    python -m app.db.migrate status     # current and latest version
+"""
+import argparse
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Union
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.db.migrations"
+VERSION_TABLE = "schema_migrations"
+# Arbitrary, but fixed: every runner must use the same key
+ADVISORY_LOCK_KEY = 0x626F6F6B6C796E
+
+_MODULE_NAME = re.compile(r"^v(\d+)_(\w+)$")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class ConcurrentIndex:
+    """
+    CREATE INDEX CONCURRENTLY without blocking writes. A failed concurrent
+    build leaves an INVALID index behind, so one is dropped before retrying.
+    """
+    name: str
+    table: str
+    definition: str  # everything after the table name, e.g. "(user_id, created_at)" or "USING gin (tags)"
+
+    def apply(self, conn: Connection) -> None:
+        invalid = conn.exec_driver_sql(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            f"WHERE c.relname = '{self.name}' AND NOT i.indisvalid"
+        ).first()
+        if invalid:
+            logger.warning("Dropping invalid index %s left by an earlier attempt", self.name)
+            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {self.name}")
+        conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table} {self.definition}")
+
+
+Step = Union[str, Callable[[Connection], Any], ConcurrentIndex]
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    steps: List[Step]
+    transactional: bool = True
+
+    def apply(self, conn: Connection) -> None:
+        for step in self.steps:
+            if isinstance(step, str):
+                # Driver-level so the SQL is sent verbatim (no bind parameter parsing)
+                conn.exec_driver_sql(step)
+            elif isinstance(step, ConcurrentIndex):
+                step.apply(conn)
+            else:
+                step(conn)
+
+
+def load_migrations() -> List[Migration]:
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+    migrations = []
+    for info in pkgutil.iter_modules(package.__path__):
+        match = _MODULE_NAME.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{info.name}")
+        migration = Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            steps=list(module.steps),
+            transactional=getattr(module, "transactional", True),
+        )
+        if not migration.transactional and any(not isinstance(s, ConcurrentIndex) for s in migration.steps):
+            logger.warning("Migration v%04d runs without a transaction; keep its steps idempotent", migration.version)
+        migrations.append(migration)
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_PACKAGE}: {versions}")
+    return migrations
+
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied version; 0 for a database the runner has never touched."""
+    if conn.exec_driver_sql(f"SELECT to_regclass('{VERSION_TABLE}')").scalar() is None:
+        return 0
+    return conn.exec_driver_sql(f"SELECT coalesce(max(version), 0) FROM {VERSION_TABLE}").scalar()
+
+
+def check_schema(conn: Connection) -> int:
+    """
+    Called at startup instead of running DDL: fail fast if the database is
+    behind this code. A database ahead of it (newer code rolled out
+    elsewhere) is allowed, since migrations are written to be additive.
+    """
+    current, head = current_version(conn), head_version()
+    if current < head:
+        raise SchemaOutOfDate(
+            f"Database schema is at version {current}, this build needs {head}. "
+            "Run `python -m app.db.migrate` before starting the API."
+        )
+    if current > head:
+        logger.warning("Database schema version %s is newer than this build (%s)", current, head)
+    return current
+
+
+def _create_engine() -> Engine:
+    # Straight to Postgres: a session-level advisory lock does not survive
+    # pgbouncer's transaction pooling
+    return create_engine(settings.MIGRATION_DATABASE_URL or settings.DATABASE_URL, poolclass=NullPool)
+
+
+def upgrade(engine: Optional[Engine] = None, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to target (default: all). Returns the versions applied."""
+    engine = engine or _create_engine()
+    applied = []
+    with engine.connect() as conn:
+        if not conn.exec_driver_sql(f"SELECT pg_try_advisory_lock({ADVISORY_LOCK_KEY})").scalar():
+            logger.info("Waiting for another migration runner to finish")
+            conn.exec_driver_sql(f"SELECT pg_advisory_lock({ADVISORY_LOCK_KEY})")
+        conn.commit()
+        try:
+            conn.exec_driver_sql(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                "version INTEGER PRIMARY KEY, "
+                "name VARCHAR(255) NOT NULL, "
+                "applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(), "
+                "duration_ms INTEGER)"
+            )
+            conn.commit()
+            # Read under the lock: another runner may just have applied some
+            done = {row[0] for row in conn.exec_driver_sql(f"SELECT version FROM {VERSION_TABLE}")}
+            conn.commit()
+            for migration in load_migrations():
+                if migration.version in done or (target is not None and migration.version > target):
+                    continue
+                logger.info("Applying migration v%04d_%s", migration.version, migration.name)
+                start = time.perf_counter()
+                _apply(conn, migration)
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                conn.exec_driver_sql(
+                    f"INSERT INTO {VERSION_TABLE} (version, name, duration_ms) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, duration_ms),
+                )
+                conn.commit()
+                applied.append(migration.version)
+                logger.info("Applied v%04d_%s in %d ms", migration.version, migration.name, duration_ms)
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"SELECT pg_advisory_unlock({ADVISORY_LOCK_KEY})")
+            conn.commit()
+    return applied
+
+
+def _apply(conn: Connection, migration: Migration) -> None:
+    if migration.transactional:
+        # The version row is inserted by the caller before this transaction commits
+        migration.apply(conn)
+        return
+    conn.commit()
+    conn.execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        migration.apply(conn)
+    finally:
+        # Ends SQLAlchemy's own transaction; in autocommit there is nothing to undo
+        conn.rollback()
+        conn.execution_options(isolation_level=conn.default_isolation_level)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations.")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    parser.add_argument("--target", type=int, help="stop after this version")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "status":
+        engine = _create_engine()
+        with engine.connect() as conn:
+            done = set()
+            if current_version(conn):
+                done = {row[0] for row in conn.exec_driver_sql(f"SELECT version FROM {VERSION_TABLE}")}
+        for migration in load_migrations():
+            state = "applied" if migration.version in done else "pending"
+            print(f"v{migration.version:04d}_{migration.name:<40} {state}")
+        return
+
+    applied = upgrade(target=args.target)
+    if applied:
+        print(f"Applied {len(applied)} migration(s); schema is at version {applied[-1]}")
+    else:
+        print("Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Schema migrations, applied in order by app.db.migrate. See that module for the file format."""
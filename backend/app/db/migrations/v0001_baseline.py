@@ -0,0 +1,270 @@
+"""
+The schema as it stood when versioned migrations were introduced, written
+out as SQL so that it never changes with the models. Later schema changes
+are later migrations.
+
+A fresh database gets the tables create_all made at the time, except that
+gig_postings.tags and venue_profiles.typical_genres are TEXT[] as schema.sql
+declared them; both are converted below or in v0003, as on a deployed
+database. A database built by the old create_all-at-startup plus
+run_migration.py gets the same column, index and trigger upgrades that
+script used to apply. Every step is idempotent.
+"""
+
+TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id UUID NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(20) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)",
+    """
+    CREATE TABLE IF NOT EXISTS band_profiles (
+        id UUID NOT NULL,
+        user_id UUID,
+        band_name VARCHAR(255) NOT NULL,
+        genre VARCHAR(100) NOT NULL,
+        location_city VARCHAR(100) NOT NULL,
+        location_state VARCHAR(50) NOT NULL,
+        bio TEXT,
+        demo_url TEXT,
+        photo_url TEXT,
+        instagram VARCHAR(255),
+        spotify VARCHAR(255),
+        youtube VARCHAR(255),
+        contact_method VARCHAR(20),
+        whatsapp_number VARCHAR(20),
+        messenger_username VARCHAR(255),
+        contact_email VARCHAR(255),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        UNIQUE (user_id),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_genre ON band_profiles (genre)",
+    """
+    CREATE TABLE IF NOT EXISTS venue_profiles (
+        id UUID NOT NULL,
+        user_id UUID,
+        venue_name VARCHAR(255) NOT NULL,
+        location_city VARCHAR(100) NOT NULL,
+        location_state VARCHAR(50) NOT NULL,
+        capacity INTEGER,
+        bio TEXT,
+        photo_url TEXT,
+        typical_genres TEXT[],
+        contact_method VARCHAR(20),
+        whatsapp_number VARCHAR(20),
+        messenger_username VARCHAR(255),
+        instagram VARCHAR(255),
+        contact_email VARCHAR(255),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        UNIQUE (user_id),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gig_postings (
+        id UUID NOT NULL,
+        venue_id UUID,
+        venue_name VARCHAR(255),
+        title VARCHAR(255) NOT NULL,
+        date DATE NOT NULL,
+        time VARCHAR(50) NOT NULL,
+        genre VARCHAR(100) NOT NULL,
+        description TEXT,
+        pay VARCHAR(100),
+        formatted_address TEXT,
+        location_lat NUMERIC(9, 6),
+        location_lng NUMERIC(9, 6),
+        status VARCHAR(20),
+        tags TEXT[],
+        photo_url TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        search_vector TSVECTOR,
+        PRIMARY KEY (id),
+        FOREIGN KEY (venue_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_gig_postings_genre ON gig_postings (genre)",
+    """
+    CREATE TABLE IF NOT EXISTS gig_applications (
+        id UUID NOT NULL,
+        gig_id UUID,
+        applicant_id UUID,
+        venue_id UUID,
+        applicant_name VARCHAR(255),
+        applicant_avatar TEXT,
+        message TEXT,
+        status VARCHAR(20),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        FOREIGN KEY (gig_id) REFERENCES gig_postings (id) ON DELETE CASCADE,
+        FOREIGN KEY (applicant_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (venue_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gig_requests (
+        id UUID NOT NULL,
+        band_id UUID,
+        available_from DATE NOT NULL,
+        available_to DATE NOT NULL,
+        genres VARCHAR[] NOT NULL,
+        willing_to_travel BOOLEAN,
+        max_distance INTEGER,
+        location_lat NUMERIC(9, 6),
+        location_lng NUMERIC(9, 6),
+        notes TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        availability DATERANGE GENERATED ALWAYS AS (daterange(available_from, available_to, '[]')) STORED,
+        PRIMARY KEY (id),
+        FOREIGN KEY (band_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gig_matches (
+        gig_id UUID NOT NULL,
+        band_id UUID NOT NULL,
+        request_id UUID NOT NULL,
+        venue_id UUID,
+        gig_date DATE NOT NULL,
+        score FLOAT NOT NULL,
+        distance_km FLOAT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (gig_id, band_id),
+        FOREIGN KEY (gig_id) REFERENCES gig_postings (id) ON DELETE CASCADE,
+        FOREIGN KEY (band_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (request_id) REFERENCES gig_requests (id) ON DELETE CASCADE,
+        FOREIGN KEY (venue_id) REFERENCES users (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id UUID NOT NULL,
+        user_id UUID,
+        title VARCHAR,
+        content VARCHAR,
+        type VARCHAR,
+        is_read BOOLEAN DEFAULT false NOT NULL,
+        link VARCHAR,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+]
+
+GIG_SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION gig_postings_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.genre, '') || ' ' || array_to_string(coalesce(NEW.tags, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.venue_name, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+GIG_SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER gig_postings_search_vector_update
+BEFORE INSERT OR UPDATE OF title, genre, tags, venue_name, description ON gig_postings
+FOR EACH ROW EXECUTE PROCEDURE gig_postings_search_vector_update()
+"""
+
+# app/services/matching.py's scoring as of this migration, with
+# DISCOVERY_MAX_RADIUS_KM at its default of 500
+REBUILD_MATCHES = """
+INSERT INTO gig_matches (gig_id, band_id, request_id, venue_id, gig_date, score, distance_km)
+SELECT DISTINCT ON (g.id, r.band_id)
+    g.id, r.band_id, r.id, g.venue_id, g.date,
+    CAST(
+        0.6
+        + 0.3 * CASE
+            WHEN r.location_lat IS NOT NULL AND r.location_lng IS NOT NULL AND r.max_distance IS NOT NULL
+                THEN 1 - d.km / greatest(r.max_distance, 1)
+            WHEN d.km IS NOT NULL THEN greatest(0.0, 1 - d.km / 500.0)
+            ELSE 0.5
+        END
+        + 0.1 * CASE WHEN g.tags && r.genres THEN 1.0 ELSE 0.0 END
+    AS FLOAT) AS score,
+    CAST(round(CAST(d.km AS NUMERIC), 3) AS FLOAT)
+FROM gig_postings g
+JOIN gig_requests r ON r.availability @> g.date AND r.genres @> CAST(ARRAY[g.genre] AS VARCHAR[])
+-- Haversine distance in km; NULL unless both ends have a location
+CROSS JOIN LATERAL (
+    SELECT CASE WHEN num_nulls(g.location_lat, g.location_lng, r.location_lat, r.location_lng) = 0 THEN
+        12742.0176 * asin(least(1.0, sqrt(
+            power(sin((radians(g.location_lat::float8) - radians(r.location_lat::float8)) / 2), 2)
+            + cos(radians(g.location_lat::float8)) * cos(radians(r.location_lat::float8))
+            * power(sin((radians(g.location_lng::float8) - radians(r.location_lng::float8)) / 2), 2)
+        )))
+    END AS km
+) d
+WHERE g.status = 'open'
+    AND g.date >= current_date
+    AND (r.location_lat IS NULL OR r.location_lng IS NULL OR r.max_distance IS NULL OR d.km <= r.max_distance)
+ORDER BY g.id, r.band_id, score DESC
+"""
+
+steps = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *TABLES,
+    "ALTER TABLE band_profiles ADD COLUMN IF NOT EXISTS messenger_username VARCHAR(255)",
+    "ALTER TABLE band_profiles ADD COLUMN IF NOT EXISTS whatsapp_number VARCHAR(20)",
+    "ALTER TABLE band_profiles ADD COLUMN IF NOT EXISTS contact_email VARCHAR(255)",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS messenger_username VARCHAR(255)",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS whatsapp_number VARCHAR(20)",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS contact_email VARCHAR(255)",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS instagram VARCHAR(255)",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS typical_genres TEXT[]",
+    "ALTER TABLE gig_postings ADD COLUMN IF NOT EXISTS venue_name VARCHAR(255)",
+    "CREATE INDEX IF NOT EXISTS ix_gig_postings_location ON gig_postings USING gist (point(location_lng::float8, location_lat::float8))",
+    "ALTER TABLE gig_postings ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+    GIG_SEARCH_VECTOR_FUNCTION,
+    "DROP TRIGGER IF EXISTS gig_postings_search_vector_update ON gig_postings",
+    # schema.sql declared tags TEXT[]; matching compares them with gig_requests.genres
+    # (VARCHAR[]) and Postgres has no && across the two. Binary-coercible, so no rewrite.
+    # Done while the trigger, which names the column, is dropped.
+    "ALTER TABLE gig_postings ALTER COLUMN tags TYPE VARCHAR[]",
+    GIG_SEARCH_VECTOR_TRIGGER,
+    # Fires the trigger once per row to backfill search_vector
+    "UPDATE gig_postings SET title = title WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_gig_postings_search_vector ON gig_postings USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_gig_postings_title_trgm ON gig_postings USING gin (title gin_trgm_ops)",
+    "UPDATE notifications SET is_read = false WHERE is_read IS NULL",
+    "ALTER TABLE notifications ALTER COLUMN is_read SET DEFAULT false",
+    "ALTER TABLE notifications ALTER COLUMN is_read SET NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications (user_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created ON notifications (user_id, is_read, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_unread ON notifications (user_id) WHERE is_read = false",
+    "ALTER TABLE gig_requests ADD COLUMN IF NOT EXISTS location_lat DECIMAL(9,6)",
+    "ALTER TABLE gig_requests ADD COLUMN IF NOT EXISTS location_lng DECIMAL(9,6)",
+    "CREATE INDEX IF NOT EXISTS ix_gig_matches_band_score ON gig_matches (band_id, score, gig_id)",
+    "CREATE INDEX IF NOT EXISTS ix_gig_matches_gig_score ON gig_matches (gig_id, score, band_id)",
+    # daterange() rejects inverted windows, so straighten any before adding the column
+    "UPDATE gig_requests SET available_from = available_to, available_to = available_from WHERE available_to < available_from",
+    "ALTER TABLE gig_requests ADD COLUMN IF NOT EXISTS availability DATERANGE GENERATED ALWAYS AS (daterange(available_from, available_to, '[]')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_gig_requests_availability ON gig_requests USING gist (availability)",
+    # Databases initialised from an earlier schema.sql have genres TEXT[]; the @> filters
+    # compare it with VARCHAR[] arrays, like v0003 does for typical_genres
+    "ALTER TABLE gig_requests ALTER COLUMN genres TYPE VARCHAR[]",
+    "CREATE INDEX IF NOT EXISTS ix_gig_requests_genres ON gig_requests USING gin (genres)",
+    # Match existing gigs and requests; new writes keep the table current
+    "DELETE FROM gig_matches",
+    REBUILD_MATCHES,
+]
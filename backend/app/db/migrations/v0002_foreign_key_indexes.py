@@ -0,0 +1,15 @@
+"""
+Indexes behind the per-user listings and the foreign keys that cascade from
+users and gigs. Built concurrently so a live database keeps taking writes.
+"""
+from app.db.migrate import ConcurrentIndex
+
+transactional = False
+
+steps = [
+    ConcurrentIndex("ix_gig_applications_applicant_created", "gig_applications", "(applicant_id, created_at, id)"),
+    ConcurrentIndex("ix_gig_applications_venue_created", "gig_applications", "(venue_id, created_at, id)"),
+    ConcurrentIndex("ix_gig_applications_gig_applicant", "gig_applications", "(gig_id, applicant_id)"),
+    ConcurrentIndex("ix_gig_postings_venue_created", "gig_postings", "(venue_id, created_at, id)"),
+    ConcurrentIndex("ix_gig_requests_band_created", "gig_requests", "(band_id, created_at, id)"),
+]
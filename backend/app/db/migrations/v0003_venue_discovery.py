@@ -0,0 +1,30 @@
+"""
+Venue discovery: a generated search document plus indexes for genre overlap,
+text, location and capacity filters.
+
+Adding the stored column rewrites venue_profiles under an exclusive lock,
+which the table is small enough to take. Databases built from schema.sql
+have typical_genres as TEXT[]; it becomes VARCHAR[] like the model's, so
+the && operator and its GIN index see one type (binary-coercible, no
+rewrite).
+
+The search document is spelled out here rather than imported from the
+model, so later edits to the model cannot change what this step did.
+"""
+
+steps = [
+    "ALTER TABLE venue_profiles ALTER COLUMN typical_genres TYPE VARCHAR[]",
+    """
+    ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(venue_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location_city, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(bio, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_typical_genres ON venue_profiles USING gin (typical_genres)",
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_search_vector ON venue_profiles USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_name_trgm ON venue_profiles USING gin (venue_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_location ON venue_profiles (lower(location_state), lower(location_city))",
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_capacity ON venue_profiles (capacity)",
+    "CREATE INDEX IF NOT EXISTS ix_venue_profiles_created ON venue_profiles (created_at, id)",
+]
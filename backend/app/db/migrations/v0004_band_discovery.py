@@ -0,0 +1,25 @@
+"""
+Band discovery: a generated search document, and composite indexes for the
+genre and location filters and facet counts. The genre-first composite
+replaces the single-column genre index.
+
+Adding the stored column rewrites band_profiles under an exclusive lock,
+which the table is small enough to take. The search document is spelled
+out here, not imported from the model, for the same reason as in v0003.
+"""
+
+steps = [
+    """
+    ALTER TABLE band_profiles ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(band_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(genre, '') || ' ' || coalesce(location_city, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(bio, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_genre_location ON band_profiles (genre, location_state, location_city)",
+    "DROP INDEX IF EXISTS ix_band_profiles_genre",
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_location ON band_profiles (lower(location_state), lower(location_city))",
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_search_vector ON band_profiles USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_name_trgm ON band_profiles USING gin (band_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_band_profiles_created ON band_profiles (created_at, id)",
+]
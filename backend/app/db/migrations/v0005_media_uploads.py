@@ -0,0 +1,24 @@
+"""
+Presigned media uploads: one row per upload URL issued, so the confirm step
+knows what the client was allowed to send and where the result belongs.
+"""
+
+steps = [
+    """
+    CREATE TABLE IF NOT EXISTS media_uploads (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        target VARCHAR(20) NOT NULL,
+        gig_id UUID REFERENCES gig_postings(id) ON DELETE CASCADE,
+        key TEXT NOT NULL UNIQUE,
+        content_type VARCHAR(100) NOT NULL,
+        size INTEGER NOT NULL,
+        multipart_id TEXT,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        completed_at TIMESTAMP WITH TIME ZONE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_media_uploads_user_created ON media_uploads (user_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_media_uploads_gig_id ON media_uploads (gig_id)",
+]
@@ -0,0 +1,14 @@
+"""
+Photo derivatives: the resized copies' URLs next to each photo_url, and the
+upload bookkeeping that lets the image pipeline find photos it has not
+processed yet.
+"""
+
+steps = [
+    "ALTER TABLE band_profiles ADD COLUMN IF NOT EXISTS photo_variants JSONB",
+    "ALTER TABLE venue_profiles ADD COLUMN IF NOT EXISTS photo_variants JSONB",
+    "ALTER TABLE gig_postings ADD COLUMN IF NOT EXISTS photo_variants JSONB",
+    "ALTER TABLE media_uploads ADD COLUMN IF NOT EXISTS derived_at TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_media_uploads_underived ON media_uploads (completed_at) "
+    "WHERE status = 'complete' AND derived_at IS NULL",
+]
@@ -0,0 +1,74 @@
+import time
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+from app.core.instrumentation import record_pool_wait
+from app.core.metrics import REGISTRY
+
+POOL_CHECKOUTS = REGISTRY.counter("db_pool_checkouts_total", "Connections handed out by the pool")
+POOL_WAIT_SECONDS = REGISTRY.counter("db_pool_wait_seconds_total", "Time spent obtaining a connection from the pool")
+POOL_TIMEOUTS = REGISTRY.counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT")
+POOL_CONNECTS = REGISTRY.counter("db_pool_connections_created_total", "New DBAPI connections opened")
+POOL_INVALIDATED = REGISTRY.counter("db_pool_connections_invalidated_total", "Connections discarded as stale or broken")
+POOL_CHECKED_OUT = REGISTRY.gauge("db_pool_checked_out", "Connections currently checked out")
+POOL_OVERFLOW = REGISTRY.gauge("db_pool_overflow", "Connections open beyond pool_size")
+POOL_SIZE = REGISTRY.gauge("db_pool_size", "Configured pool_size")
+
+
+class TimedPoolMixin:
+    """
+    Times every checkout, including time spent queueing for a free slot, and
+    counts checkouts that time out. This is the number to watch when sizing
+    DB_POOL_SIZE / DB_MAX_OVERFLOW.
+    """
+    metrics_label = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            POOL_WAIT_SECONDS.inc(waited, pool=self.metrics_label)
+            record_pool_wait(waited)
+        POOL_CHECKOUTS.inc(pool=self.metrics_label)
+        return conn
+
+
+def timed_pool_class(base, label: str):
+    return type(f"Timed{base.__name__}", (TimedPoolMixin, base), {"metrics_label": label})
+
+
+def engine_options(label: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments from Settings."""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        "poolclass": timed_pool_class(base, label),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Pool gauges and connect/invalidate counters for a (sync) Engine."""
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        POOL_CONNECTS.inc(pool=label)
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_INVALIDATED.inc(pool=label)
+
+    key = (("pool", label),)
+    # Read engine.pool at scrape time: dispose() swaps in a new pool object
+    POOL_CHECKED_OUT.add_callback(lambda: {key: engine.pool.checkedout()})
+    POOL_OVERFLOW.add_callback(lambda: {key: max(engine.pool.overflow(), 0)})
+    POOL_SIZE.add_callback(lambda: {key: engine.pool.size()})
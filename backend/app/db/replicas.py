@@ -0,0 +1,103 @@
+import hashlib
+import itertools
+import logging
+import time
+from typing import Callable, List, Optional, Union
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.cache import build_cache
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+READS = REGISTRY.counter("db_reads_total", "Read-only request sessions, by the database that served them")
+REPLICA_FAILURES = REGISTRY.counter("db_replica_failures_total", "Times a replica was taken out of rotation")
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+recent_writes = build_cache(settings.CACHE_URL, namespace="writes", max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+class Replica:
+    """
+    One read replica: its engine, session factory and health. A replica
+    whose connections fail is skipped for DB_REPLICA_RETRY_SECONDS, then
+    tried again.
+    """
+    def __init__(self, name: str, engine: Union[Engine, AsyncEngine], session_factory: Callable):
+        self.name = name
+        self.engine = engine
+        self.sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.session_factory = session_factory
+        self.down_until = 0.0
+
+        @event.listens_for(self.sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                self.mark_down()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self) -> None:
+        if self.available:
+            logger.warning("Replica %s failed; reads go elsewhere for %.0fs", self.name, settings.DB_REPLICA_RETRY_SECONDS)
+            REPLICA_FAILURES.inc(replica=self.name)
+        self.down_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+    def checked_out(self) -> int:
+        return self.sync_engine.pool.checkedout()
+
+    async def dispose(self) -> None:
+        if isinstance(self.engine, AsyncEngine):
+            await self.engine.dispose()
+        else:
+            self.engine.dispose()
+
+
+class ReplicaSet:
+    def __init__(self, replicas: List[Replica], strategy: str = ROUND_ROBIN):
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown DB_REPLICA_STRATEGY {strategy!r}")
+        self.replicas = replicas
+        self.strategy = strategy
+        self._turn = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        """A healthy replica, or None when all are down."""
+        healthy = [replica for replica in self.replicas if replica.available]
+        if not healthy:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(healthy, key=lambda replica: replica.checked_out())
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+def _client_key(request: Request) -> Optional[str]:
+    """Writes are tracked per credential; anonymous clients have nothing to read back."""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha1(authorization.encode()).hexdigest()
+
+
+async def note_write(request: Request) -> None:
+    """Pin this client's reads to the primary for DB_READ_YOUR_WRITES_SECONDS."""
+    key = _client_key(request)
+    if key is not None and settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+        await recent_writes.set(key, 1, settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+async def wrote_recently(request: Request) -> bool:
+    key = _client_key(request)
+    return key is not None and await recent_writes.get(key) is not None
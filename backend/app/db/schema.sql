@@ -1,5 +1,7 @@
 -- Enable Extension for UUIDs
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+-- Trigram matching for typo-tolerant search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Users Table
 CREATE TABLE IF NOT EXISTS users (
@@ -24,6 +26,7 @@ CREATE TABLE IF NOT EXISTS band_profiles (
     bio TEXT,
     demo_url TEXT,
     photo_url TEXT,
+    photo_variants JSONB,
     instagram VARCHAR(255),
     spotify VARCHAR(255),
     youtube VARCHAR(255),
@@ -32,9 +35,22 @@ CREATE TABLE IF NOT EXISTS band_profiles (
     messenger_username VARCHAR(255),
     contact_email VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Band discovery text search: name (A), genre and city (B), bio (C)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(band_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(genre, '') || ' ' || coalesce(location_city, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(bio, '')), 'C')
+    ) STORED
 );
 
+-- Band discovery filters; genre-first so facet counts can come from the index alone
+CREATE INDEX IF NOT EXISTS ix_band_profiles_genre_location ON band_profiles (genre, location_state, location_city);
+CREATE INDEX IF NOT EXISTS ix_band_profiles_location ON band_profiles (lower(location_state), lower(location_city));
+CREATE INDEX IF NOT EXISTS ix_band_profiles_search_vector ON band_profiles USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_band_profiles_name_trgm ON band_profiles USING gin (band_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_band_profiles_created ON band_profiles (created_at, id);
+
 -- Active Venue Profiles
 CREATE TABLE IF NOT EXISTS venue_profiles (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -45,16 +61,31 @@ CREATE TABLE IF NOT EXISTS venue_profiles (
     capacity INTEGER,
     bio TEXT,
     photo_url TEXT,
-    typical_genres TEXT[],
+    photo_variants JSONB,
+    typical_genres VARCHAR[],
     contact_method VARCHAR(20) CHECK (contact_method IN ('whatsapp', 'instagram', 'email')),
     whatsapp_number VARCHAR(20),
     messenger_username VARCHAR(255),
     instagram VARCHAR(255),
     contact_email VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Venue discovery text search: name (A), city (B), bio (C)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(venue_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location_city, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(bio, '')), 'C')
+    ) STORED
 );
 
+-- Venue discovery filters
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_typical_genres ON venue_profiles USING gin (typical_genres);
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_search_vector ON venue_profiles USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_name_trgm ON venue_profiles USING gin (venue_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_location ON venue_profiles (lower(location_state), lower(location_city));
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_capacity ON venue_profiles (capacity);
+CREATE INDEX IF NOT EXISTS ix_venue_profiles_created ON venue_profiles (created_at, id);
+
 -- Simplified Gig Postings (Merged from Mongo)
 CREATE TABLE IF NOT EXISTS gig_postings (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -70,12 +101,37 @@ CREATE TABLE IF NOT EXISTS gig_postings (
     location_lat DECIMAL(9,6),
     location_lng DECIMAL(9,6),
     status VARCHAR(20) DEFAULT 'open',
-    tags TEXT[],
+    tags VARCHAR[],
     photo_url TEXT,
+    photo_variants JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    search_vector TSVECTOR
 );
 
+-- Radius discovery prefilter (point <@ box)
+CREATE INDEX IF NOT EXISTS ix_gig_postings_location ON gig_postings USING gist (point(location_lng::float8, location_lat::float8));
+
+-- Full-text search: weighted title (A), genre + tags (B), venue name (C), description (D)
+CREATE OR REPLACE FUNCTION gig_postings_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.genre, '') || ' ' || array_to_string(coalesce(NEW.tags, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.venue_name, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER gig_postings_search_vector_update
+BEFORE INSERT OR UPDATE OF title, genre, tags, venue_name, description ON gig_postings
+FOR EACH ROW EXECUTE PROCEDURE gig_postings_search_vector_update();
+
+CREATE INDEX IF NOT EXISTS ix_gig_postings_search_vector ON gig_postings USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_gig_postings_title_trgm ON gig_postings USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_gig_postings_venue_created ON gig_postings (venue_id, created_at, id);
+
 -- Gig Applications (Moved from Mongo)
 CREATE TABLE IF NOT EXISTS gig_applications (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -89,6 +145,83 @@ CREATE TABLE IF NOT EXISTS gig_applications (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+CREATE INDEX IF NOT EXISTS ix_gig_applications_applicant_created ON gig_applications (applicant_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_gig_applications_venue_created ON gig_applications (venue_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_gig_applications_gig_applicant ON gig_applications (gig_id, applicant_id);
+
+-- Gig Requests (band availability)
+CREATE TABLE IF NOT EXISTS gig_requests (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    band_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    available_from DATE NOT NULL,
+    available_to DATE NOT NULL,
+    genres VARCHAR[] NOT NULL,
+    willing_to_travel BOOLEAN DEFAULT false,
+    max_distance INTEGER,
+    location_lat DECIMAL(9,6),
+    location_lng DECIMAL(9,6),
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    availability DATERANGE GENERATED ALWAYS AS (daterange(available_from, available_to, '[]')) STORED
+);
+
+CREATE INDEX IF NOT EXISTS ix_gig_requests_availability ON gig_requests USING gist (availability);
+CREATE INDEX IF NOT EXISTS ix_gig_requests_genres ON gig_requests USING gin (genres);
+CREATE INDEX IF NOT EXISTS ix_gig_requests_band_created ON gig_requests (band_id, created_at, id);
+
+-- Precomputed band <-> gig matches, maintained by app/services/matching.py
+CREATE TABLE IF NOT EXISTS gig_matches (
+    gig_id UUID REFERENCES gig_postings(id) ON DELETE CASCADE,
+    band_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    request_id UUID NOT NULL REFERENCES gig_requests(id) ON DELETE CASCADE,
+    venue_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    gig_date DATE NOT NULL,
+    score FLOAT NOT NULL,
+    distance_km FLOAT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (gig_id, band_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_gig_matches_band_score ON gig_matches (band_id, score, gig_id);
+CREATE INDEX IF NOT EXISTS ix_gig_matches_gig_score ON gig_matches (gig_id, score, band_id);
+
+-- Notifications
+CREATE TABLE IF NOT EXISTS notifications (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID REFERENCES users(id),
+    title VARCHAR,
+    content VARCHAR,
+    type VARCHAR,
+    is_read BOOLEAN NOT NULL DEFAULT false,
+    link VARCHAR,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created ON notifications (user_id, is_read, created_at);
+CREATE INDEX IF NOT EXISTS ix_notifications_unread ON notifications (user_id) WHERE is_read = false;
+
+-- Media Uploads (presigned, confirmed by the client once the file is stored)
+CREATE TABLE IF NOT EXISTS media_uploads (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    target VARCHAR(20) NOT NULL, -- band_demo, band_photo, venue_photo, gig_photo
+    gig_id UUID REFERENCES gig_postings(id) ON DELETE CASCADE,
+    key TEXT NOT NULL UNIQUE,
+    content_type VARCHAR(100) NOT NULL,
+    size INTEGER NOT NULL,
+    multipart_id TEXT,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending', -- pending, complete, rejected
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE,
+    derived_at TIMESTAMP WITH TIME ZONE -- photos: when the image pipeline finished with it
+);
+
+CREATE INDEX IF NOT EXISTS ix_media_uploads_user_created ON media_uploads (user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_media_uploads_gig_id ON media_uploads (gig_id);
+CREATE INDEX IF NOT EXISTS ix_media_uploads_underived ON media_uploads (completed_at) WHERE status = 'complete' AND derived_at IS NULL;
+
 -- Refresh Tokens
 CREATE TABLE IF NOT EXISTS refresh_tokens (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -4,10 +4,14 @@ import os
 # Add the project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from app.db.session import SessionLocal, engine, Base
+from app.db.session import SessionLocal, engine
 from app.models.user import User
 from app.models.profile import BandProfile, VenueProfile
 from app.core.auth import get_password_hash
+from app.db import synthetic
+from app.services.matching import rebuild_statements
+import argparse
+import time
 import uuid
 
 def seed():
@@ -71,5 +75,45 @@ def seed():
     finally:
         db.close()
 
+def main():
+    parser = argparse.ArgumentParser(description="Seed the demo users, or a synthetic benchmark dataset with --bench.")
+    parser.add_argument("--bench", action="store_true", help="bulk-load the synthetic dataset from app.db.synthetic")
+    parser.add_argument("--venues", type=int, default=1000)
+    parser.add_argument("--bands", type=int, default=5000)
+    parser.add_argument("--gigs-per-venue", type=float, default=8.0, help="mean; the spread is heavy-tailed")
+    parser.add_argument("--applications-per-gig", type=float, default=6.0, help="mean; the spread is heavy-tailed")
+    parser.add_argument("--requests-per-band", type=float, default=1.5, help="mean")
+    parser.add_argument("--notifications-per-user", type=float, default=20.0, help="mean")
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed gives the same dataset")
+    parser.add_argument("--password-hash", help="precomputed hash for every account, instead of hashing the bench password")
+    parser.add_argument("--reset", action="store_true", help="delete a previous synthetic dataset first")
+    parser.add_argument("--matches", action="store_true", help="rebuild gig_matches after loading")
+    args = parser.parse_args()
+    if not args.bench:
+        seed()
+        return
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        if args.reset:
+            synthetic.clear_dataset(conn)
+        counts = synthetic.build_dataset(
+            conn,
+            venues=args.venues,
+            bands=args.bands,
+            gigs_per_venue=args.gigs_per_venue,
+            applications_per_gig=args.applications_per_gig,
+            requests_per_band=args.requests_per_band,
+            notifications_per_user=args.notifications_per_user,
+            seed=args.seed,
+            password_hash=args.password_hash,
+        )
+        if args.matches:
+            for stmt in rebuild_statements():
+                conn.execute(stmt)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        synthetic.analyze(conn)
+    print(f"Loaded {counts} in {time.perf_counter() - start:.1f}s")
+
 if __name__ == "__main__":
-    seed()
+    main()
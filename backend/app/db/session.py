@@ -1,16 +1,179 @@
+import uuid
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.instrumentation import instrument_queries
+from app.db.pool import engine_options, instrument_engine
+from app.db.replicas import READ_METHODS, READS, Replica, ReplicaSet, note_write, wrote_recently
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _asyncpg_connect_args() -> dict:
+    if not settings.DB_PGBOUNCER:
+        return {}
+    # pgbouncer in transaction mode hands each transaction to any server
+    # connection, so named prepared statements cannot be reused or cached.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+# Sync engine: scripts (seed, migrations) and the DB_ASYNC=false request path
+engine = create_engine(settings.DATABASE_URL, **engine_options("sync"))
+instrument_engine(engine, "sync")
+instrument_queries(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: the default request path
+async_engine = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        connect_args=_asyncpg_connect_args(),
+        **engine_options("async", is_async=True),
+    )
+    instrument_engine(async_engine.sync_engine, "async")
+    instrument_queries(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _create_replica(index: int, url: str) -> Replica:
+    label = f"replica{index}"
+    if settings.DB_ASYNC:
+        replica_engine = create_async_engine(
+            make_url(url).set(drivername="postgresql+asyncpg"),
+            connect_args=_asyncpg_connect_args(),
+            **engine_options(label, is_async=True),
+        )
+        factory = async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    else:
+        replica_engine = create_engine(url, **engine_options(label))
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    replica = Replica(label, replica_engine, factory)
+    instrument_engine(replica.sync_engine, label)
+    instrument_queries(replica.sync_engine)
+    return replica
+
+
+# Read replicas: only endpoints that depend on get_read_db use them
+replica_set = None
+if settings.REPLICA_URLS:
+    replica_set = ReplicaSet(
+        [_create_replica(i, url) for i, url in enumerate(settings.REPLICA_URLS)],
+        settings.DB_REPLICA_STRATEGY,
+    )
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+
+class ThreadedSession:
+    """
+    Gives a sync Session the awaitable interface of AsyncSession so endpoints
+    are written once for both stacks. Every call that may hit the database is
+    pushed to the threadpool; calls are awaited one at a time, so the Session
+    is never used from two threads at once.
+    """
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def connection(self):
+        return await run_in_threadpool(self.sync_session.connection)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+def open_session(factory=None):
+    """A request session from factory (default: the primary), awaitable on either stack."""
+    if settings.DB_ASYNC:
+        return (factory or AsyncSessionLocal)()
+    return ThreadedSession((factory or SessionLocal)(expire_on_commit=False))
+
+
+async def get_db(request: Request):
+    if replica_set is not None and request.method not in READ_METHODS:
+        # Before the endpoint runs, not after: the exit code of this
+        # dependency only runs once the response has been sent, by which
+        # time the client may already be reading its write back
+        await note_write(request)
+    db = open_session()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def _replica_session(replica: Replica):
+    db = open_session(replica.session_factory)
+    try:
+        # Connect now, so a dead replica fails here rather than mid-endpoint
+        await db.connection()
+    except (DBAPIError, OSError):
+        replica.mark_down()
+        await db.close()
+        return None
+    return db
+
+
+async def get_read_db(request: Request):
+    """
+    Session for endpoints that only read. Goes to a replica unless none is
+    configured or healthy, or this client wrote within
+    DB_READ_YOUR_WRITES_SECONDS (replicas lag, and a user expects to see
+    what they just saved). A replica that cannot be reached is taken out of
+    rotation and the request falls back to the primary.
+    """
+    db, target = None, "primary"
+    if replica_set is not None and not await wrote_recently(request):
+        replica = replica_set.choose()
+        if replica is not None:
+            db = await _replica_session(replica)
+            if db is not None:
+                target = replica.name
+    if db is None:
+        db = open_session()
+    READS.inc(target=target)
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
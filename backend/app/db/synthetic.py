@@ -0,0 +1,334 @@
+"""
+Synthetic datasets for load tests, index work and query-plan testing.
+
+Rows are generated in one streaming pass into per-table spool files and
+loaded with COPY, so millions of rows take minutes and little memory.
+Ids are derived from (seed, kind, index) rather than stored, and every
+account shares one precomputed password hash.
+"""
+import hashlib
+import math
+import random
+import re
+import tempfile
+from array import array
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Connection
+from app.core.auth import get_password_hash
+from app.models.gig import GigApplication, GigMatch, GigPosting, GigRequest
+from app.models.notification import Notification
+from app.models.profile import BandProfile, VenueProfile
+from app.models.user import User
+
+# Synthetic accounts share one password and a recognisable domain
+BENCH_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password"
+
+# (city, state, lat, lng, spread in km, relative size)
+CITIES = [
+    ("Brooklyn", "NY", 40.6782, -73.9442, 6.0, 10),
+    ("Manhattan", "NY", 40.7831, -73.9712, 4.0, 9),
+    ("Los Angeles", "CA", 34.0522, -118.2437, 15.0, 8),
+    ("Chicago", "IL", 41.8781, -87.6298, 10.0, 6),
+    ("Austin", "TX", 30.2672, -97.7431, 8.0, 5),
+    ("Nashville", "TN", 36.1627, -86.7816, 7.0, 5),
+    ("Philadelphia", "PA", 39.9526, -75.1652, 8.0, 4),
+    ("Boston", "MA", 42.3601, -71.0589, 6.0, 4),
+    ("Seattle", "WA", 47.6062, -122.3321, 8.0, 3),
+    ("New Orleans", "LA", 29.9511, -90.0715, 5.0, 3),
+    ("Denver", "CO", 39.7392, -104.9903, 8.0, 2),
+    ("Portland", "OR", 45.5152, -122.6784, 6.0, 2),
+]
+# Roughly Zipf: a few genres dominate
+GENRES = ["Rock", "Indie", "Hip Hop", "Pop", "Jazz", "Electronic", "Folk", "Metal", "Blues", "Soul", "Country", "Punk"]
+GENRE_WEIGHTS = [1 / (rank + 1) ** 0.8 for rank in range(len(GENRES))]
+SEARCH_WORDS = ["jazz", "night", "acoustic", "trio", "rooftop", "weekend", "residency", "showcase"]
+ADJECTIVES = ["Velvet", "Electric", "Midnight", "Golden", "Broken", "Silver", "Wild", "Quiet", "Neon", "Hollow",
+              "Crimson", "Lucky", "Paper", "Static", "Atomic", "Lonesome"]
+NOUNS = ["Foxes", "Engines", "Rivers", "Tigers", "Saints", "Ghosts", "Lanterns", "Wolves", "Harbors", "Satellites",
+         "Pilots", "Sparrows", "Machines", "Strangers", "Orchards", "Echoes"]
+PLACES = ["Room", "Lounge", "Hall", "Tavern", "Social Club", "Ballroom", "Cellar", "Theater"]
+NOTIFICATION_TYPES = ["application_accepted", "new_gig", "system"]
+
+# Spool files move to disk past this size
+SPOOL_BYTES = 64 * 1024 * 1024
+
+_NEEDS_ESCAPE = re.compile(r"[\\\t\n\r]")
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_USERS, _VENUES, _BANDS, _GIGS, _APPLICATIONS, _REQUESTS, _NOTIFICATIONS = range(7)
+
+
+def bench_email(role: str, index: int) -> str:
+    return f"{role}-{index}@{BENCH_DOMAIN}"
+
+
+def band_name(index: int) -> str:
+    name = f"The {ADJECTIVES[index % len(ADJECTIVES)]} {NOUNS[index // len(ADJECTIVES) % len(NOUNS)]}"
+    cycle = index // (len(ADJECTIVES) * len(NOUNS))
+    return f"{name} {cycle + 1}" if cycle else name
+
+
+def venue_name(index: int) -> str:
+    name = f"The {ADJECTIVES[(index * 7) % len(ADJECTIVES)]} {PLACES[index % len(PLACES)]}"
+    cycle = index // (len(ADJECTIVES) * len(PLACES))
+    return f"{name} {cycle + 1}" if cycle else name
+
+
+def _copy_text(value) -> str:
+    if type(value) is str:
+        return value.translate(_COPY_ESCAPES) if _NEEDS_ESCAPE.search(value) else value
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, list):
+        elements = ",".join('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in value)
+        return ("{" + elements + "}").translate(_COPY_ESCAPES)
+    return str(value)
+
+
+class _CopyBuffer:
+    """Rows for one table in COPY text format, spooled to disk when large."""
+    def __init__(self, model, columns: Sequence[str]):
+        self.table = model.__table__.name
+        self.columns = columns
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode="w+")
+        self.rows = 0
+
+    def write(self, *values) -> None:
+        self.file.write("\t".join([_copy_text(v) for v in values]))
+        self.file.write("\n")
+        self.rows += 1
+
+    def load(self, cursor) -> None:
+        self.file.seek(0)
+        cursor.copy_expert(f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN", self.file)
+        self.file.close()
+
+
+class _Generator:
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.today = self.now.date()
+        self._city_weights = [city[5] for city in CITIES]
+
+    def id(self, kind: int, index: int) -> str:
+        """A random-looking but reproducible version 4 UUID, in text form."""
+        h = hashlib.blake2b(f"{self.seed}:{kind}:{index}".encode(), digest_size=16).hexdigest()
+        variant = "89ab"[int(h[16], 16) & 3]
+        return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}"
+
+    def count(self, mean: float, sigma: float = 1.0) -> int:
+        """Heavy-tailed non-negative count with the given mean (lognormal)."""
+        if mean <= 0:
+            return 0
+        return int(self.rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma) + 0.5)
+
+    def city(self) -> int:
+        return self.rng.choices(range(len(CITIES)), self._city_weights)[0]
+
+    def genre(self) -> int:
+        return self.rng.choices(range(len(GENRES)), GENRE_WEIGHTS)[0]
+
+    def near(self, city: int):
+        """A point normally distributed around the city centre."""
+        _, _, lat, lng, spread_km, _ = CITIES[city]
+        lat += self.rng.gauss(0, spread_km / 111.0)
+        lng += self.rng.gauss(0, spread_km / (111.0 * math.cos(math.radians(lat))))
+        return round(lat, 6), round(lng, 6)
+
+    def gig_date(self) -> date:
+        """A quarter of gigs already happened; upcoming ones lean towards Friday and Saturday."""
+        if self.rng.random() < 0.25:
+            return self.today - timedelta(days=self.rng.randint(1, 120))
+        day = self.today + timedelta(days=self.rng.randint(1, 180))
+        if self.rng.random() < 0.6:
+            day += timedelta(days=(4 - day.weekday()) % 7 + self.rng.randint(0, 1))
+        return day
+
+    def before(self, moment: datetime, max_days: float) -> datetime:
+        return min(self.now, moment) - timedelta(seconds=int(self.rng.uniform(0, max_days * 86400)))
+
+
+def build_dataset(
+    conn: Connection,
+    venues: int = 1000,
+    bands: int = 5000,
+    gigs_per_venue: float = 8.0,
+    applications_per_gig: float = 6.0,
+    requests_per_band: float = 1.5,
+    notifications_per_user: float = 20.0,
+    seed: int = 0,
+    password_hash: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Generate and COPY a dataset into the database behind conn, inside the
+    caller's transaction. The per-entity arguments are means; actual counts
+    follow heavy-tailed distributions. Returns rows loaded per table.
+    """
+    gen = _Generator(seed)
+    rng = gen.rng
+    password_hash = password_hash or get_password_hash(BENCH_PASSWORD)
+
+    users = _CopyBuffer(User, ["id", "email", "password_hash", "role", "created_at", "updated_at"])
+    venue_profiles = _CopyBuffer(VenueProfile, [
+        "id", "user_id", "venue_name", "location_city", "location_state", "capacity", "bio", "typical_genres",
+        "contact_method", "contact_email", "created_at", "updated_at",
+    ])
+    band_profiles = _CopyBuffer(BandProfile, [
+        "id", "user_id", "band_name", "genre", "location_city", "location_state", "bio", "contact_method",
+        "contact_email", "created_at", "updated_at",
+    ])
+    gigs = _CopyBuffer(GigPosting, [
+        "id", "venue_id", "venue_name", "title", "date", "time", "genre", "description", "pay", "formatted_address",
+        "location_lat", "location_lng", "status", "tags", "created_at", "updated_at",
+    ])
+    applications = _CopyBuffer(GigApplication, [
+        "id", "gig_id", "applicant_id", "venue_id", "applicant_name", "message", "status", "created_at",
+    ])
+    gig_requests = _CopyBuffer(GigRequest, [
+        "id", "band_id", "available_from", "available_to", "genres", "willing_to_travel", "max_distance",
+        "location_lat", "location_lng", "notes", "created_at", "updated_at",
+    ])
+    notifications = _CopyBuffer(Notification, [
+        "id", "user_id", "title", "content", "type", "is_read", "link", "created_at",
+    ])
+
+    # Bands: kept per genre so applications lean towards matching genres
+    band_genre = bytearray(bands)
+    band_city = bytearray(bands)
+    bands_by_genre: List[array] = [array("l") for _ in GENRES]
+    for j in range(bands):
+        user_id = gen.id(_USERS, venues + j)
+        city, genre = gen.city(), gen.genre()
+        band_genre[j], band_city[j] = genre, city
+        bands_by_genre[genre].append(j)
+        joined = gen.before(gen.now, 730)
+        users.write(user_id, bench_email("band", j), password_hash, "band", joined, joined)
+        band_profiles.write(
+            gen.id(_BANDS, j), user_id, band_name(j), GENRES[genre], CITIES[city][0], CITIES[city][1],
+            f"{GENRES[genre]} band from {CITIES[city][0]}.", "email", bench_email("band", j), joined, joined,
+        )
+
+    gig_index = 0
+    application_index = 0
+    for i in range(venues):
+        user_id = gen.id(_USERS, i)
+        city = gen.city()
+        lat, lng = gen.near(city)
+        name = venue_name(i)
+        capacity = max(30, min(5000, int(round(rng.lognormvariate(math.log(250), 0.8), -1))))
+        typical = sorted({gen.genre() for _ in range(3)})
+        joined = gen.before(gen.now, 730)
+        users.write(user_id, bench_email("venue", i), password_hash, "venue", joined, joined)
+        venue_profiles.write(
+            gen.id(_VENUES, i), user_id, name, CITIES[city][0], CITIES[city][1], capacity,
+            f"{capacity}-capacity room in {CITIES[city][0]}.", [GENRES[g] for g in typical],
+            "email", bench_email("venue", i), joined, joined,
+        )
+
+        for _ in range(gen.count(gigs_per_venue, 0.8)):
+            gig_id = gen.id(_GIGS, gig_index)
+            gig_index += 1
+            genre = rng.choice(typical) if rng.random() < 0.8 else gen.genre()
+            day = gen.gig_date()
+            upcoming = day > gen.today
+            posted = gen.before(datetime.combine(day, time(12), timezone.utc), 60)
+            words = rng.sample(SEARCH_WORDS, 2)
+            gigs.write(
+                gig_id, user_id, name, f"{GENRES[genre]} {words[0]} at {name}", day,
+                rng.choice(["19:00", "20:00", "20:30", "21:00", "22:00"]), GENRES[genre],
+                f"Looking for a {GENRES[genre].lower()} act for a {words[1]} set.",
+                f"${rng.choice([0, 100, 150, 200, 300, 500, 800])}",
+                f"{rng.randint(1, 999)} Main St, {CITIES[city][0]}, {CITIES[city][1]}",
+                lat, lng, "open" if upcoming else "closed", [GENRES[genre].lower(), words[0]], posted, posted,
+            )
+
+            # Fan-in: most gigs get a handful of applications, a few get swamped
+            fan_in = min(gen.count(applications_per_gig, 1.2), bands)
+            same_genre = bands_by_genre[genre]
+            applicants = set()
+            while len(applicants) < fan_in:
+                if same_genre and rng.random() < 0.7:
+                    applicants.add(rng.choice(same_genre))
+                else:
+                    applicants.add(rng.randrange(bands))
+            accepted = rng.choice(list(applicants)) if applicants and not upcoming else None
+            for j in applicants:
+                if upcoming:
+                    status = "pending" if rng.random() < 0.8 else "declined"
+                else:
+                    status = "accepted" if j == accepted else "declined"
+                applications.write(
+                    gen.id(_APPLICATIONS, application_index), gig_id, gen.id(_USERS, venues + j), user_id,
+                    band_name(j), "We'd love to play this one.", status,
+                    posted + (min(gen.now, datetime.combine(day, time(12), timezone.utc)) - posted) * rng.random(),
+                )
+                application_index += 1
+
+    request_index = 0
+    for j in range(bands):
+        for _ in range(gen.count(requests_per_band, 0.7)):
+            start = gen.today + timedelta(days=rng.randint(0, 120))
+            length = min(60, int(rng.expovariate(1 / 7)))
+            extra = {gen.genre() for _ in range(rng.randint(0, 2))}
+            lat, lng = gen.near(band_city[j])
+            created = gen.before(gen.now, 30)
+            gig_requests.write(
+                gen.id(_REQUESTS, request_index), gen.id(_USERS, venues + j), start, start + timedelta(days=length),
+                [GENRES[g] for g in sorted(extra | {band_genre[j]})], rng.random() < 0.3,
+                rng.choice([25, 50, 100, 250]), lat, lng, None, created, created,
+            )
+            request_index += 1
+
+    notification_index = 0
+    for u in range(venues + bands):
+        user_id = gen.id(_USERS, u)
+        for _ in range(gen.count(notifications_per_user, 1.0)):
+            age_days = min(90.0, rng.expovariate(1 / 10))
+            notifications.write(
+                gen.id(_NOTIFICATIONS, notification_index), user_id, "Application update",
+                "Your application status changed", rng.choice(NOTIFICATION_TYPES),
+                rng.random() < min(0.95, 0.3 + age_days / 10), "/dashboard",
+                gen.now - timedelta(days=age_days),
+            )
+            notification_index += 1
+
+    cursor = conn.connection.cursor()
+    counts = {}
+    for buffer in (users, venue_profiles, band_profiles, gigs, applications, gig_requests, notifications):
+        counts[buffer.table] = buffer.rows
+        buffer.load(cursor)
+    cursor.close()
+    return counts
+
+
+def clear_dataset(conn: Connection) -> None:
+    """
+    Remove every synthetic account and what hangs off it. Children go first
+    in set-based deletes; leaving them to ON DELETE CASCADE would run one
+    lookup per user against foreign keys that have no index.
+    """
+    bench_users = select(User.id).where(User.email.like(f"%@{BENCH_DOMAIN}")).scalar_subquery()
+    conn.execute(delete(Notification).where(Notification.user_id.in_(bench_users)))
+    conn.execute(delete(GigMatch).where(GigMatch.venue_id.in_(bench_users) | GigMatch.band_id.in_(bench_users)))
+    conn.execute(delete(GigApplication).where(
+        GigApplication.venue_id.in_(bench_users) | GigApplication.applicant_id.in_(bench_users)
+    ))
+    conn.execute(delete(GigRequest).where(GigRequest.band_id.in_(bench_users)))
+    conn.execute(delete(GigPosting).where(GigPosting.venue_id.in_(bench_users)))
+    conn.execute(delete(BandProfile).where(BandProfile.user_id.in_(bench_users)))
+    conn.execute(delete(VenueProfile).where(VenueProfile.user_id.in_(bench_users)))
+    conn.execute(delete(User).where(User.email.like(f"%@{BENCH_DOMAIN}")))
+
+
+def analyze(conn: Connection) -> None:
+    """Refresh planner statistics after a bulk load."""
+    for model in (User, VenueProfile, BandProfile, GigPosting, GigApplication, GigRequest, Notification):
+        conn.exec_driver_sql(f"ANALYZE {model.__table__.name}")
@@ -1,19 +1,63 @@
 
-from app.db.session import engine, Base
+import logging
+from app.db.session import engine, async_engine, open_session, replica_set
+from app.db.migrate import check_schema
 from app.models.user import User
 from app.models.profile import BandProfile, VenueProfile
 from app.models.notification import Notification
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import auth, profile, gig, request, user, application, discovery, notification
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.staticfiles import StaticFiles
+from app.core.auth import PasswordHasherBusy
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.instrumentation import InstrumentationMiddleware, InstrumentedRoute
+from app.core.metrics import REGISTRY
+from app.core.storage import LocalStorage, storage
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.notifications import notification_hub
+from app.services.suggest import suggest_index
+from app.services.images import image_pipeline
+from app.api.v1.endpoints import auth, profile, gig, request, user, application, discovery, notification, match, upload
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 app = FastAPI(title="Booklyn API", version="0.1.0")
+app.router.route_class = InstrumentedRoute
 
 @app.on_event("startup")
 async def startup_event():
-    # Ensure Postgres tables exist
-    Base.metadata.create_all(bind=engine)
-    pass
+    # Schema changes are applied by `python -m app.db.migrate`; workers only
+    # check that the database is at least at this build's version
+    if async_engine is not None:
+        async with async_engine.connect() as conn:
+            await conn.run_sync(check_schema)
+    else:
+        with engine.connect() as conn:
+            check_schema(conn)
+    await notification_hub.start()
+    await suggest_index.start(open_session)
+    await image_pipeline.start(open_session)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await image_pipeline.stop()
+    await suggest_index.stop()
+    await notification_hub.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+    if replica_set is not None:
+        await replica_set.dispose()
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-in attempts in progress, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 # Configure CORS
 app.add_middleware(
@@ -22,8 +66,20 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Added last so it is outermost and times everything below it
+app.add_middleware(InstrumentationMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(discovery.router, prefix="/api/v1/discovery", tags=["discovery"])
 app.include_router(profile.router, prefix="/api/v1/profiles", tags=["profiles"])
@@ -31,7 +87,13 @@ app.include_router(gig.router, prefix="/api/v1/gigs", tags=["gigs"])
 app.include_router(request.router, prefix="/api/v1/gig-requests", tags=["gig-requests"])
 app.include_router(user.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(application.router, prefix="/api/v1/applications", tags=["applications"])
+app.include_router(match.router, prefix="/api/v1/matches", tags=["matches"])
 app.include_router(notification.router, prefix="/api/v1/notifications", tags=["notifications"])
+app.include_router(upload.router, prefix="/api/v1/uploads", tags=["uploads"])
+
+if isinstance(storage, LocalStorage):
+    # With S3 the store (or a CDN in front of it) serves the files
+    app.mount("/media", StaticFiles(directory=storage.root, check_dir=False), name="media")
 
 @app.get("/")
 async def root():
@@ -40,3 +102,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Integer, Text, ARRAY, ForeignKey, DateTime, func, Boolean, Date, Numeric
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Integer, Float, Text, ARRAY, ForeignKey, DateTime, func, Boolean, Date, Numeric, Index, DDL, event
+from sqlalchemy.dialects.postgresql import DATERANGE, JSONB, UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.db.session import Base
+from app.services.geo import location_point
 
 class GigPosting(Base):
     __tablename__ = "gig_postings"
@@ -22,12 +23,47 @@ class GigPosting(Base):
     status = Column(String(20), default="open")
     tags = Column(ARRAY(String))
     photo_url = Column(Text)
+    photo_variants = Column(JSONB) # resized copies of photo_url by variant name, set by the image pipeline
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Maintained by the gig_postings_search_vector_update trigger, never written by the app
+    search_vector = deferred(Column(TSVECTOR))
 
     venue = relationship("User")
     applications = relationship("GigApplication", back_populates="gig", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # GiST index over point(lng, lat) backs the discovery radius prefilter
+        Index("ix_gig_postings_location", location_point(location_lat, location_lng), postgresql_using="gist"),
+        Index("ix_gig_postings_search_vector", search_vector, postgresql_using="gin"),
+        Index("ix_gig_postings_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_gig_postings_venue_created", venue_id, created_at, id),
+    )
+
+# Weighted document: title (A), genre and tags (B), venue name (C), description (D)
+GIG_SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION gig_postings_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.genre, '') || ' ' || array_to_string(coalesce(NEW.tags, '{}'), ' ')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.venue_name, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+GIG_SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER gig_postings_search_vector_update
+BEFORE INSERT OR UPDATE OF title, genre, tags, venue_name, description ON gig_postings
+FOR EACH ROW EXECUTE PROCEDURE gig_postings_search_vector_update();
+"""
+
+event.listen(GigPosting.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+event.listen(GigPosting.__table__, "after_create", DDL(GIG_SEARCH_VECTOR_FUNCTION))
+event.listen(GigPosting.__table__, "after_create", DDL(GIG_SEARCH_VECTOR_TRIGGER))
+
 class GigApplication(Base):
     __tablename__ = "gig_applications"
 
@@ -44,6 +80,13 @@ class GigApplication(Base):
     gig = relationship("GigPosting", back_populates="applications")
     applicant = relationship("User", foreign_keys=[applicant_id])
 
+    __table_args__ = (
+        # Keyset pagination of each side's applications, newest first
+        Index("ix_gig_applications_applicant_created", applicant_id, created_at, id),
+        Index("ix_gig_applications_venue_created", venue_id, created_at, id),
+        Index("ix_gig_applications_gig_applicant", gig_id, applicant_id),
+    )
+
 class GigRequest(Base):
     __tablename__ = "gig_requests"
 
@@ -53,9 +96,43 @@ class GigRequest(Base):
     available_to = Column(Date, nullable=False)
     genres = Column(ARRAY(String), nullable=False)
     willing_to_travel = Column(Boolean, default=False)
-    max_distance = Column(Integer)
+    max_distance = Column(Integer) # km from location_lat/lng
+    # Where the band is based for this window; distance limits need it
+    location_lat = Column(Numeric(9,6))
+    location_lng = Column(Numeric(9,6))
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # [available_from, available_to] as one value so date lookups hit a GiST index
+    availability = deferred(Column(DATERANGE, Computed("daterange(available_from, available_to, '[]')", persisted=True)))
 
     band = relationship("User")
+
+    __table_args__ = (
+        Index("ix_gig_requests_availability", availability, postgresql_using="gist"),
+        Index("ix_gig_requests_genres", genres, postgresql_using="gin"),
+        Index("ix_gig_requests_band_created", band_id, created_at, id),
+    )
+
+class GigMatch(Base):
+    """
+    Precomputed band <-> gig matches, one row per (gig, band) holding the
+    band's best-scoring request. Maintained by app.services.matching whenever
+    a gig or a band's requests are written, so match listings are a single
+    index range scan.
+    """
+    __tablename__ = "gig_matches"
+
+    gig_id = Column(UUID(as_uuid=True), ForeignKey("gig_postings.id", ondelete="CASCADE"), primary_key=True)
+    band_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    request_id = Column(UUID(as_uuid=True), ForeignKey("gig_requests.id", ondelete="CASCADE"), nullable=False)
+    venue_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
+    gig_date = Column(Date, nullable=False)
+    score = Column(Float, nullable=False)
+    distance_km = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_gig_matches_band_score", band_id, score, gig_id),
+        Index("ix_gig_matches_gig_score", gig_id, score, band_id),
+    )
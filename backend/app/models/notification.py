@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -12,6 +12,19 @@ class Notification(Base):
     title = Column(String)
     content = Column(String)
     type = Column(String)  # 'application_accepted', 'new_gig', 'system'
-    is_read = Column(Boolean, default=False)
+    is_read = Column(Boolean, nullable=False, default=False, server_default=false())
     link = Column(String, nullable=True) # Where clicking the notification takes you
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Return created_at from the INSERT so a new notification can be pushed to
+    # subscribers without a refresh round trip
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # History pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_notifications_user_created", user_id, created_at, id),
+        # Read/unread-filtered listings
+        Index("ix_notifications_user_read_created", user_id, is_read, created_at),
+        # Only unread rows, so the badge count is an index-only scan over a handful of entries
+        Index("ix_notifications_unread", user_id, postgresql_where=is_read == false()),
+    )
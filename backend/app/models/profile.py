@@ -1,21 +1,28 @@
-from sqlalchemy import Column, String, Integer, Text, ARRAY, ForeignKey, DateTime, func, Boolean
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Integer, Text, ARRAY, ForeignKey, DateTime, func, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.db.session import Base
 
+BAND_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(band_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(genre, '') || ' ' || coalesce(location_city, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(bio, '')), 'C')"
+)
+
 class BandProfile(Base):
     __tablename__ = "band_profiles"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True)
     band_name = Column(String(255), nullable=False)
-    genre = Column(String(100), nullable=False, index=True)
+    genre = Column(String(100), nullable=False)
     location_city = Column(String(100), nullable=False)
     location_state = Column(String(50), nullable=False)
     bio = Column(Text)
     demo_url = Column(Text)
     photo_url = Column(Text)
+    photo_variants = Column(JSONB) # resized copies of photo_url by variant name, set by the image pipeline
     instagram = Column(String(255))
     spotify = Column(String(255))
     youtube = Column(String(255))
@@ -25,9 +32,27 @@ class BandProfile(Base):
     contact_email = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Weighted document for discovery: name (A), genre and city (B), bio (C)
+    search_vector = deferred(Column(TSVECTOR, Computed(BAND_SEARCH_DOCUMENT, persisted=True)))
 
     user = relationship("User", back_populates="band_profile")
 
+    __table_args__ = (
+        # Leads with genre, so it still serves genre lookups; with both facet
+        # dimensions in the index, unfiltered facet counts are index-only
+        Index("ix_band_profiles_genre_location", genre, location_state, location_city),
+        Index("ix_band_profiles_location", func.lower(location_state), func.lower(location_city)),
+        Index("ix_band_profiles_search_vector", search_vector, postgresql_using="gin"),
+        Index("ix_band_profiles_name_trgm", band_name, postgresql_using="gin", postgresql_ops={"band_name": "gin_trgm_ops"}),
+        Index("ix_band_profiles_created", created_at, id),
+    )
+
+VENUE_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(venue_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location_city, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(bio, '')), 'C')"
+)
+
 class VenueProfile(Base):
     __tablename__ = "venue_profiles"
 
@@ -39,6 +64,7 @@ class VenueProfile(Base):
     capacity = Column(Integer)
     bio = Column(Text)
     photo_url = Column(Text)
+    photo_variants = Column(JSONB) # resized copies of photo_url by variant name, set by the image pipeline
     typical_genres = Column(ARRAY(String))
     contact_method = Column(String(20)) # whatsapp, instagram, email
     whatsapp_number = Column(String(20))
@@ -47,5 +73,18 @@ class VenueProfile(Base):
     contact_email = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Weighted document for discovery: name (A), city (B), bio (C)
+    search_vector = deferred(Column(TSVECTOR, Computed(VENUE_SEARCH_DOCUMENT, persisted=True)))
 
     user = relationship("User", back_populates="venue_profile")
+
+    __table_args__ = (
+        Index("ix_venue_profiles_typical_genres", typical_genres, postgresql_using="gin"),
+        Index("ix_venue_profiles_search_vector", search_vector, postgresql_using="gin"),
+        Index("ix_venue_profiles_name_trgm", venue_name, postgresql_using="gin", postgresql_ops={"venue_name": "gin_trgm_ops"}),
+        # Discovery compares city and state case-insensitively
+        Index("ix_venue_profiles_location", func.lower(location_state), func.lower(location_city)),
+        Index("ix_venue_profiles_capacity", capacity),
+        # Newest-first pages when no relevance applies
+        Index("ix_venue_profiles_created", created_at, id),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, func, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.db.session import Base
+
+class MediaUpload(Base):
+    """A presigned upload, from the URL being issued to the client confirming it."""
+    __tablename__ = "media_uploads"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    target = Column(String(20), nullable=False) # band_demo, band_photo, venue_photo, gig_photo
+    gig_id = Column(UUID(as_uuid=True), ForeignKey("gig_postings.id", ondelete="CASCADE"))
+    key = Column(Text, nullable=False, unique=True) # object key in the store
+    content_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False) # declared by the client, checked against the stored object
+    multipart_id = Column(Text) # S3 UploadId when the file is sent in parts
+    status = Column(String(20), nullable=False, default="pending", server_default="pending") # pending, complete, rejected
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    derived_at = Column(DateTime(timezone=True)) # photos: when the image pipeline finished with it
+
+    __table_args__ = (
+        Index("ix_media_uploads_user_created", user_id, created_at),
+        Index("ix_media_uploads_gig_id", gig_id),
+        # Confirmed uploads the image pipeline has not finished with, for its sweep
+        Index("ix_media_uploads_underived", completed_at, postgresql_where=(status == "complete") & derived_at.is_(None)),
+    )
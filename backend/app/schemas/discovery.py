@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Literal
+
+SuggestionKind = Literal["venue", "band", "city", "genre", "tag"]
+
+class SuggestionResponse(BaseModel):
+    kind: SuggestionKind
+    text: str
+    # Profiles or open gigs carrying it
+    count: int
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime, date
@@ -44,12 +44,19 @@ class GigPostingResponse(BaseModel):
     location_lat: Optional[float] = None
     location_lng: Optional[float] = None
     tags: List[str] = []
+    photo_url: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None # resized copies of photo_url, once processed
     status: str
     created_at: datetime
+    # Only set by radius queries in discovery
+    distance_km: Optional[float] = None
 
     class Config:
         from_attributes = True
 
+class GigMatchResponse(GigPostingResponse):
+    match_score: float
+
 class GigApplicationCreate(BaseModel):
     gig_id: UUID
     message: Optional[str] = None
@@ -79,10 +86,16 @@ class GigRequestBase(BaseModel):
     genres: List[str]
     willing_to_travel: bool = False
     max_distance: Optional[int] = None
+    location_lat: Optional[float] = None
+    location_lng: Optional[float] = None
     notes: Optional[str] = None
 
 class GigRequestCreate(GigRequestBase):
-    pass
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.available_to < self.available_from:
+            raise ValueError("available_to must not be before available_from")
+        return self
 
 class GigRequestUpdate(BaseModel):
     available_from: Optional[date] = None
@@ -90,6 +103,8 @@ class GigRequestUpdate(BaseModel):
     genres: Optional[List[str]] = None
     willing_to_travel: Optional[bool] = None
     max_distance: Optional[int] = None
+    location_lat: Optional[float] = None
+    location_lng: Optional[float] = None
     notes: Optional[str] = None
 
 class GigRequestResponse(GigRequestBase):
@@ -99,3 +114,21 @@ class GigRequestResponse(GigRequestBase):
 
     class Config:
         from_attributes = True
+
+class BandMatchResponse(BaseModel):
+    band_id: UUID
+    request_id: UUID
+    band_name: Optional[str] = None
+    genre: Optional[str] = None
+    photo_url: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
+    location_city: Optional[str] = None
+    location_state: Optional[str] = None
+    available_from: date
+    available_to: date
+    genres: List[str]
+    match_score: float
+    distance_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
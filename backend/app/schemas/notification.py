@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -19,3 +19,10 @@ class NotificationResponse(NotificationBase):
 
     class Config:
         from_attributes = True
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[UUID]] = None
+    all: bool = False
+
+class UnreadCount(BaseModel):
+    count: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, HttpUrl
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 from datetime import datetime
 
@@ -64,6 +64,8 @@ class BandProfileResponse(BandProfileBase):
     user_id: UUID
     demo_url: Optional[str] = None
     photo_url: Optional[str] = None
+    # Resized WebP copies of photo_url ("card", "avatar"); null until processed
+    photo_variants: Optional[Dict[str, str]] = None
     created_at: datetime
 
     class Config:
@@ -73,7 +75,26 @@ class VenueProfileResponse(VenueProfileBase):
     id: UUID
     user_id: UUID
     photo_url: Optional[str] = None
+    photo_variants: Optional[Dict[str, str]] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+class GenreFacet(BaseModel):
+    value: str
+    count: int
+
+class CityFacet(BaseModel):
+    city: str
+    state: str
+    count: int
+
+class BandFacets(BaseModel):
+    genre: List[GenreFacet] = []
+    city: List[CityFacet] = []
+
+class BandDiscoveryResponse(BaseModel):
+    items: List[BandProfileResponse]
+    # Only on the first page; they do not change while paging
+    facets: Optional[BandFacets] = None
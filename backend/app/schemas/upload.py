@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from uuid import UUID
+from datetime import datetime
+
+UploadTargetName = Literal["band_demo", "band_photo", "venue_photo", "gig_photo"]
+
+class UploadCreate(BaseModel):
+    target: UploadTargetName
+    content_type: str
+    size: int = Field(gt=0, description="Exact size of the file in bytes")
+    gig_id: Optional[UUID] = None # required for gig_photo
+
+class UploadPart(BaseModel):
+    part_number: int
+    url: str
+
+class UploadTicket(BaseModel):
+    """
+    PUT the file to url with these headers, or, when parts are given, each
+    part_size slice to its part URL (keeping the ETag response headers for
+    the confirm step). Then POST /uploads/{id}/complete.
+    """
+    id: UUID
+    key: str
+    method: str = "PUT"
+    url: Optional[str] = None
+    headers: Dict[str, str] = {}
+    parts: List[UploadPart] = []
+    part_size: Optional[int] = None
+    expires_at: datetime
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(ge=1)
+    etag: str
+
+class UploadComplete(BaseModel):
+    parts: List[CompletedPart] = [] # multipart uploads only
+
+class UploadResponse(BaseModel):
+    id: UUID
+    target: UploadTargetName
+    gig_id: Optional[UUID] = None
+    content_type: str
+    size: int
+    status: str
+    url: str
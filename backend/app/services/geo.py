@@ -0,0 +1,78 @@
+import math
+from typing import Tuple
+from sqlalchemy import Float, cast, func
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def location_point(lat_col, lng_col):
+    """
+    Postgres `point(lng, lat)` expression. Must stay identical to the GiST
+    expression index on gig_postings so the planner can use it.
+    """
+    return func.point(cast(lng_col, Float), cast(lat_col, Float))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Returns (min_lat, min_lng, max_lat, max_lng) of a box that contains every
+    point within radius_km of (lat, lng).
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(lat - delta_lat, -90.0)
+    max_lat = min(lat + delta_lat, 90.0)
+
+    # Near the poles (or for huge radii) the box spans every longitude
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9:
+        return min_lat, -180.0, max_lat, 180.0
+    delta_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    if delta_lng >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, lng - delta_lng, max_lat, lng + delta_lng
+
+
+def within_box(lat_col, lng_col, lat: float, lng: float, radius_km: float):
+    """
+    Index-backed prefilter: `point <@ box`. Boxes crossing the antimeridian are
+    split in two so each half can still use the index.
+    """
+    min_lat, min_lng, max_lat, max_lng = bounding_box(lat, lng, radius_km)
+    point = location_point(lat_col, lng_col)
+
+    def contained(lo_lng: float, hi_lng: float):
+        return point.op("<@")(func.box(func.point(lo_lng, min_lat), func.point(hi_lng, max_lat)))
+
+    if min_lng < -180.0:
+        return contained(min_lng + 360.0, 180.0) | contained(-180.0, max_lng)
+    if max_lng > 180.0:
+        return contained(min_lng, 180.0) | contained(-180.0, max_lng - 360.0)
+    return contained(min_lng, max_lng)
+
+
+def _radians(value):
+    if isinstance(value, (int, float)):
+        return math.radians(value)
+    return func.radians(cast(value, Float))
+
+
+def _cos(value):
+    if isinstance(value, (int, float)):
+        return math.cos(value)
+    return func.cos(value)
+
+
+def haversine_km(lat_col, lng_col, lat, lng):
+    """
+    Great-circle distance in km between the given columns and a second point,
+    as a SQL expression. The second point may be fixed values or columns.
+    """
+    lat1 = _radians(lat_col)
+    lng1 = _radians(lng_col)
+    lat2 = _radians(lat)
+    lng2 = _radians(lng)
+    a = (
+        func.power(func.sin((lat1 - lat2) / 2), 2)
+        + func.cos(lat1) * _cos(lat2) * func.power(func.sin((lng1 - lng2) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
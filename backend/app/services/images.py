@@ -0,0 +1,243 @@
+"""
+Resized WebP copies of profile and gig photos, made in the background.
+
+When a photo upload is confirmed its id is queued here. A worker reads the
+original from storage, renders every VARIANTS entry on a small thread pool
+(Pillow releases the GIL while decoding, resizing and encoding) and writes
+the URLs to the row's photo_variants, provided photo_url still points at
+that upload.
+
+Derivative keys are content-addressed: derived/<sha256 of the original>/
+<variant spec>.webp. The same photo uploaded twice is rendered and stored
+once, and since the bytes behind a key never change the objects are served
+with an immutable Cache-Control. Changing a variant's size or the quality
+changes its key.
+
+The queue lives in the worker that confirmed the upload. Every
+IMAGE_SWEEP_SECONDS each worker also queues confirmed photos that are still
+unprocessed a minute later (queue full, restart, storage error), so a lost
+job is only late. Two workers rendering the same photo write the same keys.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Set
+from uuid import UUID
+from sqlalchemy import func, select, update
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.storage import storage
+from app.models.upload import MediaUpload
+from app.services.uploads import PHOTO_TARGETS, TARGETS
+
+logger = logging.getLogger(__name__)
+
+IMAGES_PROCESSED = REGISTRY.counter("image_derivatives_processed_total", "Photos processed, by outcome (rendered, reused, invalid, missing, failed)")
+IMAGE_SECONDS = REGISTRY.histogram("image_derivatives_seconds", "Time to read, render and store the derivatives of one photo")
+IMAGES_QUEUED = REGISTRY.gauge("image_derivatives_queued", "Photos waiting for the image pipeline in this worker")
+
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Leaves a freshly confirmed photo to the worker that queued it
+SWEEP_GRACE = timedelta(minutes=1)
+SWEEP_BATCH = 100
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    name: str
+    width: int
+    height: int
+
+    def key(self, digest: str, quality: int) -> str:
+        return f"derived/{digest}/{self.name}-{self.width}x{self.height}-q{quality}.webp"
+
+
+# Cropped to fill the box, never enlarged
+VARIANTS = (
+    ImageVariant("card", 800, 500),
+    ImageVariant("avatar", 256, 256),
+)
+
+
+class UnreadableImage(ValueError):
+    """Not an image Pillow can decode, or larger than IMAGE_MAX_PIXELS."""
+
+
+def render_variants(data: bytes, variants: Sequence[ImageVariant], quality: int, max_pixels: int) -> Dict[str, bytes]:
+    """Encoded WebP bytes per variant name. Runs on the pipeline's thread pool."""
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > max_pixels:
+                raise UnreadableImage(f"{image.width}x{image.height} exceeds IMAGE_MAX_PIXELS")
+            # JPEGs decode straight to a reduced scale that still covers the
+            # largest variant. The box is square because draft() works on the
+            # stored axes, before exif_transpose turns a portrait photo upright.
+            largest = max(max(v.width, v.height) for v in variants)
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            transparent = image.mode in ("RGBA", "LA") or "transparency" in image.info
+            image = image.convert("RGBA" if transparent else "RGB")
+            rendered = {}
+            for variant in variants:
+                scale = min(1.0, image.width / variant.width, image.height / variant.height)
+                size = (max(1, round(variant.width * scale)), max(1, round(variant.height * scale)))
+                buffer = io.BytesIO()
+                ImageOps.fit(image, size, Image.Resampling.LANCZOS).save(buffer, "WEBP", quality=quality, method=4)
+                rendered[variant.name] = buffer.getvalue()
+            return rendered
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        # UnidentifiedImageError and truncated files are OSErrors
+        raise UnreadableImage(str(exc)) from exc
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImagePipeline:
+    def __init__(self):
+        self._queue: Optional["asyncio.Queue[UUID]"] = None
+        self._queued: Set[UUID] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        IMAGES_QUEUED.add_callback(lambda: {(): len(self._queued)})
+
+    def submit(self, upload_id: UUID) -> None:
+        """Queue a confirmed photo upload. Never blocks: a full queue leaves it to the sweep."""
+        if self._queue is None or upload_id in self._queued:
+            return
+        try:
+            self._queue.put_nowait(upload_id)
+        except asyncio.QueueFull:
+            logger.warning("Image queue full; upload %s waits for the next sweep", upload_id)
+            return
+        self._queued.add(upload_id)
+
+    async def start(self, session_factory) -> None:
+        """session_factory opens a session, as for the suggest index."""
+        if not settings.IMAGE_DERIVATIVES_ENABLED:
+            return
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            logger.warning("Pillow is not installed; photos are served without resized variants")
+            return
+        self._queue = asyncio.Queue(maxsize=settings.IMAGE_QUEUE_SIZE)
+        self._executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image")
+        self._tasks = [asyncio.create_task(self._work_forever(session_factory)) for _ in range(settings.IMAGE_WORKERS)]
+        self._tasks.append(asyncio.create_task(self._sweep_forever(session_factory)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+        self._queued.clear()
+
+    async def _work_forever(self, session_factory) -> None:
+        while True:
+            upload_id = await self._queue.get()
+            db = session_factory()
+            try:
+                await self.process(db, upload_id)
+            except Exception:
+                IMAGES_PROCESSED.inc(outcome="failed")
+                logger.exception("Could not process photo upload %s; the sweep will retry it", upload_id)
+            finally:
+                self._queued.discard(upload_id)
+                await db.close()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def process(self, db, upload_id: UUID) -> None:
+        """Render (or reuse) the derivatives of one confirmed photo and attach their URLs."""
+        upload = await db.get(MediaUpload, upload_id)
+        if upload is None or upload.status != "complete" or upload.derived_at is not None:
+            return
+        target = TARGETS[upload.target]
+        start = time.perf_counter()
+        quality = settings.IMAGE_WEBP_QUALITY
+
+        data = await storage.read(upload.key)
+        variants: Optional[Dict[str, str]] = None
+        if data is None:
+            logger.warning("Photo upload %s is no longer in storage", upload_id)
+            IMAGES_PROCESSED.inc(outcome="missing")
+            upload.derived_at = func.now()
+            await db.commit()
+            return
+        digest = await self._run(_sha256, data)
+        keys = {variant.name: variant.key(digest, quality) for variant in VARIANTS}
+        missing = [variant for variant in VARIANTS if await storage.stat(keys[variant.name]) is None]
+        if missing:
+            try:
+                rendered = await self._run(render_variants, data, missing, quality, settings.IMAGE_MAX_PIXELS)
+            except UnreadableImage as exc:
+                logger.warning("Photo upload %s is not a usable image: %s", upload_id, exc)
+                IMAGES_PROCESSED.inc(outcome="invalid")
+            else:
+                for name, body in rendered.items():
+                    await storage.put(keys[name], body, "image/webp", cache_control=DERIVATIVE_CACHE_CONTROL)
+                IMAGES_PROCESSED.inc(outcome="rendered")
+                variants = {name: storage.public_url(key) for name, key in keys.items()}
+        else:
+            IMAGES_PROCESSED.inc(outcome="reused")
+            variants = {name: storage.public_url(key) for name, key in keys.items()}
+
+        attached = 0
+        if variants is not None:
+            # Only if the photo has not been replaced since
+            result = await db.execute(
+                update(target.model)
+                .where(getattr(target.model, target.column) == storage.public_url(upload.key))
+                .values(photo_variants=variants)
+            )
+            attached = result.rowcount
+        upload.derived_at = func.now()
+        await db.commit()
+        if attached:
+            await target.invalidate(upload.user_id, upload.gig_id)
+        IMAGE_SECONDS.observe(time.perf_counter() - start)
+
+    async def _sweep_forever(self, session_factory) -> None:
+        while True:
+            db = session_factory()
+            try:
+                cutoff = datetime.now(timezone.utc) - SWEEP_GRACE
+                for upload_id in await db.scalars(
+                    select(MediaUpload.id)
+                    .where(
+                        MediaUpload.status == "complete",
+                        MediaUpload.derived_at.is_(None),
+                        MediaUpload.target.in_(PHOTO_TARGETS),
+                        MediaUpload.completed_at < cutoff,
+                    )
+                    .order_by(MediaUpload.completed_at)
+                    .limit(SWEEP_BATCH)
+                ):
+                    self.submit(upload_id)
+            except Exception:
+                logger.exception("Image pipeline sweep failed")
+            finally:
+                await db.close()
+            await asyncio.sleep(settings.IMAGE_SWEEP_SECONDS)
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,103 @@
+from typing import Any, List
+from sqlalchemy import Float, Numeric, and_, case, cast, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import array, insert
+from app.core.config import settings
+from app.models.gig import GigMatch, GigPosting, GigRequest
+from app.services.geo import haversine_km
+
+# Score = GENRE_WEIGHT for the required genre match, plus up to
+# PROXIMITY_WEIGHT for distance and TAG_WEIGHT when the gig's tags also
+# mention one of the band's genres. Always in [0, 1].
+GENRE_WEIGHT = 0.6
+PROXIMITY_WEIGHT = 0.3
+TAG_WEIGHT = 0.1
+
+_MATCH_COLUMNS = ["gig_id", "band_id", "request_id", "venue_id", "gig_date", "score", "distance_km"]
+
+
+def _candidates():
+    """
+    Every (open upcoming gig, gig request) pair that matches, reduced to the
+    best-scoring request per (gig, band).
+
+    A pair matches when the gig date falls inside the availability window,
+    the gig's genre is one of the request's genres and, if the request sets
+    max_distance and a location, the gig lies within that many km of it.
+    """
+    band_located = and_(GigRequest.location_lat.isnot(None), GigRequest.location_lng.isnot(None))
+    gig_located = and_(GigPosting.location_lat.isnot(None), GigPosting.location_lng.isnot(None))
+    distance = haversine_km(
+        GigPosting.location_lat, GigPosting.location_lng,
+        GigRequest.location_lat, GigRequest.location_lng,
+    )
+    limited = and_(band_located, GigRequest.max_distance.isnot(None))
+
+    proximity = case(
+        (limited, 1 - distance / func.greatest(GigRequest.max_distance, 1)),
+        (and_(band_located, gig_located), func.greatest(0.0, 1 - distance / settings.DISCOVERY_MAX_RADIUS_KM)),
+        else_=0.5,
+    )
+    tag_overlap = case((GigPosting.tags.op("&&")(GigRequest.genres), 1.0), else_=0.0)
+    score = cast(GENRE_WEIGHT + PROXIMITY_WEIGHT * proximity + TAG_WEIGHT * tag_overlap, Float)
+
+    return (
+        select(
+            GigPosting.id,
+            GigRequest.band_id,
+            GigRequest.id,
+            GigPosting.venue_id,
+            GigPosting.date,
+            score,
+            case((and_(band_located, gig_located), cast(func.round(cast(distance, Numeric), 3), Float)), else_=None),
+        )
+        .select_from(GigPosting)
+        .join(
+            GigRequest,
+            # Written against the availability range and genres indexes, so
+            # matching a single gig is an index lookup on gig_requests
+            and_(
+                GigRequest.availability.op("@>")(GigPosting.date),
+                GigRequest.genres.op("@>")(cast(array([GigPosting.genre]), GigRequest.genres.type)),
+            ),
+        )
+        .where(
+            GigPosting.status == "open",
+            GigPosting.date >= func.current_date(),
+            or_(~limited, and_(gig_located, distance <= GigRequest.max_distance)),
+        )
+        .distinct(GigPosting.id, GigRequest.band_id)
+        .order_by(GigPosting.id, GigRequest.band_id, score.desc())
+    )
+
+
+def _upsert(candidates):
+    stmt = insert(GigMatch).from_select(_MATCH_COLUMNS, candidates)
+    return stmt.on_conflict_do_update(
+        index_elements=[GigMatch.gig_id, GigMatch.band_id],
+        set_={col: stmt.excluded[col] for col in _MATCH_COLUMNS[2:]},
+    )
+
+
+def rebuild_statements() -> List[Any]:
+    """Recompute the whole table, e.g. after a migration or a scoring change."""
+    return [delete(GigMatch), _upsert(_candidates())]
+
+
+async def refresh_gig_matches(db, gig_id) -> None:
+    """
+    Re-match one gig against every request. Call after creating or editing a
+    gig, inside the same transaction, so matches commit with the gig.
+    """
+    await db.flush()
+    await db.execute(delete(GigMatch).where(GigMatch.gig_id == gig_id))
+    await db.execute(_upsert(_candidates().where(GigPosting.id == gig_id)))
+
+
+async def refresh_band_matches(db, band_id) -> None:
+    """
+    Re-match all of a band's requests against open gigs. A band only has a
+    handful of requests, and the best request per gig depends on all of them.
+    """
+    await db.flush()
+    await db.execute(delete(GigMatch).where(GigMatch.band_id == band_id))
+    await db.execute(_upsert(_candidates().where(GigRequest.band_id == band_id)))
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.models.notification import Notification
+from app.schemas.notification import NotificationResponse
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "booklyn_notifications"
+
+EVENTS_PUBLISHED = REGISTRY.counter("notification_events_published_total", "Notifications fanned out to local stream subscribers")
+SUBSCRIBERS_DROPPED = REGISTRY.counter("notification_subscribers_dropped_total", "Streams closed because the client fell too far behind")
+SUBSCRIBERS = REGISTRY.gauge("notification_stream_subscribers", "Open notification streams in this worker")
+
+
+def notification_payload(notif: Notification) -> Dict[str, Any]:
+    return NotificationResponse.model_validate(notif).model_dump(mode="json")
+
+
+class Subscription:
+    """
+    One open stream. If the client stops reading and the queue fills up the
+    subscription is closed rather than blocking publishers; the client
+    reconnects with Last-Event-ID and catches up from the database.
+    """
+    def __init__(self, user_id: str, max_queued: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=max_queued)
+        self.closed = False
+
+    def push(self, payload: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.closed = True
+            SUBSCRIBERS_DROPPED.inc()
+            # Make room for the end-of-stream marker so the reader wakes up
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class NotificationHub:
+    """
+    In-process fan-out of new notifications to the recipient's open streams.
+
+    With NOTIFICATIONS_PG_BRIDGE enabled, producers send pg_notify inside their
+    transaction instead, and every worker LISTENs on one connection and fans
+    out locally. Postgres only delivers the NOTIFY once the transaction
+    commits, so subscribers never see a notification that was rolled back.
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bridge_task: Optional[asyncio.Task] = None
+        SUBSCRIBERS.add_callback(lambda: {(): sum(len(s) for s in self._subscribers.values())})
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if settings.NOTIFICATIONS_PG_BRIDGE:
+            self._bridge_task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._bridge_task is not None:
+            self._bridge_task.cancel()
+            try:
+                await self._bridge_task
+            except asyncio.CancelledError:
+                pass
+            self._bridge_task = None
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.push(None)
+
+    def subscribe(self, user_id) -> Subscription:
+        subscription = Subscription(str(user_id), settings.NOTIFICATIONS_STREAM_QUEUE_SIZE)
+        self._subscribers[subscription.user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, payload: Dict[str, Any]) -> None:
+        """Deliver to this worker's subscribers. Must run on the event loop."""
+        for subscription in list(self._subscribers.get(str(payload["user_id"]), ())):
+            subscription.push(payload)
+            EVENTS_PUBLISHED.inc()
+
+    def publish_threadsafe(self, payloads: Iterable[Dict[str, Any]]) -> None:
+        if self._loop is None:
+            return
+        for payload in payloads:
+            self._loop.call_soon_threadsafe(self.publish, payload)
+
+    async def publish_on_commit(self, db, notifications: Iterable[Notification]) -> None:
+        """
+        Call after db.add(...) and before db.commit(). Flushes so ids and
+        created_at are known, then arranges for the notifications to be
+        pushed once (and only if) the transaction commits.
+        """
+        notifications = list(notifications)
+        if not notifications:
+            return
+        await db.flush()
+        payloads = [dict(notification_payload(n), user_id=str(n.user_id)) for n in notifications]
+
+        if settings.NOTIFICATIONS_PG_BRIDGE:
+            for payload in payloads:
+                await db.execute(select(func.pg_notify(PG_CHANNEL, json.dumps(payload))))
+            return
+
+        # after_commit fires on the threadpool for the sync stack, hence threadsafe
+        event.listen(db.sync_session, "after_commit", lambda session: self.publish_threadsafe(payloads), once=True)
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        # Same connection parameters SQLAlchemy's asyncpg dialect would use
+        connect_args = make_url(settings.ASYNC_DATABASE_URL).translate_connect_args(username="user")
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(**connect_args)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda c: lost.set())
+                await conn.add_listener(PG_CHANNEL, self._on_pg_notify)
+                logger.info("Listening for notifications on channel %s", PG_CHANNEL)
+                await lost.wait()
+                logger.warning("Notification listener connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification listener failed, retrying")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            # Anything sent while disconnected is picked up by clients resuming
+            # with Last-Event-ID, so a short backoff is enough.
+            await asyncio.sleep(1)
+
+    def _on_pg_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed notification payload on %s", channel)
+
+
+notification_hub = NotificationHub()
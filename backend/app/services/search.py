@@ -0,0 +1,116 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Float, Select, String, case, cast, func, select, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from app.models.gig import GigPosting
+from app.models.profile import BandProfile, VenueProfile
+
+SEARCH_CONFIG = "english"
+
+# Tokens are reduced to plain words before they reach to_tsquery, so user
+# input can never inject tsquery operators.
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """
+    'jazz tri' -> 'jazz:* & tri:*' so the last word matches while still being
+    typed (type-ahead) and every word has to match somewhere.
+    """
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _text_search(search_vector, name, term: str) -> Tuple[Any, Any]:
+    term = term.strip()
+    # float4 scores are widened to float8 so they survive a round trip through
+    # a pagination cursor unchanged
+    similarity = cast(func.similarity(name, term), Float)
+    fuzzy = name.op("%")(term)
+
+    query_text = prefix_tsquery(term)
+    if query_text is None:
+        return fuzzy, similarity
+
+    tsquery = func.to_tsquery(SEARCH_CONFIG, query_text)
+    rank = cast(func.ts_rank(search_vector, tsquery), Float) + similarity
+    return search_vector.op("@@")(tsquery) | fuzzy, rank
+
+
+def gig_search(term: str) -> Tuple[Any, Any]:
+    """
+    Returns (where_clause, rank) for a free-text gig search.
+
+    Matches go through the GIN index on gig_postings.search_vector; titles that
+    only match by trigram similarity (typos) come in through the pg_trgm index.
+    """
+    return _text_search(GigPosting.search_vector, GigPosting.title, term)
+
+
+def venue_search(term: str) -> Tuple[Any, Any]:
+    """The same for venues: name, city and bio, with typo tolerance on the name."""
+    return _text_search(VenueProfile.search_vector, VenueProfile.venue_name, term)
+
+
+def band_search(term: str) -> Tuple[Any, Any]:
+    """The same for bands: name, genre, city and bio, with typo tolerance on the name."""
+    return _text_search(BandProfile.search_vector, BandProfile.band_name, term)
+
+
+def band_facets_query(conditions: List[Any], genre_condition: Any, location_condition: Any) -> Select:
+    """
+    Bands per genre and per (state, city) in one pass, via GROUPING SETS.
+
+    Facets are disjunctive: each dimension is counted with every filter
+    except its own, so picking a genre still shows how many bands the other
+    genres have. conditions (text search) apply to both; the genre and
+    location filters go into per-dimension FILTER clauses.
+    """
+    by_genre = func.count().filter(location_condition if location_condition is not None else true())
+    by_location = func.count().filter(genre_condition if genre_condition is not None else true())
+    return (
+        select(
+            BandProfile.genre,
+            BandProfile.location_state,
+            BandProfile.location_city,
+            # 1 on (state, city) rows, where genre is not grouped
+            func.grouping(BandProfile.genre).label("is_location"),
+            by_genre.label("genre_count"),
+            by_location.label("location_count"),
+        )
+        .where(*conditions)
+        .group_by(func.grouping_sets(
+            tuple_(BandProfile.genre),
+            tuple_(BandProfile.location_state, BandProfile.location_city),
+        ))
+    )
+
+
+def collect_band_facets(rows, limit: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows of band_facets_query as the top `limit` values per facet, largest first."""
+    genres, cities = [], []
+    for row in rows:
+        if row.is_location:
+            if row.location_count:
+                cities.append({"city": row.location_city, "state": row.location_state, "count": row.location_count})
+        elif row.genre_count:
+            genres.append({"value": row.genre, "count": row.genre_count})
+    genres.sort(key=lambda facet: (-facet["count"], facet["value"]))
+    cities.sort(key=lambda facet: (-facet["count"], facet["state"], facet["city"]))
+    return {"genre": genres[:limit], "city": cities[:limit]}
+
+
+def genre_overlap(genres_column, genres: List[str]) -> Tuple[Any, Any]:
+    """
+    Returns (where_clause, rank) for rows whose genres array shares at least
+    one of genres. The clause is an && the GIN index answers; the rank is the
+    fraction of the requested genres the row lists.
+    """
+    condition = genres_column.op("&&")(cast(array(genres), ARRAY(String)))
+    matched = sum(
+        case((genres_column.op("@>")(cast(array([genre]), ARRAY(String))), 1.0), else_=0.0)
+        for genre in genres
+    )
+    return condition, cast(matched / len(genres), Float)
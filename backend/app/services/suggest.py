@@ -0,0 +1,321 @@
+"""
+In-process type-ahead index over venue names, band names, cities, genres
+and gig tags, so search boxes can complete every keystroke without a round
+trip to Postgres.
+
+Every suggestion is stored once per word it contains, keyed by the
+normalized text from that word on, in sorted arrays: the completions of a
+prefix are the contiguous run that bisect finds. "gold" finds "The Golden
+Saints" through the key "golden saints".
+
+The index is loaded at startup and rebuilt every SUGGEST_REFRESH_SECONDS.
+Profile and gig writes update it in place; the periodic rebuild brings in
+writes handled by other workers and drops gigs that closed.
+"""
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.models.gig import GigPosting
+from app.models.profile import BandProfile, VenueProfile
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_ENTRIES = REGISTRY.gauge("suggest_index_entries", "Distinct suggestions in this worker's type-ahead index")
+SUGGEST_REBUILD_SECONDS = REGISTRY.histogram("suggest_index_rebuild_seconds", "Time to reload the type-ahead index")
+
+KINDS = ("venue", "band", "city", "genre", "tag")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Sorts after every character, so [prefix, prefix + _HIGH) is the run of keys starting with prefix
+_HIGH = chr(0x10FFFF)
+
+Entry = Tuple[str, str]  # (kind, normalized text)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accents stripped, words joined by single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_WORD_RE.findall(stripped.casefold()))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    text: str
+    count: int
+
+
+def _rank_key(position: int, count: int, text: str) -> tuple:
+    """Start-of-text matches first, then the most common, then the shortest."""
+    return (position > 0, -count, len(text), text)
+
+
+class _KindIndex:
+    """
+    One kind's keys, sorted, each with its rank in suggestion order, plus a
+    sparse table answering "best-ranked key in keys[lo:hi]" in O(1). The top
+    k of a prefix's run are then found with a heap in O(k log n), however
+    long the run ("t" matches every "The ..."). Static: built on reload.
+    """
+    def __init__(self, items: List[Tuple[str, str, int]], counts: Counter, kind: str):
+        items.sort()
+        self.keys = [key for key, _, _ in items]
+        self.texts = [text for _, text, _ in items]
+        order = sorted(range(len(items)), key=lambda i: _rank_key(items[i][2], counts[(kind, items[i][1])], items[i][1]))
+        self.rank = array("i", bytes(4 * len(items)))
+        for rank, i in enumerate(order):
+            self.rank[i] = rank
+        # table[j][i]: index of the best rank in keys[i : i + 2**j]
+        self.table = [array("i", range(len(items)))]
+        width = 1
+        while 2 * width <= len(items):
+            prev, rank = self.table[-1], self.rank
+            self.table.append(array("i", (
+                a if rank[a] < rank[b] else b
+                for a, b in zip(prev, prev[width:])
+            )))
+            width *= 2
+
+    def _best(self, lo: int, hi: int) -> int:
+        """Index of the best-ranked key in keys[lo:hi] (hi > lo)."""
+        j = (hi - lo).bit_length() - 1
+        a, b = self.table[j][lo], self.table[j][hi - (1 << j)]
+        return a if self.rank[a] < self.rank[b] else b
+
+    def top(self, prefix: str, wanted: int, skip) -> List[Tuple[str, int]]:
+        """Up to `wanted` distinct texts with a key starting with prefix, best first, with their key's index."""
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _HIGH, lo)
+        found, seen = [], set()
+        if lo == hi:
+            return found
+        best = self._best(lo, hi)
+        heap = [(self.rank[best], best, lo, hi)]
+        while heap and len(found) < wanted:
+            _, i, lo, hi = heappop(heap)
+            text = self.texts[i]
+            # A text's first (best-ranked) key wins; later words of it are skipped
+            if text not in seen and not skip(text):
+                seen.add(text)
+                found.append((text, i))
+            for a, b in ((lo, i), (i + 1, hi)):
+                if a < b:
+                    best = self._best(a, b)
+                    heappush(heap, (self.rank[best], best, a, b))
+        return found
+
+
+class _Entries:
+    """
+    The index proper: a static _KindIndex per kind built on reload, live
+    counts of the sources (profiles, gigs) contributing each entry, and the
+    entries added since the reload, matched by a scan (there are few).
+    Entries are normalized, so "Jazz" and "jazz" are one suggestion, shown
+    as first written. Rankings use counts as of the reload; the counts
+    shown are live.
+    """
+    def __init__(self, sources: Dict[str, Iterable[Entry]]):
+        self.counts: Counter = Counter()
+        self.display: Dict[Entry, str] = {}
+        self.sources: Dict[str, Tuple[Entry, ...]] = {}
+        for source, raw in sources.items():
+            entries = self._normalize(raw)
+            if entries:
+                self.sources[source] = entries
+                self.counts.update(entries)
+        items: Dict[str, List[Tuple[str, str, int]]] = {kind: [] for kind in KINDS}
+        for kind, text in self.counts:
+            items[kind].extend((key, text, position) for key, position in _word_keys(text))
+        self.indexes = {kind: _KindIndex(kind_items, self.counts, kind) for kind, kind_items in items.items()}
+        self.static = set(self.counts)
+        self.added: Dict[Entry, List[str]] = {}
+
+    def _normalize(self, raw: Iterable[Entry]) -> Tuple[Entry, ...]:
+        entries = []
+        for kind, text in raw:
+            entry = (kind, normalize(text or ""))
+            if entry[1]:
+                self.display.setdefault(entry, text.strip())
+                entries.append(entry)
+        return tuple(dict.fromkeys(entries))
+
+    def set_source(self, source: str, raw: Iterable[Entry]) -> None:
+        entries = self._normalize(raw)
+        old = self.sources.pop(source, ())
+        if entries:
+            self.sources[source] = entries
+        # Count the new entries first so one kept across the update never drops to zero
+        for entry in entries:
+            if self.counts[entry] == 0 and entry not in self.static:
+                self.added[entry] = [key for key, _ in _word_keys(entry[1])]
+            self.counts[entry] += 1
+        for entry in old:
+            self.counts[entry] -= 1
+            if self.counts[entry] <= 0:
+                # Static entries stay in their index, skipped while their count is zero
+                del self.counts[entry]
+                self.added.pop(entry, None)
+                if entry not in self.static:
+                    del self.display[entry]
+
+    def complete(self, prefix: str, kinds: Sequence[str], limit: int) -> List[Suggestion]:
+        candidates = []
+        for kind in kinds:
+            index = self.indexes[kind]
+            gone = lambda text, kind=kind: (kind, text) not in self.counts
+            for text, i in index.top(prefix, limit, gone):
+                candidates.append((kind, text, 0 if index.keys[i] == text else 1))
+        for (kind, text), keys in self.added.items():
+            if kind in kinds:
+                for position, key in enumerate(keys):
+                    if key.startswith(prefix):
+                        candidates.append((kind, text, position))
+                        break
+        candidates.sort(key=lambda c: _rank_key(c[2], self.counts[(c[0], c[1])], c[1]))
+        return [
+            Suggestion(kind, self.display[(kind, text)], self.counts[(kind, text)])
+            for kind, text, _ in candidates[:limit]
+        ]
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._entries = _Entries({})
+        # Writes seen while a rebuild is reading, replayed onto its result
+        self._pending: Optional[List[Tuple[str, Tuple[Entry, ...]]]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        SUGGEST_ENTRIES.add_callback(lambda: {(): len(self._entries.counts)})
+
+    def suggest(self, prefix: str, kinds: Sequence[str] = KINDS, limit: int = 10) -> List[Suggestion]:
+        """
+        Completions of prefix, best first: matches at the start of the text
+        before matches on a later word, then by how many profiles or gigs
+        carry it (a city with many bands before a city with one), then
+        shorter text.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        return self._entries.complete(prefix, [kind for kind in KINDS if kind in kinds], limit)
+
+    # Write hooks, called after the commit
+
+    def update_band(self, band: BandProfile) -> None:
+        self._set_source(f"band:{band.user_id}", _band_entries(band.band_name, band.genre, band.location_city, band.location_state))
+
+    def update_venue(self, venue: VenueProfile) -> None:
+        self._set_source(f"venue:{venue.user_id}", _venue_entries(
+            venue.venue_name, venue.typical_genres, venue.location_city, venue.location_state,
+        ))
+
+    def update_gig(self, gig: GigPosting) -> None:
+        entries = _gig_entries(gig.genre, gig.tags) if gig.status == "open" else ()
+        self._set_source(f"gig:{gig.id}", entries)
+
+    def _set_source(self, source: str, entries: Tuple[Entry, ...]) -> None:
+        if self._pending is not None:
+            self._pending.append((source, entries))
+        self._entries.set_source(source, entries)
+
+    async def rebuild(self, db) -> None:
+        """Reload everything from the database and swap it in."""
+        start = time.perf_counter()
+        self._pending = []
+        try:
+            sources: Dict[str, Tuple[Entry, ...]] = {}
+            for row in await db.execute(select(
+                BandProfile.user_id, BandProfile.band_name, BandProfile.genre,
+                BandProfile.location_city, BandProfile.location_state,
+            )):
+                sources[f"band:{row.user_id}"] = _band_entries(row.band_name, row.genre, row.location_city, row.location_state)
+            for row in await db.execute(select(
+                VenueProfile.user_id, VenueProfile.venue_name, VenueProfile.typical_genres,
+                VenueProfile.location_city, VenueProfile.location_state,
+            )):
+                sources[f"venue:{row.user_id}"] = _venue_entries(row.venue_name, row.typical_genres, row.location_city, row.location_state)
+            for row in await db.execute(
+                select(GigPosting.id, GigPosting.genre, GigPosting.tags).where(GigPosting.status == "open")
+            ):
+                sources[f"gig:{row.id}"] = _gig_entries(row.genre, row.tags)
+            # Sorting and the range tables take a second or two on a large
+            # catalogue; build them off the event loop
+            entries = await run_in_threadpool(_Entries, sources)
+            # A write that committed after its rows were read would otherwise be lost
+            for source, raw in self._pending:
+                entries.set_source(source, raw)
+        finally:
+            self._pending = None
+
+        self._entries = entries
+        elapsed = time.perf_counter() - start
+        SUGGEST_REBUILD_SECONDS.observe(elapsed)
+        logger.info("Suggest index loaded: %d suggestions in %.0f ms", len(entries.counts), elapsed * 1000)
+
+    async def start(self, session_factory) -> None:
+        """Load now, then keep reloading in the background. session_factory opens a request session."""
+        await self._rebuild_with(session_factory)
+        if settings.SUGGEST_REFRESH_SECONDS > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_forever(session_factory))
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _rebuild_with(self, session_factory) -> None:
+        db = session_factory()
+        try:
+            await self.rebuild(db)
+        finally:
+            await db.close()
+
+    async def _refresh_forever(self, session_factory) -> None:
+        while True:
+            await asyncio.sleep(settings.SUGGEST_REFRESH_SECONDS)
+            try:
+                await self._rebuild_with(session_factory)
+            except Exception:
+                logger.exception("Suggest index rebuild failed; keeping the current one")
+
+
+def _word_keys(text: str) -> List[Tuple[str, int]]:
+    """Normalized text from each word on, with that word's position."""
+    words = text.split(" ")
+    return [(" ".join(words[i:]), i) for i in range(len(words))]
+
+
+def _city(city: Optional[str], state: Optional[str]) -> Entry:
+    city, state = (city or "").strip(), (state or "").strip()
+    return ("city", f"{city}, {state}" if city and state else city)
+
+
+def _band_entries(name, genre, city, state) -> Tuple[Entry, ...]:
+    return (("band", name), ("genre", genre), _city(city, state))
+
+
+def _venue_entries(name, genres, city, state) -> Tuple[Entry, ...]:
+    return (("venue", name), _city(city, state), *(("genre", genre) for genre in genres or ()))
+
+
+def _gig_entries(genre, tags) -> Tuple[Entry, ...]:
+    return (("genre", genre), *(("tag", tag) for tag in tags or ()))
+
+
+suggest_index = SuggestIndex()
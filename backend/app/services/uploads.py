@@ -0,0 +1,84 @@
+"""
+What can be uploaded where: each target names the column that receives the
+stored file's URL, who may set it, and which types and sizes it accepts.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.response_cache import (
+    discover_gigs_cache, discover_venues_cache, gig_cache, profile_cache, venue_list_cache,
+)
+from app.models.gig import GigPosting
+from app.models.profile import BandProfile, VenueProfile
+
+UPLOADS_COMPLETED = REGISTRY.counter("uploads_completed_total", "Uploads confirmed and attached, by target")
+UPLOADS_REJECTED = REGISTRY.counter("uploads_rejected_total", "Confirmed uploads that were missing or not the declared size")
+UPLOAD_BYTES = REGISTRY.counter("upload_bytes_total", "Bytes of confirmed uploads, by target")
+
+# Accepted content type -> extension of the stored object
+AUDIO_TYPES = {
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+    "audio/x-m4a": ".m4a",
+    "audio/aac": ".aac",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/ogg": ".ogg",
+    "audio/flac": ".flac",
+}
+IMAGE_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+
+
+@dataclass(frozen=True)
+class UploadTarget:
+    name: str
+    model: Any
+    column: str
+    role: str # "band" or "venue"
+    kind: str # "demos" or "photos": key prefix and size limit
+    content_types: Dict[str, str]
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.UPLOAD_MAX_DEMO_BYTES if self.kind == "demos" else settings.UPLOAD_MAX_PHOTO_BYTES
+
+    def object_key(self, user_id: Any, upload_id: Any, content_type: str) -> str:
+        return f"{self.kind}/{user_id}/{upload_id}{self.content_types[content_type]}"
+
+    async def load(self, db: AsyncSession, user_id: Any, gig_id: Any = None) -> Optional[Any]:
+        """The row that receives the URL, if it exists and belongs to this user."""
+        if self.model is GigPosting:
+            if gig_id is None:
+                return None
+            return await db.scalar(select(GigPosting).where(GigPosting.id == gig_id, GigPosting.venue_id == user_id))
+        return await db.scalar(select(self.model).where(self.model.user_id == user_id))
+
+    async def invalidate(self, user_id: Any, gig_id: Any = None) -> None:
+        """Drop the cached responses that show this target's column."""
+        if self.model is GigPosting:
+            await gig_cache.invalidate(gig_id)
+            await discover_gigs_cache.invalidate()
+            return
+        await profile_cache.invalidate(user_id)
+        if self.model is VenueProfile:
+            await venue_list_cache.invalidate()
+            await discover_venues_cache.invalidate()
+
+
+TARGETS = {
+    target.name: target
+    for target in (
+        UploadTarget("band_demo", BandProfile, "demo_url", "band", "demos", AUDIO_TYPES),
+        UploadTarget("band_photo", BandProfile, "photo_url", "band", "photos", IMAGE_TYPES),
+        UploadTarget("venue_photo", VenueProfile, "photo_url", "venue", "photos", IMAGE_TYPES),
+        UploadTarget("gig_photo", GigPosting, "photo_url", "venue", "photos", IMAGE_TYPES),
+    )
+}
+PHOTO_TARGETS = tuple(name for name, target in TARGETS.items() if target.kind == "photos")
@@ -0,0 +1,67 @@
+"""
+Per-call cost of the token work every authenticated request does.
+
+    python benchmarks/jwt_decode.py --iterations 20000 [--json jwt.json]
+
+decode is python-jose alone; authenticate adds the principal cache lookup
+that get_current_user performs (a warm in-process cache, no database).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jose import jwt
+from app.api.deps import _principal_from_token
+from app.core import auth
+from app.core.config import settings
+from app.core.principal import Principal, cache_principal
+from report import print_table, summarize, write_report
+
+
+def measure(fn, iterations: int) -> dict:
+    fn()  # warm up
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run(iterations: int) -> dict:
+    user_id = uuid.uuid4()
+    token = auth.create_access_token(user_id)
+    await cache_principal(Principal(id=user_id, email="bench@example.com", role="band", created_at=datetime.now(timezone.utc)))
+
+    def authenticate():
+        # Driven synchronously so the timing excludes event loop scheduling
+        coro = _principal_from_token(None, token)
+        try:
+            coro.send(None)
+        except StopIteration:
+            return
+        raise RuntimeError("principal cache missed; CACHE_URL must be unset for this benchmark")
+
+    return {
+        "encode": measure(lambda: auth.create_access_token(user_id), iterations),
+        "decode": measure(lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]), iterations),
+        "authenticate": measure(authenticate, iterations),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.iterations))
+    print_table(results)
+    if args.json:
+        write_report(args.json, "jwt", results, iterations=args.iterations, algorithm=settings.ALGORITHM)
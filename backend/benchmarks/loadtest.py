@@ -0,0 +1,160 @@
+"""
+Drive the hot API routes with concurrent async clients and report
+throughput and p50/p95/p99 latency per route.
+
+    python app/db/seed.py --bench --reset            # synthetic accounts and data
+    uvicorn app.main:app --workers 4 &
+    python benchmarks/loadtest.py --concurrency 32 --duration 20 --json results.json
+    python benchmarks/loadtest.py --baseline results.json   # exit 1 on a p95 regression
+
+Each route runs on its own for --duration seconds so the numbers do not
+bleed into each other. Needs httpx (benchmarks/requirements.txt).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.synthetic import BENCH_PASSWORD, GENRES, SEARCH_WORDS, bench_email
+from report import compare, print_table, summarize, write_report
+
+API = "/api/v1"
+
+
+class Accounts:
+    def __init__(self, bands: List[str], venues: List[str]):
+        self.bands = bands
+        self.venues = venues
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    r = await client.post(f"{API}/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def sign_in(client: httpx.AsyncClient, count: int) -> Accounts:
+    bands = [await login(client, bench_email("band", i)) for i in range(count)]
+    venues = [await login(client, bench_email("venue", i)) for i in range(count)]
+    return Accounts(bands, venues)
+
+
+def _auth(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def scenarios(accounts: Accounts, users: int) -> Dict[str, Callable]:
+    """Route name -> coroutine issuing one request; the name is what gets reported."""
+    def login_route(client):
+        email = bench_email(random.choice(["band", "venue"]), random.randrange(users))
+        return client.post(f"{API}/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+
+    def discover_search(client):
+        return client.get(f"{API}/discovery/gigs", params={"search": random.choice(SEARCH_WORDS)})
+
+    def discover_genre(client):
+        return client.get(f"{API}/discovery/gigs", params={"genre": random.choice(GENRES)})
+
+    def discover_nearby(client):
+        return client.get(f"{API}/discovery/gigs", params={"lat": 40.7, "lng": -73.95, "radius_km": 25})
+
+    def band_applications(client):
+        return client.get(f"{API}/applications/my-applications", headers=_auth(random.choice(accounts.bands)))
+
+    def venue_applications(client):
+        return client.get(f"{API}/applications/venue", headers=_auth(random.choice(accounts.venues)))
+
+    def notifications(client):
+        return client.get(f"{API}/notifications/", headers=_auth(random.choice(accounts.bands + accounts.venues)))
+
+    def unread_count(client):
+        return client.get(f"{API}/notifications/unread-count", headers=_auth(random.choice(accounts.bands + accounts.venues)))
+
+    return {
+        "login": login_route,
+        "discover_search": discover_search,
+        "discover_genre": discover_genre,
+        "discover_nearby": discover_nearby,
+        "band_applications": band_applications,
+        "venue_applications": venue_applications,
+        "notifications": notifications,
+        "notifications_unread": unread_count,
+    }
+
+
+async def run_route(client: httpx.AsyncClient, issue: Callable, concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                r = await issue(client)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def main(args) -> int:
+    random.seed(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        accounts = await sign_in(client, args.users)
+        routes = scenarios(accounts, args.users)
+        selected = args.routes.split(",") if args.routes else list(routes)
+        unknown = set(selected) - set(routes)
+        if unknown:
+            print(f"unknown routes: {', '.join(sorted(unknown))}; choose from {', '.join(routes)}")
+            return 2
+
+        results = {}
+        for name in selected:
+            if args.warmup:
+                await run_route(client, routes[name], args.concurrency, args.warmup)
+            results[name] = await run_route(client, routes[name], args.concurrency, args.duration)
+
+    print_table(results)
+    if args.json:
+        write_report(
+            args.json, "loadtest", results,
+            base_url=args.base_url, concurrency=args.concurrency, duration=args.duration, users=args.users,
+        )
+    if args.baseline:
+        regressions = compare(args.baseline, results, "p95_ms", args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per route")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds per route before measuring")
+    parser.add_argument("--users", type=int, default=20, help="seeded accounts of each role to sign in as")
+    parser.add_argument("--routes", help="comma-separated subset of routes to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown before failing (0.2 = 20%%)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
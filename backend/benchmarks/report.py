@@ -0,0 +1,74 @@
+"""
+Shared by the benchmark scripts: latency summaries and the JSON report
+format, so runs can be diffed against a saved baseline.
+"""
+import json
+import platform
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) for one route or operation."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path: str, benchmark: str, results: Dict[str, dict], **params) -> None:
+    report = {
+        "benchmark": benchmark,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def compare(baseline_path: str, results: Dict[str, dict], metric: str, tolerance: float) -> List[str]:
+    """Entries whose metric got worse than the baseline by more than tolerance (0.1 = 10%)."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get(metric)
+        if before and result[metric] > before * (1 + tolerance):
+            regressions.append(f"{name}: {metric} {before} -> {result[metric]}")
+    return regressions
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    print(f"{'name':<28} {'count':>7} {'err':>5} {'per sec':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<28} {r['requests']:>7} {r['errors']:>5} {r['throughput_rps']:>9.1f} "
+            f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f}"
+        )
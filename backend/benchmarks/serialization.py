@@ -0,0 +1,132 @@
+"""
+Per-row cost of serializing a gig listing, for each SERIALIZATION_MODE.
+
+    python benchmarks/serialization.py --rows 1000
+    python benchmarks/serialization.py --rows 1000 --db   # also time fetching from Postgres
+    python benchmarks/serialization.py --json serialization.json
+
+The in-memory part needs no database: it builds the same N gigs as ORM
+objects (what the "orm" path hands to FastAPI) and as projection rows (what
+"validated" and "trusted" hand to the encoder).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pydantic import TypeAdapter
+from app.api import serialization
+from app.models import notification, profile, user  # noqa: F401 -- register every mapper
+from app.models.gig import GigPosting
+from app.schemas.gig import GigPostingResponse
+from report import write_report
+
+results = {}
+
+
+def make_rows(n: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "venue_id": uuid.uuid4(),
+            "venue_name": "The Blue Room",
+            "title": f"Friday jazz night {i}",
+            "description": "Looking for a trio for a two-set evening. " * 8,
+            "genre": "Jazz",
+            "date": date(2026, 12, 1),
+            "time": "20:00",
+            "pay": "$300",
+            "formatted_address": "12 Main St, Brooklyn, NY",
+            "location_lat": 40.7 + i * 1e-4,
+            "location_lng": -74.0,
+            "tags": ["jazz", "trio", "standards"],
+            "status": "open",
+            "created_at": now,
+            "distance_km": None,
+        }
+        for i in range(n)
+    ]
+
+
+def bench(label: str, fn, n: int, repeat: int) -> None:
+    fn()  # warm up caches and lazy imports
+    best = min(_timed(fn) for _ in range(repeat))
+    print(f"{label:<34} {best * 1e3:9.2f} ms total {best / n * 1e6:9.2f} us/row")
+    results[label] = {"rows": n, "total_ms": round(best * 1e3, 3), "us_per_row": round(best / n * 1e6, 3)}
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_in_memory(n: int, repeat: int) -> None:
+    rows = make_rows(n)
+    gigs = []
+    for row in rows:
+        attrs = {k: v for k, v in row.items() if k != "distance_km"}
+        gigs.append(GigPosting(**attrs))
+    adapter = TypeAdapter(List[GigPostingResponse])
+
+    def orm_path():
+        # What FastAPI does with response_model: validate from attributes,
+        # dump to JSON-able Python, then the stdlib encoder
+        validated = adapter.validate_python(gigs, from_attributes=True)
+        json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def validated_path():
+        adapter.dump_json(adapter.validate_python(rows))
+
+    def trusted_path():
+        serialization.dumps(rows)
+
+    print(f"serialization, {n} rows (orjson {'available' if serialization.orjson else 'missing'})")
+    bench("orm (response_model + json)", orm_path, n, repeat)
+    bench("validated (TypeAdapter.dump_json)", validated_path, n, repeat)
+    bench("trusted (orjson)", trusted_path, n, repeat)
+
+
+def run_db(n: int, repeat: int) -> None:
+    from sqlalchemy import select
+    from app.db.session import SessionLocal
+    from app.api.v1.endpoints.gig import GIG_RESPONSE_COLUMNS
+
+    with SessionLocal() as db:
+        found = db.scalar(select(GigPosting.id).limit(1))
+        if found is None:
+            print("no gigs in the database, skipping fetch benchmark")
+            return
+
+        def fetch_orm():
+            db.expunge_all()
+            db.scalars(select(GigPosting).limit(n)).all()
+
+        def fetch_projection():
+            db.execute(select(*GIG_RESPONSE_COLUMNS).limit(n)).all()
+
+        count = len(db.execute(select(GigPosting.id).limit(n)).all())
+        print(f"fetch, {count} rows")
+        bench("ORM entities", fetch_orm, count, repeat)
+        bench("column tuples", fetch_projection, count, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", action="store_true", help="also time fetching gigs from the configured database")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+    run_in_memory(args.rows, args.repeat)
+    if args.db:
+        run_db(args.rows, args.repeat)
+    if args.json:
+        write_report(args.json, "serialization", results, rows=args.rows, repeat=args.repeat)
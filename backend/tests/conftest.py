@@ -0,0 +1,33 @@
+"""
+Tests run against the database in the usual POSTGRES_* settings, migrated to
+the latest version, and are skipped when it cannot be reached.
+"""
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.db.session import SessionLocal, async_engine
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    try:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1 FROM schema_migrations LIMIT 1"))
+    except OperationalError as exc:
+        pytest.skip(f"database unavailable: {exc.orig}")
+
+
+@pytest.fixture
+def run():
+    """Runs a coroutine to completion on a fresh event loop."""
+    def run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                if async_engine is not None:
+                    # Pooled asyncpg connections belong to this event loop
+                    await async_engine.dispose()
+        return asyncio.run(main())
+    return run
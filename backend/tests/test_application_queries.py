@@ -0,0 +1,113 @@
+"""
+The application listings and the status update must issue the same number
+of statements however many applications there are (no N+1 lazy loads).
+"""
+import json
+import uuid
+from datetime import date
+from fastapi import Response
+from sqlalchemy import delete, event
+from sqlalchemy.engine import Engine
+import pytest
+from app.api.pagination import PageParams
+from app.api.v1.endpoints.application import (
+    list_my_applications, list_venue_applications, update_application_status,
+)
+from app.core.principal import Principal
+from app.db.session import SessionLocal, open_session
+from app.models.gig import GigApplication, GigPosting
+from app.models.notification import Notification
+from app.models.user import User
+
+
+@pytest.fixture
+def applications():
+    """Builds a venue with n gigs and one band that applied to all of them."""
+    created = []
+
+    def build(n):
+        with SessionLocal() as db:
+            venue = User(email=f"venue-{uuid.uuid4()}@example.com", password_hash="x", role="venue")
+            band = User(email=f"band-{uuid.uuid4()}@example.com", password_hash="x", role="band")
+            db.add_all([venue, band])
+            db.flush()
+            apps = []
+            for i in range(n):
+                gig = GigPosting(venue_id=venue.id, venue_name="The Venue", title=f"Gig {i}", date=date(2030, 1, 1), time="20:00", genre="Rock")
+                db.add(gig)
+                db.flush()
+                apps.append(GigApplication(gig_id=gig.id, venue_id=venue.id, applicant_id=band.id, applicant_name="The Band"))
+            db.add_all(apps)
+            db.commit()
+            created.extend([venue.id, band.id])
+            principals = [Principal(id=u.id, email=u.email, role=u.role, created_at=u.created_at) for u in (venue, band)]
+            return principals[0], principals[1], apps[0].id
+
+    yield build
+    with SessionLocal() as db:
+        db.execute(delete(Notification).where(Notification.user_id.in_(created)))
+        db.execute(delete(User).where(User.id.in_(created)))
+        db.commit()
+
+
+def run_counting(run, endpoint, **kwargs):
+    """The endpoint's result and the number of statements it sent to the database."""
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def call():
+        db = open_session()
+        try:
+            return await endpoint(db=db, **kwargs)
+        finally:
+            await db.close()
+
+    event.listen(Engine, "before_cursor_execute", before)
+    try:
+        result = run(call())
+    finally:
+        event.remove(Engine, "before_cursor_execute", before)
+    return result, len(statements)
+
+
+def rows_of(result):
+    # SERIALIZATION_MODE=fast/raw returns the encoded response itself
+    return json.loads(result.body) if isinstance(result, Response) else result
+
+
+def page(limit):
+    return PageParams(cursor=None, limit=limit)
+
+
+def test_list_my_applications_is_constant(applications, run):
+    counts = []
+    for n in (1, 50):
+        _, band, _ = applications(n)
+        rows, count = run_counting(run, list_my_applications, response=Response(), page=page(n), current_user=band)
+        assert len(rows_of(rows)) == n
+        counts.append(count)
+    assert counts[0] == counts[1]
+
+
+def test_list_venue_applications_is_constant(applications, run):
+    counts = []
+    for n in (1, 50):
+        venue, _, _ = applications(n)
+        rows, count = run_counting(run, list_venue_applications, response=Response(), page=page(n), current_user=venue)
+        assert len(rows_of(rows)) == n
+        counts.append(count)
+    assert counts[0] == counts[1]
+
+
+def test_update_application_status_is_constant(applications, run):
+    counts = []
+    for n in (1, 50):
+        venue, _, application_id = applications(n)
+        row, count = run_counting(
+            run, update_application_status, id=application_id, status_update="accepted", current_user=venue,
+        )
+        assert row.status == "accepted"
+        counts.append(count)
+    assert counts[0] == counts[1]
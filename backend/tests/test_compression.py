@@ -0,0 +1,40 @@
+"""
+Compressed responses carry a weak ETag, since the identity, gzip and brotli
+bodies are different bytes, and revalidating with it still gives a 304.
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware
+from app.core.response_cache import CachedRoute, make_etag
+
+ITEMS = [{"id": i, "name": f"Gig number {i}"} for i in range(200)]
+
+
+def cached_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    cache = CachedRoute(f"test-compression-{id(app)}")
+
+    @app.get("/items")
+    async def items(request: Request):
+        return await cache.store(request, list, ITEMS, make_etag("items"))
+
+    return app
+
+
+def test_identity_response_keeps_the_strong_etag():
+    response = TestClient(cached_app()).get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == make_etag("items")
+
+
+def test_compressed_response_has_a_weak_etag_that_revalidates():
+    client = TestClient(cached_app())
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag == "W/" + make_etag("items")
+
+    revalidated = client.get("/items", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
@@ -0,0 +1,42 @@
+"""
+Photo variants come out at their full size whenever the original is large
+enough, including JPEGs whose EXIF orientation rotates them.
+"""
+import io
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from app.services.images import VARIANTS, render_variants
+
+EXIF_ORIENTATION = 0x0112
+
+
+def jpeg(width, height, orientation=None):
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[EXIF_ORIENTATION] = orientation
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def sizes(data):
+    rendered = render_variants(data, VARIANTS, quality=80, max_pixels=50_000_000)
+    return {name: Image.open(io.BytesIO(webp)).size for name, webp in rendered.items()}
+
+
+@pytest.mark.parametrize("width, height, orientation", [
+    (4000, 3000, None),
+    (3000, 4000, None),
+    # Stored landscape, displayed portrait: the usual phone photo
+    (4000, 3000, 6),
+    (4000, 3000, 8),
+])
+def test_large_photos_fill_every_variant(width, height, orientation):
+    assert sizes(jpeg(width, height, orientation)) == {v.name: (v.width, v.height) for v in VARIANTS}
+
+
+def test_small_photos_are_not_enlarged():
+    card = sizes(jpeg(400, 300))["card"]
+    assert card[0] <= 400 and card[1] <= 300
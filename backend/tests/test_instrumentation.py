@@ -0,0 +1,54 @@
+"""
+Requests are labelled with their full route template, include_router()
+prefix and all, so routes that share a path within their routers stay apart.
+"""
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from app.core.instrumentation import InstrumentationMiddleware, InstrumentedRoute, current_stats
+
+
+def labelled_app():
+    app = FastAPI()
+    app.router.route_class = InstrumentedRoute
+    app.add_middleware(InstrumentationMiddleware)
+    for prefix in ("/api/v1/discovery", "/api/v1/matches", "/api/v1/gigs", "/api/v1/gig-requests"):
+        router = APIRouter(route_class=InstrumentedRoute)
+
+        @router.get("/")
+        async def index():
+            return current_stats().route
+
+        @router.get("/gigs")
+        async def gigs():
+            return current_stats().route
+
+        @router.get("/{id}")
+        async def detail(id: int):
+            return current_stats().route
+
+        app.include_router(router, prefix=prefix)
+
+    @app.get("/health")
+    async def health():
+        return current_stats().route
+
+    return app
+
+
+def test_routes_are_labelled_with_their_prefix():
+    client = TestClient(labelled_app())
+    labels = {path: client.get(path).json() for path in (
+        "/api/v1/discovery/gigs", "/api/v1/matches/gigs",
+        "/api/v1/gigs/", "/api/v1/gig-requests/",
+        "/api/v1/gigs/7", "/api/v1/gig-requests/7",
+        "/health",
+    )}
+    assert labels == {
+        "/api/v1/discovery/gigs": "/api/v1/discovery/gigs",
+        "/api/v1/matches/gigs": "/api/v1/matches/gigs",
+        "/api/v1/gigs/": "/api/v1/gigs/",
+        "/api/v1/gig-requests/": "/api/v1/gig-requests/",
+        "/api/v1/gigs/7": "/api/v1/gigs/{id}",
+        "/api/v1/gig-requests/7": "/api/v1/gig-requests/{id}",
+        "/health": "/health",
+    }
@@ -0,0 +1,136 @@
+"""
+Read routing: get_read_db goes to a healthy replica, stays on the primary
+for a client that just wrote, and falls back to the primary when no replica
+can be reached.
+
+The stand-in replicas are extra engines on the test database itself; a
+replica that is down points at a port nothing listens on.
+"""
+import uuid
+from sqlalchemy.engine import make_url
+from starlette.requests import Request
+import pytest
+from app.core.config import settings
+from app.db import session
+from app.db.replicas import ReplicaSet
+
+
+def healthy_url():
+    return settings.DATABASE_URL
+
+
+def unreachable_url():
+    return make_url(settings.DATABASE_URL).set(host="127.0.0.1", port=1).render_as_string(hide_password=False)
+
+
+def request(method="GET", token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+def engine_of(db):
+    # AsyncSession and ThreadedSession both wrap a sync Session
+    return db.sync_session.bind
+
+
+async def serving(dependency, req):
+    """Name of the database the dependency's session is bound to: a replica's, or 'primary'."""
+    sessions = dependency(req)
+    db = await sessions.__anext__()
+    try:
+        bind = engine_of(db)
+        for replica in session.replica_set.replicas:
+            if bind is replica.sync_engine:
+                return replica.name
+        return "primary"
+    finally:
+        await sessions.aclose()
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    """Installs a ReplicaSet of stand-ins built from the given URLs."""
+    installed = []
+
+    def install(*urls):
+        replica_set = ReplicaSet([session._create_replica(i, url) for i, url in enumerate(urls)])
+        monkeypatch.setattr(session, "replica_set", replica_set)
+        installed.append(replica_set)
+        return replica_set
+
+    yield install
+    for replica_set in installed:
+        for replica in replica_set.replicas:
+            replica.sync_engine.dispose()
+
+
+def test_reads_go_to_replicas_in_turn(replicas, run):
+    replicas(healthy_url(), healthy_url())
+
+    async def reads():
+        try:
+            return [await serving(session.get_read_db, request()) for _ in range(4)]
+        finally:
+            await session.replica_set.dispose()
+
+    assert run(reads()) == ["replica0", "replica1", "replica0", "replica1"]
+
+
+def test_writes_go_to_the_primary(replicas, run):
+    replicas(healthy_url())
+
+    async def write():
+        try:
+            return await serving(session.get_db, request("POST", token=uuid.uuid4().hex))
+        finally:
+            await session.replica_set.dispose()
+
+    assert run(write()) == "primary"
+
+
+def test_reads_stick_to_the_primary_after_a_write(replicas, run, monkeypatch):
+    monkeypatch.setattr(settings, "DB_READ_YOUR_WRITES_SECONDS", 30.0)
+    replicas(healthy_url())
+    writer, other = uuid.uuid4().hex, uuid.uuid4().hex
+
+    async def write_then_read():
+        try:
+            await serving(session.get_db, request("POST", token=writer))
+            return (
+                await serving(session.get_read_db, request(token=writer)),
+                await serving(session.get_read_db, request(token=other)),
+                await serving(session.get_read_db, request()),
+            )
+        finally:
+            await session.replica_set.dispose()
+
+    assert run(write_then_read()) == ("primary", "replica0", "replica0")
+
+
+def test_unreachable_replica_falls_back_and_leaves_rotation(replicas, run):
+    replica_set = replicas(unreachable_url(), healthy_url())
+    down, up = replica_set.replicas
+
+    async def reads():
+        try:
+            return [await serving(session.get_read_db, request()) for _ in range(3)]
+        finally:
+            await replica_set.dispose()
+
+    # replica0 fails to connect: that read is served by the primary, and
+    # later reads skip replica0 without trying it
+    assert run(reads()) == ["primary", "replica1", "replica1"]
+    assert not down.available and up.available
+
+
+def test_all_replicas_down_reads_from_the_primary(replicas, run):
+    replica_set = replicas(healthy_url())
+    replica_set.replicas[0].mark_down()
+
+    async def read():
+        try:
+            return await serving(session.get_read_db, request())
+        finally:
+            await replica_set.dispose()
+
+    assert run(read()) == "primary"
@@ -1,9 +1,6 @@
 from sqlalchemy import create_engine, text
-from app.db.session import Base
-from app.models.user import User
-from app.models.profile import BandProfile, VenueProfile
-from app.models.gig import GigPosting, GigApplication, GigRequest
 from app.core.config import settings
+from app.db.migrate import upgrade
 
 def reset_db():
     print(f"Connecting to {settings.DATABASE_URL}...")
@@ -24,7 +21,7 @@ def reset_db():
                 print(f"Failed to drop {table}: {e}")
 
     print("Recreating all tables...")
-    Base.metadata.create_all(bind=engine)
+    upgrade(engine)
     
     print("✅ Database reset successfully!")
 
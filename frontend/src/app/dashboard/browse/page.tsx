@@ -4,9 +4,10 @@ import React, { useEffect, useState } from 'react';
 import { useAuthStore } from '@/store/useAuthStore';
 import { ChevronDown, MapPin, Calendar, DollarSign, Search, Music2, Heart, Share2, Clock, Filter, X, Loader2 } from 'lucide-react';
 import Link from 'next/link';
-import api from '@/services/api';
+import api, { getAllPages, getPage } from '@/services/api';
 import { cn } from '@/lib/utils';
 import { Skeleton } from '@/components/ui/skeleton';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 
 const GENRES = ["All", "Rock", "Jazz", "Blues", "Pop", "Metal", "Country", "Indie", "Electronic", "Techno", "Folk", "Acoustic"];
 
@@ -14,6 +15,10 @@ export default function BrowsePage() {
     const { user } = useAuthStore();
     const [gigs, setGigs] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
+    // Filters the current results were fetched with, reused for later pages
+    const [gigQuery, setGigQuery] = useState<Record<string, string>>({});
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [selectedBorough, setSelectedBorough] = useState('');
     const [selectedGenre, setSelectedGenre] = useState('All');
     const [searchQuery, setSearchQuery] = useState('');
@@ -24,13 +29,15 @@ export default function BrowsePage() {
     const fetchGigs = async (isManualSearch = false) => {
         setLoading(true);
         try {
-            const params = new URLSearchParams();
-            if (selectedBorough) params.append('borough', selectedBorough);
-            if (selectedGenre !== 'All') params.append('genre', selectedGenre);
-            if (searchQuery) params.append('search', searchQuery);
+            const params: Record<string, string> = {};
+            if (selectedBorough) params.borough = selectedBorough;
+            if (selectedGenre !== 'All') params.genre = selectedGenre;
+            if (searchQuery) params.search = searchQuery;
 
-            const res = await api.get(`/gigs/?${params.toString()}`);
-            setGigs(res.data);
+            const page = await getPage('/gigs/', params);
+            setGigs(page.items);
+            setGigQuery(params);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch gigs:', err);
         } finally {
@@ -38,10 +45,24 @@ export default function BrowsePage() {
         }
     };
 
+    const loadMoreGigs = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage('/gigs/', gigQuery, nextCursor);
+            setGigs(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch gigs:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const fetchApplications = async () => {
         try {
-            const res = await api.get('/applications/my-applications');
-            setAppliedIds(new Set(res.data.map((a: any) => a.gig_id)));
+            // Every page: a gig applied to beyond the first page must still show as applied
+            const applications = await getAllPages('/applications/my-applications');
+            setAppliedIds(new Set(applications.map((a: any) => a.gig_id)));
         } catch (err) {
             console.error('Failed to fetch applications:', err);
         }
@@ -279,6 +300,8 @@ export default function BrowsePage() {
                             ))}
                         </div>
                     )}
+
+                    {!loading && nextCursor && <LoadMoreButton onClick={loadMoreGigs} loading={loadingMore} />}
                 </section>
             </div>
         </div>
@@ -22,8 +22,8 @@ export default function DashboardLayout({
     useEffect(() => {
         const fetchUnread = async () => {
             try {
-                const res = await api.get('/notifications');
-                setUnreadCount(res.data.filter((n: any) => !n.is_read).length);
+                const res = await api.get('/notifications/unread-count');
+                setUnreadCount(res.data.count);
             } catch (err) {
                 console.error('Failed to fetch unread count:', err);
             }
@@ -2,7 +2,7 @@
 
 import React, { useEffect, useState } from 'react';
 import { useAuthStore } from '@/store/useAuthStore';
-import api from '@/services/api';
+import { getPage } from '@/services/api';
 import {
     Music,
     Calendar,
@@ -17,6 +17,7 @@ import {
 } from 'lucide-react';
 import Link from 'next/link';
 import { cn } from '@/lib/utils';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 
 interface ActivityItem {
     id: string;
@@ -33,6 +34,8 @@ export default function MyActivityPage() {
     const { currentContext } = useAuthStore();
     const [loading, setLoading] = useState(true);
     const [items, setItems] = useState<ActivityItem[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const isFinding = currentContext === 'finding';
 
@@ -40,12 +43,14 @@ export default function MyActivityPage() {
         fetchActivity();
     }, [currentContext]);
 
+    const endpoint = isFinding ? '/applications/my-applications' : '/gigs/me/managed';
+
     const fetchActivity = async () => {
         setLoading(true);
         try {
-            const endpoint = isFinding ? '/applications/my-applications' : '/gigs/me/managed';
-            const res = await api.get(endpoint);
-            setItems(res.data);
+            const page = await getPage<ActivityItem>(endpoint);
+            setItems(page.items);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch activity:', err);
         } finally {
@@ -53,6 +58,19 @@ export default function MyActivityPage() {
         }
     };
 
+    const loadMoreActivity = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage<ActivityItem>(endpoint, {}, nextCursor);
+            setItems(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch activity:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const getStatusStyles = (status: string) => {
         switch (status.toLowerCase()) {
             case 'accepted':
@@ -175,6 +193,8 @@ export default function MyActivityPage() {
                             </div>
                         </div>
                     ))}
+
+                    {nextCursor && <LoadMoreButton onClick={loadMoreActivity} loading={loadingMore} />}
                 </div>
             )}
         </div>
@@ -1,7 +1,7 @@
 'use client';
 
 import React, { useEffect, useState } from 'react';
-import api from '@/services/api';
+import api, { getPage } from '@/services/api';
 import {
     Bell,
     Music2,
@@ -14,6 +14,7 @@ import {
 } from 'lucide-react';
 import Link from 'next/link';
 import { cn } from '@/lib/utils';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 
 interface Notification {
     id: string;
@@ -28,6 +29,8 @@ interface Notification {
 export default function NotificationsPage() {
     const [loading, setLoading] = useState(true);
     const [notifications, setNotifications] = useState<Notification[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         fetchNotifications();
@@ -35,8 +38,9 @@ export default function NotificationsPage() {
 
     const fetchNotifications = async () => {
         try {
-            const res = await api.get('/notifications');
-            setNotifications(res.data);
+            const page = await getPage<Notification>('/notifications');
+            setNotifications(page.items);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch notifications:', err);
         } finally {
@@ -44,6 +48,19 @@ export default function NotificationsPage() {
         }
     };
 
+    const loadMoreNotifications = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage<Notification>('/notifications', {}, nextCursor);
+            setNotifications(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch notifications:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const markAsRead = async (id: string) => {
         try {
             await api.post(`/notifications/${id}/read`);
@@ -57,7 +74,7 @@ export default function NotificationsPage() {
         // Optimistic update
         setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
         try {
-            await Promise.all(notifications.filter(n => !n.is_read).map(n => api.post(`/notifications/${n.id}/read`)));
+            await api.post('/notifications/read', { all: true });
         } catch (err) {
             console.error('Failed to mark all as read:', err);
             fetchNotifications(); // Rollback
@@ -168,6 +185,8 @@ export default function NotificationsPage() {
                             </div>
                         </div>
                     ))}
+
+                    {nextCursor && <LoadMoreButton onClick={loadMoreNotifications} loading={loadingMore} />}
                 </div>
             )}
         </div>
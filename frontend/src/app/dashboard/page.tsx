@@ -6,15 +6,18 @@ import { Heart, Share2, Calendar, Clock, DollarSign, MoreHorizontal, Loader2, Mu
 import Link from 'next/link';
 import { OnboardingFlow } from '@/components/auth/OnboardingFlow';
 import ApplicationsView from '@/components/dashboard/ApplicationsView';
-import api from '@/services/api';
+import api, { getAllPages, getPage } from '@/services/api';
 import { ApplicationModal } from '@/components/dashboard/ApplicationModal';
 import { DiscoveryMap } from '@/components/dashboard/DiscoveryMap';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 import { LayoutGrid, Map as MapIcon } from 'lucide-react';
 
 export default function DashboardPage() {
     const { user, currentContext } = useAuthStore();
     const [posts, setPosts] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [viewMode, setViewMode] = useState<'feed' | 'map'>('feed');
     const [applyingId, setApplyingId] = useState<string | null>(null);
     const [appliedIds, setAppliedIds] = useState<Set<string>>(new Set());
@@ -24,12 +27,14 @@ export default function DashboardPage() {
     const [isAppModalOpen, setIsAppModalOpen] = useState(false);
     const isFinding = currentContext === 'finding';
 
+    const postsEndpoint = isFinding ? '/discovery/gigs' : '/gigs/me/managed';
+
     const fetchPosts = async () => {
         setLoading(true);
         try {
-            const endpoint = isFinding ? '/discovery/gigs' : '/gigs/me/managed';
-            const res = await api.get(endpoint);
-            setPosts(res.data);
+            const page = await getPage(postsEndpoint);
+            setPosts(page.items);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch posts:', err);
         } finally {
@@ -37,10 +42,24 @@ export default function DashboardPage() {
         }
     };
 
+    const loadMorePosts = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage(postsEndpoint, {}, nextCursor);
+            setPosts(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch posts:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const fetchApplications = async () => {
         try {
-            const res = await api.get('/applications/my-applications');
-            setAppliedIds(new Set(res.data.map((a: any) => a.gig_id)));
+            // Every page: a gig applied to beyond the first page must still show as applied
+            const applications = await getAllPages('/applications/my-applications');
+            setAppliedIds(new Set(applications.map((a: any) => a.gig_id)));
         } catch (err) {
             console.error('Failed to fetch applications:', err);
         }
@@ -270,6 +289,8 @@ export default function DashboardPage() {
                         ))}
                     </div>
                 )}
+
+                {!loading && nextCursor && <LoadMoreButton onClick={loadMorePosts} loading={loadingMore} />}
             </div>
 
             <ApplicationModal
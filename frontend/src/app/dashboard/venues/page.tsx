@@ -1,7 +1,7 @@
 'use client';
 
 import React, { useEffect, useState } from 'react';
-import api from '@/services/api';
+import { getPage } from '@/services/api';
 import {
     Home,
     MapPin,
@@ -12,6 +12,7 @@ import {
     Search
 } from 'lucide-react';
 import Link from 'next/link';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 
 interface VenueProfile {
     user_id: string;
@@ -20,6 +21,7 @@ interface VenueProfile {
     location_state: string;
     capacity: number;
     photo_url: string | null;
+    photo_variants: { card?: string; avatar?: string } | null;
     bio: string | null;
 }
 
@@ -27,15 +29,23 @@ export default function VenuesDiscoveryPage() {
     const [loading, setLoading] = useState(true);
     const [venues, setVenues] = useState<VenueProfile[]>([]);
     const [searchTerm, setSearchTerm] = useState('');
+    const [venueQuery, setVenueQuery] = useState<Record<string, string>>({});
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
-        fetchVenues();
-    }, []);
+        // Searched server-side; wait for a pause in typing before asking
+        const timer = setTimeout(() => fetchVenues(searchTerm), searchTerm ? 250 : 0);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
 
-    const fetchVenues = async () => {
+    const fetchVenues = async (search: string) => {
         try {
-            const res = await api.get('/profiles/venues/all');
-            setVenues(res.data);
+            const params: Record<string, string> = search.trim() ? { search: search.trim() } : {};
+            const page = await getPage<VenueProfile>('/discovery/venues', params);
+            setVenues(page.items);
+            setVenueQuery(params);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch venues:', err);
         } finally {
@@ -43,10 +53,18 @@ export default function VenuesDiscoveryPage() {
         }
     };
 
-    const filteredVenues = venues.filter(v =>
-        v.venue_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        v.location_city.toLowerCase().includes(searchTerm.toLowerCase())
-    );
+    const loadMoreVenues = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage<VenueProfile>('/discovery/venues', venueQuery, nextCursor);
+            setVenues(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch venues:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
     return (
         <div className="p-8 max-w-7xl mx-auto">
@@ -83,7 +101,7 @@ export default function VenuesDiscoveryPage() {
                     <Loader2 className="w-10 h-10 animate-spin mb-4 text-[#ff8c00]" />
                     <p className="font-display font-medium uppercase tracking-widest text-xs">Scanning the horizon...</p>
                 </div>
-            ) : filteredVenues.length === 0 ? (
+            ) : venues.length === 0 ? (
                 <div className="bg-[#1E1E1E] rounded-3xl border-2 border-dashed border-[#3a3127] p-20 text-center">
                     <Home className="size-12 text-[#bcad9a]/30 mx-auto mb-6" />
                     <h3 className="text-xl font-bold text-white mb-2 font-display uppercase italic">No venues found</h3>
@@ -91,7 +109,7 @@ export default function VenuesDiscoveryPage() {
                 </div>
             ) : (
                 <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                    {filteredVenues.map((venue) => (
+                    {venues.map((venue) => (
                         <Link
                             key={venue.user_id}
                             href={`/dashboard/profile/${venue.user_id}`}
@@ -101,7 +119,7 @@ export default function VenuesDiscoveryPage() {
                             <div className="h-40 bg-[#121212] relative overflow-hidden">
                                 {venue.photo_url ? (
                                     <img
-                                        src={venue.photo_url}
+                                        src={venue.photo_variants?.card || venue.photo_url}
                                         alt={venue.venue_name}
                                         className="w-full h-full object-cover opacity-60 group-hover:opacity-100 group-hover:scale-105 transition-all duration-700"
                                     />
@@ -142,6 +160,8 @@ export default function VenuesDiscoveryPage() {
                     ))}
                 </div>
             )}
+
+            {!loading && nextCursor && <LoadMoreButton onClick={loadMoreVenues} loading={loadingMore} />}
         </div>
     );
 }
@@ -3,18 +3,22 @@
 import React, { useEffect, useState } from 'react';
 import { User, CheckCircle2, XCircle, MessageSquare, Phone, Instagram, Loader2, Music2, ExternalLink, Mail } from 'lucide-react';
 import Link from 'next/link';
-import api from '@/services/api';
+import api, { getPage } from '@/services/api';
+import { LoadMoreButton } from '@/components/ui/LoadMoreButton';
 
 export default function ApplicationsView() {
     const [applications, setApplications] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
     const [actionId, setActionId] = useState<string | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const fetchApplications = async () => {
         setLoading(true);
         try {
-            const res = await api.get('/applications/venue');
-            setApplications(res.data);
+            const page = await getPage('/applications/venue');
+            setApplications(page.items);
+            setNextCursor(page.nextCursor);
         } catch (err) {
             console.error('Failed to fetch applications:', err);
         } finally {
@@ -22,6 +26,19 @@ export default function ApplicationsView() {
         }
     };
 
+    const loadMoreApplications = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getPage('/applications/venue', {}, nextCursor);
+            setApplications(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            console.error('Failed to fetch applications:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchApplications();
     }, []);
@@ -29,8 +46,9 @@ export default function ApplicationsView() {
     const updateStatus = async (appId: string, status: string) => {
         setActionId(appId);
         try {
-            await api.patch(`/applications/${appId}/status?status_update=${status}`);
-            await fetchApplications(); // Refresh list to see contact info logic (simulated for now)
+            const res = await api.patch(`/applications/${appId}/status?status_update=${status}`);
+            // Update in place: refetching would collapse the list back to its first page
+            setApplications(prev => prev.map(a => a.id === appId ? res.data : a));
         } catch (err) {
             console.error('Failed to update status:', err);
         } finally {
@@ -141,6 +159,8 @@ export default function ApplicationsView() {
                     </article>
                 ))}
             </div>
+
+            {nextCursor && <LoadMoreButton onClick={loadMoreApplications} loading={loadingMore} />}
         </div>
     );
 }
@@ -0,0 +1,21 @@
+'use client';
+
+import React from 'react';
+import { Loader2 } from 'lucide-react';
+
+interface LoadMoreButtonProps {
+    onClick: () => void;
+    loading: boolean;
+}
+
+export const LoadMoreButton = ({ onClick, loading }: LoadMoreButtonProps) => (
+    <div className="flex justify-center pt-2">
+        <button
+            onClick={onClick}
+            disabled={loading}
+            className="flex items-center gap-2 px-8 py-3 border border-[#3a3127] rounded-xl text-[10px] font-black uppercase tracking-widest text-[#bcad9a] hover:bg-white/5 hover:text-white transition-all disabled:opacity-50"
+        >
+            {loading ? <Loader2 className="size-4 animate-spin" /> : 'Load more'}
+        </button>
+    </div>
+);
@@ -57,4 +57,28 @@ api.interceptors.response.use(
     }
 );
 
+// List routes return one page at a time; the cursor for the next page comes
+// back in the X-Next-Cursor header, which is absent on the last page
+export interface Page<T> {
+    items: T[];
+    nextCursor: string | null;
+}
+
+export const getPage = async <T = any>(url: string, params: Record<string, any> = {}, cursor?: string | null): Promise<Page<T>> => {
+    const res = await api.get(url, { params: cursor ? { ...params, cursor } : params });
+    return { items: res.data, nextCursor: res.headers['x-next-cursor'] ?? null };
+};
+
+// For lookups that must see every row (e.g. which gigs a band already applied to)
+export const getAllPages = async <T = any>(url: string, params: Record<string, any> = {}): Promise<T[]> => {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+        const page: Page<T> = await getPage<T>(url, { ...params, limit: 100 }, cursor);
+        items.push(...page.items);
+        cursor = page.nextCursor;
+    } while (cursor);
+    return items;
+};
+
 export default api;
@@ -8,6 +8,7 @@ lsof -ti:8000,3002 | xargs kill -9 2>/dev/null || true
 echo "Starting backend..."
 source venv/bin/activate
 cd backend
+python -m app.db.migrate
 python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload &
 BACKEND_PID=$!
 cd ..
@@ -27,9 +27,10 @@ fi
 # Run the backend
 echo "Starting backend..."
 source venv/bin/activate
-# Run migrations/table creation via uvicorn startup event
-# We'll run it in the background
 cd backend
+# Bring the schema up to date; the API only checks the version at startup
+python -m app.db.migrate
+# Run the backend in the background
 python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload &
 BACKEND_PID=$!
 cd ..